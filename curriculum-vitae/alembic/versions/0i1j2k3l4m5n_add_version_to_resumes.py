@@ -0,0 +1,37 @@
+"""Add version column to resumes for optimistic concurrency
+
+Revision ID: 0i1j2k3l4m5n
+Revises: 9h0i1j2k3l4m
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0i1j2k3l4m5n"
+down_revision: str | Sequence[str] | None = "9h0i1j2k3l4m"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add version column to resumes table (existing rows start at 1)."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_cols = [col["name"] for col in inspector.get_columns("resumes")]
+
+    if "version" not in existing_cols:
+        op.add_column(
+            "resumes",
+            sa.Column("version", sa.Integer(), nullable=False, server_default=sa.text("1")),
+        )
+
+
+def downgrade() -> None:
+    """Remove version column from resumes."""
+    op.drop_column("resumes", "version")
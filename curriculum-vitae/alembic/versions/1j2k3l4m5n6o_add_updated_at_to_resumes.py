@@ -0,0 +1,36 @@
+"""Add updated_at column to resumes
+
+Revision ID: 1j2k3l4m5n6o
+Revises: 0i1j2k3l4m5n
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1j2k3l4m5n6o"
+down_revision: str | Sequence[str] | None = "0i1j2k3l4m5n"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add updated_at column to resumes table (existing rows take their created_at)."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_cols = [col["name"] for col in inspector.get_columns("resumes")]
+
+    if "updated_at" not in existing_cols:
+        op.add_column("resumes", sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True))
+        op.execute("UPDATE resumes SET updated_at = created_at")
+        op.alter_column("resumes", "updated_at", nullable=False)
+
+
+def downgrade() -> None:
+    """Remove updated_at column from resumes."""
+    op.drop_column("resumes", "updated_at")
@@ -0,0 +1,34 @@
+"""Add (user_id, id) index on resumes for paginated listings
+
+Revision ID: 9h0i1j2k3l4m
+Revises: 8g9h0i1j2k3l
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9h0i1j2k3l4m"
+down_revision: str | Sequence[str] | None = "8g9h0i1j2k3l"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Index resumes by owner then id, for the keyset-paginated summary listing."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    existing_indexes = [index["name"] for index in inspector.get_indexes("resumes")]
+
+    if "ix_resumes_user_id_id" not in existing_indexes:
+        op.create_index("ix_resumes_user_id_id", "resumes", ["user_id", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the (user_id, id) index on resumes."""
+    op.drop_index("ix_resumes_user_id_id", table_name="resumes")
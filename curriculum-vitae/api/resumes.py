@@ -1,23 +1,34 @@
 """Resume API routes with JWT authentication."""
 
-import contextlib
 import json
-import shutil
-import tempfile
+import re
 from datetime import UTC, datetime
 from io import BytesIO
-from pathlib import Path
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
 from auth.dependencies import CurrentUser
-from core.LatexRenderer import LatexRenderer
-from core.PdfCompiler import PdfCompiler
-from database.db_config import get_db
+from auth.user_cache import refresh_user_async
+from core.CompilePool import get_compile_pool
+from core.http_headers import etag_matches
+from core.JsonPatch import JsonPatchError, apply_patch, parse_pointer
+from core.TemplateRegistry import get_template_registry
+from database.db_config import get_async_db
+from database.json_functions import (
+    json_array_length,
+    json_path_exists,
+    json_replace,
+    json_size,
+    json_text_length,
+    json_text_size,
+    sql_path_supported,
+)
 from database.models import Resume, User
 from translations import get_section_title
 
@@ -31,10 +42,13 @@ MAX_DOWNLOADS_PER_GUEST = 1
 MAX_DOWNLOADS_PER_USER = 3
 MAX_DOWNLOADS_PER_PREMIUM = 1000
 MAX_JSON_CONTENT_SIZE = 100 * 1024  # 100 KB max for JSON content
+MAX_PATCH_OPERATIONS = 100
+SUMMARY_PAGE_SIZE = 20
+SUMMARY_MAX_PAGE_SIZE = 100
+# Browsers keep resumes but revalidate them (If-None-Match) before each use
+RESUME_CACHE_CONTROL = "private, no-cache"
 
 # Template configuration
-TEMPLATE_DIR = Path(__file__).parent.parent
-TEMPLATES_FOLDER = TEMPLATE_DIR / "templates"
 DEFAULT_TEMPLATE = "harvard"
 VALID_TEMPLATES = {
     "harvard",
@@ -87,7 +101,7 @@ class ResumeCreate(BaseModel):
     def validate_json_size(cls, v: dict | None) -> dict | None:
         """Validate JSON content size to prevent DoS attacks."""
         if v is not None:
-            json_size = len(json.dumps(v))
+            json_size = json_text_size(v)
             if json_size > MAX_JSON_CONTENT_SIZE:
                 raise ValueError(
                     f"JSON content too large ({json_size} bytes). "
@@ -107,7 +121,7 @@ class ResumeUpdate(BaseModel):
     def validate_json_size(cls, v: dict | None) -> dict | None:
         """Validate JSON content size to prevent DoS attacks."""
         if v is not None:
-            json_size = len(json.dumps(v))
+            json_size = json_text_size(v)
             if json_size > MAX_JSON_CONTENT_SIZE:
                 raise ValueError(
                     f"JSON content too large ({json_size} bytes). "
@@ -124,10 +138,38 @@ class ResumeResponse(BaseModel):
     name: str
     json_content: dict | None
     s3_url: str | None
+    version: int
+    updated_at: datetime
 
     model_config = {"from_attributes": True}
 
 
+class JsonPatchOperation(BaseModel):
+    """Schema for one RFC 6902 operation; each op requires ``value`` or ``from`` as in the RFC."""
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Any = None
+    from_: str | None = Field(default=None, alias="from")
+
+
+class ResumePatch(BaseModel):
+    """Schema for a partial update of a resume's JSON content.
+
+    The version may instead be given as an ``If-Match`` header.
+    """
+
+    version: int | None = None
+    operations: list[JsonPatchOperation] = Field(..., min_length=1, max_length=MAX_PATCH_OPERATIONS)
+
+
+class ResumePatchResponse(BaseModel):
+    """Schema for a patch result: the new version, without the document."""
+
+    id: int
+    version: int
+
+
 class ResumeListResponse(BaseModel):
     """Schema for listing resumes."""
 
@@ -135,6 +177,30 @@ class ResumeListResponse(BaseModel):
     total: int
 
 
+class ResumeSummary(BaseModel):
+    """Schema for a resume card: metadata read from the database, without the JSON content."""
+
+    id: int
+    name: str
+    created_at: datetime
+    updated_at: datetime
+    template_id: str | None
+    section_count: int | None
+    size_bytes: int | None
+
+
+class ResumeSummaryPage(BaseModel):
+    """Schema for a page of resume summaries.
+
+    ``total`` is only counted for the first page (no cursor) and is None on the
+    following ones, so paging through does not re-count the user's resumes.
+    """
+
+    resumes: list[ResumeSummary]
+    total: int | None
+    next_cursor: int | None
+
+
 # === Routes ===
 
 
@@ -142,7 +208,7 @@ class ResumeListResponse(BaseModel):
 async def create_resume(
     resume_data: ResumeCreate,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> Resume:
     """Create a new resume for the authenticated user.
 
@@ -157,7 +223,8 @@ async def create_resume(
     Raises:
         HTTPException: 429 if user has reached max resumes limit.
     """
-    # SECURITY: Check if user has reached max resumes limit per tier
+    # SECURITY: Check if user has reached max resumes limit per tier (on fresh counters)
+    await refresh_user_async(db, current_user)
     if current_user.is_guest:
         max_resumes = MAX_RESUMES_PER_GUEST
     elif current_user.is_premium:
@@ -166,7 +233,9 @@ async def create_resume(
         max_resumes = MAX_RESUMES_PER_USER
     max_resumes += current_user.bonus_resumes
 
-    resume_count = db.query(Resume).filter(Resume.user_id == current_user.id).count()
+    resume_count = await db.scalar(
+        select(func.count()).select_from(Resume).where(Resume.user_id == current_user.id)
+    )
     if resume_count >= max_resumes:
         if current_user.is_guest:
             raise HTTPException(
@@ -192,8 +261,8 @@ async def create_resume(
     )
 
     db.add(new_resume)
-    db.commit()
-    db.refresh(new_resume)
+    await db.commit()
+    await db.refresh(new_resume)
 
     return new_resume
 
@@ -201,7 +270,7 @@ async def create_resume(
 @router.get("", response_model=ResumeListResponse)
 async def list_resumes(
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> dict:
     """List all resumes for the authenticated user.
 
@@ -212,37 +281,109 @@ async def list_resumes(
     Returns:
         List of user's resumes with total count.
     """
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).all()
+    resumes = (await db.scalars(select(Resume).where(Resume.user_id == current_user.id))).all()
     return {"resumes": resumes, "total": len(resumes)}
 
 
+@router.get("/summary", response_model=ResumeSummaryPage)
+async def list_resume_summaries(
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    limit: Annotated[int, Query(ge=1, le=SUMMARY_MAX_PAGE_SIZE)] = SUMMARY_PAGE_SIZE,
+    cursor: Annotated[int | None, Query(ge=1)] = None,
+) -> dict:
+    """List the user's resumes, newest first, without loading their JSON content.
+
+    Template, section count and size are computed by the database. Pages are
+    keyset-paginated on the resume id, so each one is a single index range scan.
+
+    Args:
+        current_user: Authenticated user from JWT token.
+        db: Database session.
+        limit: Maximum number of resumes in the page.
+        cursor: ``next_cursor`` of the previous page; omitted for the first page.
+
+    Returns:
+        The page of summaries, the user's total resume count (first page only,
+        None otherwise) and the next cursor (None on the last page).
+    """
+    query = (
+        select(
+            Resume.id,
+            Resume.name,
+            Resume.created_at,
+            Resume.updated_at,
+            Resume.json_content["template_id"].as_string().label("template_id"),
+            json_array_length(Resume.json_content, "sections").label("section_count"),
+            json_size(Resume.json_content).label("size_bytes"),
+        )
+        .where(Resume.user_id == current_user.id)
+        .order_by(Resume.id.desc())
+        # One extra row tells whether another page follows
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        query = query.where(Resume.id < cursor)
+    rows = (await db.execute(query)).mappings().all()
+
+    total = None
+    if cursor is None:
+        # A first page without a successor already holds every resume
+        total = len(rows)
+        if len(rows) > limit:
+            total = await db.scalar(
+                select(func.count()).select_from(Resume).where(Resume.user_id == current_user.id)
+            )
+    next_cursor = rows[limit - 1]["id"] if len(rows) > limit else None
+    return {"resumes": rows[:limit], "total": total, "next_cursor": next_cursor}
+
+
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
     resume_id: int,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
-) -> Resume:
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    response: Response,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Resume | Response:
     """Get a specific resume by ID.
 
+    The response carries the version as ``ETag``. A client sending it back in
+    ``If-None-Match`` gets an empty 304 while the resume is unchanged, after a
+    query that reads the version only.
+
     Args:
         resume_id: ID of the resume to retrieve.
         current_user: Authenticated user from JWT token.
         db: Database session.
+        response: Response whose headers receive the ETag.
+        if_none_match: ETags of the copies the client already holds.
 
     Returns:
-        The resume if found and owned by user.
+        The resume if found and owned by user, or 304 Not Modified.
 
     Raises:
         HTTPException: 404 if resume not found or not owned by user.
     """
-    resume = (
-        db.query(Resume)
-        .filter(
-            Resume.id == resume_id,
-            Resume.user_id == current_user.id,  # Security: only own resumes
-        )
-        .first()
+    ownership = (
+        Resume.id == resume_id,
+        Resume.user_id == current_user.id,  # Security: only own resumes
     )
+    if if_none_match is not None:
+        version = await db.scalar(select(Resume.version).where(*ownership))
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found",
+            )
+        etag = resume_etag(version)
+        if etag_matches(if_none_match, etag, weak=True):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": RESUME_CACHE_CONTROL},
+            )
+
+    resume = await db.scalar(select(Resume).where(*ownership))
 
     if not resume:
         raise HTTPException(
@@ -250,6 +391,8 @@ async def get_resume(
             detail="Resume not found",
         )
 
+    response.headers["ETag"] = resume_etag(resume.version)
+    response.headers["Cache-Control"] = RESUME_CACHE_CONTROL
     return resume
 
 
@@ -258,29 +401,35 @@ async def update_resume(
     resume_id: int,
     resume_data: ResumeUpdate,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
 ) -> Resume:
     """Update a resume.
 
+    With ``If-Match`` (the ``ETag`` of the copy being edited), the update only
+    applies if nobody saved the resume in the meantime.
+
     Args:
         resume_id: ID of the resume to update.
         resume_data: Fields to update.
         current_user: Authenticated user from JWT token.
         db: Database session.
+        response: Response whose headers receive the new ETag.
+        if_match: ETag the client's copy was loaded with.
 
     Returns:
         The updated resume.
 
     Raises:
-        HTTPException: 404 if resume not found or not owned by user.
+        HTTPException: 404 if resume not found or not owned by user, 412 if it
+            no longer matches ``If-Match``, 409 if it changed during the update.
     """
-    resume = (
-        db.query(Resume)
-        .filter(
+    resume = await db.scalar(
+        select(Resume).where(
             Resume.id == resume_id,
             Resume.user_id == current_user.id,  # Security: only own resumes
         )
-        .first()
     )
 
     if not resume:
@@ -288,6 +437,8 @@ async def update_resume(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Resume not found",
         )
+    if if_match is not None and not etag_matches(if_match, resume_etag(resume.version)):
+        raise _resume_conflict(status.HTTP_412_PRECONDITION_FAILED)
 
     # Update only provided fields
     if resume_data.name is not None:
@@ -295,17 +446,192 @@ async def update_resume(
     if resume_data.json_content is not None:
         resume.json_content = resume_data.json_content
 
-    db.commit()
-    db.refresh(resume)
+    await _commit_resume(db)
+    await db.refresh(resume)
 
+    response.headers["ETag"] = resume_etag(resume.version)
     return resume
 
 
+@router.patch("/{resume_id}", response_model=ResumePatchResponse)
+async def patch_resume(
+    resume_id: int,
+    patch: ResumePatch,
+    current_user: CurrentUser,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    response: Response,
+    if_match: Annotated[str | None, Header()] = None,
+) -> dict:
+    """Apply a JSON Patch (RFC 6902) to a resume's JSON content, e.g. for autosave.
+
+    The patch applies only to the version the client last saw, given in the
+    body or as the ``ETag`` in ``If-Match``. A patch made of ``replace``
+    operations is applied by the database without reading the document; any
+    other patch is applied here. Either way the request and response stay
+    proportional to the edit, not to the document.
+
+    Args:
+        resume_id: ID of the resume to patch.
+        patch: Version the operations were computed against, and the operations.
+        current_user: Authenticated user from JWT token.
+        db: Database session.
+        response: Response whose headers receive the new ETag.
+        if_match: ETag the client's copy was loaded with.
+
+    Returns:
+        The resume id and its new version.
+
+    Raises:
+        HTTPException: 404 if resume not found or not owned by user, 409 if the
+            resume changed since ``version``, 412 if it no longer matches
+            ``If-Match``, 422 if the patch does not apply or the result is too
+            large, 428 if neither ``version`` nor ``If-Match`` is given.
+    """
+    if patch.version is None and if_match is None:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="Give the resume version, in the body or as an If-Match header.",
+        )
+    version = await _patch_in_database(db, resume_id, current_user.id, patch, if_match)
+    if version is None:
+        version = await _patch_in_python(db, resume_id, current_user.id, patch, if_match)
+    response.headers["ETag"] = resume_etag(version)
+    return {"id": resume_id, "version": version}
+
+
+async def _patch_in_database(
+    db: AsyncSession, resume_id: int, user_id: int, patch: ResumePatch, if_match: str | None
+) -> int | None:
+    """Apply a patch of ``replace`` operations with a single conditional UPDATE.
+
+    Returns the new version, or None when the patch has another form or did not
+    apply (unknown resume, stale version, missing path, size limit): the caller
+    then loads the resume to apply the patch or to report why it cannot.
+    """
+    operations = patch.operations
+    if any(op.op != "replace" or "value" not in op.model_fields_set for op in operations):
+        return None
+    try:
+        paths = [parse_pointer(op.path) for op in operations]
+    except JsonPatchError:
+        return None
+    if not all(sql_path_supported(path) for path in paths):
+        return None
+    # Paths are checked against the stored document: none may lie inside another one
+    if any(a != b and b[: len(a)] == a for a in paths for b in paths):
+        return None
+
+    patched = Resume.json_content
+    conditions = [
+        Resume.id == resume_id,
+        Resume.user_id == user_id,  # Security: only own resumes
+    ]
+    if patch.version is not None:
+        conditions.append(Resume.version == patch.version)
+    if if_match is not None and (versions := _etag_versions(if_match)) is not None:
+        conditions.append(Resume.version.in_(versions))
+    for operation, path in zip(operations, paths, strict=True):
+        conditions.append(json_path_exists(Resume.json_content, path))
+        patched = json_replace(patched, path, json.dumps(operation.value, ensure_ascii=False))
+    conditions.append(json_text_length(patched) <= MAX_JSON_CONTENT_SIZE)
+
+    version = await db.scalar(
+        update(Resume)
+        .where(*conditions)
+        .values(json_content=patched, version=Resume.version + 1)
+        .returning(Resume.version),
+        execution_options={"synchronize_session": False},
+    )
+    if version is not None:
+        await db.commit()
+    return version
+
+
+async def _patch_in_python(
+    db: AsyncSession, resume_id: int, user_id: int, patch: ResumePatch, if_match: str | None
+) -> int:
+    """Load the resume, apply the patch to its JSON content and save it; returns the new version."""
+    resume = await db.scalar(
+        select(Resume).where(
+            Resume.id == resume_id,
+            Resume.user_id == user_id,  # Security: only own resumes
+        )
+    )
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found",
+        )
+    if if_match is not None and not etag_matches(if_match, resume_etag(resume.version)):
+        raise _resume_conflict(status.HTTP_412_PRECONDITION_FAILED)
+    if patch.version is not None and resume.version != patch.version:
+        raise _resume_conflict()
+
+    operations = [op.model_dump(by_alias=True, exclude_unset=True) for op in patch.operations]
+    try:
+        json_content = apply_patch(resume.json_content, operations)
+    except JsonPatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"Patch cannot be applied: {e}",
+        ) from None
+    if json_content is not None and not isinstance(json_content, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Patched JSON content must be an object.",
+        )
+    if json_content is not None:
+        content_size = json_text_size(json_content)
+        if content_size > MAX_JSON_CONTENT_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"JSON content too large ({content_size} bytes). "
+                f"Maximum allowed: {MAX_JSON_CONTENT_SIZE} bytes.",
+            )
+
+    resume.json_content = json_content
+    await _commit_resume(db)
+    return resume.version
+
+
+async def _commit_resume(db: AsyncSession) -> None:
+    """Commit a resume update; 409 if another request updated it since it was loaded."""
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise _resume_conflict() from None
+
+
+def _resume_conflict(status_code: int = status.HTTP_409_CONFLICT) -> HTTPException:
+    return HTTPException(
+        status_code=status_code,
+        detail="Resume was modified by another session. Reload it and retry.",
+    )
+
+
+# Strong ETags as resume_etag spells them
+_RESUME_ETAG = re.compile(r'"v([0-9]+)"')
+
+
+def resume_etag(version: int) -> str:
+    """Strong ETag of a resume: its version, bumped by every write."""
+    return f'"v{version}"'
+
+
+def _etag_versions(header: str) -> list[int] | None:
+    """Versions an If-Match header accepts; None when it is "*" (any version)."""
+    tags = [tag.strip() for tag in header.split(",")]
+    if "*" in tags:
+        return None
+    return [int(match[1]) for tag in tags if (match := _RESUME_ETAG.fullmatch(tag))]
+
+
 @router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_resume(
     resume_id: int,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> None:
     """Delete a resume.
 
@@ -317,13 +643,11 @@ async def delete_resume(
     Raises:
         HTTPException: 404 if resume not found or not owned by user.
     """
-    resume = (
-        db.query(Resume)
-        .filter(
+    resume = await db.scalar(
+        select(Resume).where(
             Resume.id == resume_id,
             Resume.user_id == current_user.id,  # Security: only own resumes
         )
-        .first()
     )
 
     if not resume:
@@ -332,11 +656,11 @@ async def delete_resume(
             detail="Resume not found",
         )
 
-    db.delete(resume)
-    db.commit()
+    await db.delete(resume)
+    await db.commit()
 
 
-def _get_monthly_download_count(user: User, db: Session) -> int:
+async def _get_monthly_download_count(user: User, db: AsyncSession) -> int:
     """Get the user's download count for the current month, resetting if needed.
 
     If the stored reset timestamp is from a previous month, reset the counter to 0.
@@ -354,7 +678,7 @@ def _get_monthly_download_count(user: User, db: Session) -> int:
     if reset_at is None or (reset_at.year, reset_at.month) != (now.year, now.month):
         user.download_count = 0
         user.download_count_reset_at = now
-        db.flush()
+        await db.flush()
 
     return user.download_count
 
@@ -405,7 +729,7 @@ def _convert_section_items(section: dict[str, Any], lang: str = "fr") -> dict[st
 async def generate_resume_pdf(
     resume_id: int,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     template_id: str = "harvard",
     lang: str = "fr",
 ) -> StreamingResponse:
@@ -424,7 +748,8 @@ async def generate_resume_pdf(
     Raises:
         HTTPException: 404 if resume not found, 400 if no content.
     """
-    # SECURITY: Enforce monthly download limits per tier
+    # SECURITY: Enforce monthly download limits per tier (on fresh counters)
+    await refresh_user_async(db, current_user)
     if current_user.is_guest:
         max_downloads = MAX_DOWNLOADS_PER_GUEST
     elif current_user.is_premium:
@@ -433,7 +758,7 @@ async def generate_resume_pdf(
         max_downloads = MAX_DOWNLOADS_PER_USER
     max_downloads += current_user.bonus_downloads
 
-    current_downloads = _get_monthly_download_count(current_user, db)
+    current_downloads = await _get_monthly_download_count(current_user, db)
     if current_downloads >= max_downloads:
         if current_user.is_guest:
             raise HTTPException(
@@ -454,13 +779,11 @@ async def generate_resume_pdf(
             "Upgrade to Premium to get more downloads.",
         )
 
-    resume = (
-        db.query(Resume)
-        .filter(
+    resume = await db.scalar(
+        select(Resume).where(
             Resume.id == resume_id,
             Resume.user_id == current_user.id,
         )
-        .first()
     )
 
     if not resume:
@@ -475,23 +798,15 @@ async def generate_resume_pdf(
             detail="Resume has no content to generate",
         )
 
-    # Create temporary directory for compilation
-    temp_dir = tempfile.mkdtemp(prefix="cv_")
-    temp_path = Path(temp_dir)
     pdf_content = None
     resume_name = resume.name
 
     try:
         # Validate template
+        templates = get_template_registry()
         template_id = template_id if template_id in VALID_TEMPLATES else DEFAULT_TEMPLATE
-        template_filename = f"{template_id}.tex"
-
-        # Copy template
-        template_src = TEMPLATES_FOLDER / template_filename
-        if not template_src.exists():
-            template_src = TEMPLATES_FOLDER / f"{DEFAULT_TEMPLATE}.tex"
-        template_dst = temp_path / template_filename
-        shutil.copy(template_src, template_dst)
+        if not templates.has(template_id):
+            template_id = DEFAULT_TEMPLATE
 
         # Prepare data for rendering
         lang = lang if lang in ("fr", "en") else "fr"
@@ -502,28 +817,11 @@ async def generate_resume_pdf(
             "sections": [_convert_section_items(s, lang) for s in json_content.get("sections", [])],
         }
 
-        # Render LaTeX template
-        renderer = LatexRenderer(temp_path, template_filename)
-        tex_content = renderer.render(render_data)
-
-        # Write .tex file
-        tex_file = temp_path / "main.tex"
-        tex_file.write_text(tex_content, encoding="utf-8")
-
-        # Compile to PDF
-        compiler = PdfCompiler(tex_file)
-        compiler.compile(clean=True)
-
-        # Verify PDF was generated
-        pdf_file = temp_path / "main.pdf"
-        if not pdf_file.exists():
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="PDF generation failed",
-            )
+        # Render LaTeX template from the shared registry (no per-request copy)
+        tex_content = templates.render(template_id, render_data)
 
-        # SECURITY: Read PDF content before cleanup to ensure temp files are always deleted
-        pdf_content = pdf_file.read_bytes()
+        # Compile to PDF on the shared compile pool without blocking the event loop
+        pdf_content = await get_compile_pool().compile_async(tex_content, template_id)
 
     except HTTPException:
         raise
@@ -537,14 +835,10 @@ async def generate_resume_pdf(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error: {e}",
         ) from e
-    finally:
-        # SECURITY: Always clean up temporary files, even on exceptions
-        with contextlib.suppress(Exception):
-            shutil.rmtree(temp_path)
 
     # Increment download counter after successful generation
     current_user.download_count += 1
-    db.commit()
+    await db.commit()
 
     # Return PDF from memory (temp files already cleaned up)
     from core.http_headers import build_content_disposition
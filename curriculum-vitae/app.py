@@ -8,9 +8,11 @@ Authentification OAuth2 avec JWT.
 import asyncio
 import contextlib
 import os
-import shutil
 import sys
 import tempfile
+import threading
+from collections.abc import Iterator
+from functools import partial
 from pathlib import Path
 from typing import Annotated, Any, Literal
 
@@ -23,18 +25,33 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 import json  # noqa: E402
-import re  # noqa: E402
+from io import BytesIO  # noqa: E402
 
 import pdfplumber  # noqa: E402
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile  # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware  # noqa: E402
 from fastapi.responses import FileResponse, StreamingResponse  # noqa: E402
 from fastapi.staticfiles import StaticFiles  # noqa: E402
-from mistralai import Mistral  # noqa: E402
 from pydantic import BaseModel, Field, field_validator  # noqa: E402
 
-from core.LatexRenderer import LatexRenderer  # noqa: E402
-from core.PdfCompiler import PdfCompiler  # noqa: E402
+from core import email as email_module  # noqa: E402
+from core.CompilePool import get_compile_pool, shutdown_compile_pool  # noqa: E402
+from core.EmailOutbox import EMAIL_OUTBOX_ENABLED, get_email_outbox, run_email_outbox  # noqa: E402
+from core.FormatCache import get_format_cache  # noqa: E402
+from core.ImportCache import ImportCache, get_import_cache  # noqa: E402
+from core.JsonEventParser import JsonEventParser  # noqa: E402
+from core.MistralClient import get_mistral_client  # noqa: E402
+from core.PageEstimator import get_page_estimator  # noqa: E402
+from core.PromptRegistry import get_prompt_registry  # noqa: E402
+from core.TemplateRegistry import get_template_registry  # noqa: E402
+from core.TextExtractionPool import (  # noqa: E402
+    ExtractionMemoryError,
+    ExtractionTimeoutError,
+    TextTooLongError,
+    TooManyPagesError,
+    get_text_extraction_pool,
+    shutdown_text_extraction_pool,
+)
 from translations import get_section_title  # noqa: E402
 
 # Limite de taille pour l'import de CV (protection contre les abus)
@@ -58,11 +75,13 @@ from api.resumes import (  # noqa: E402
     _get_monthly_download_count,
 )
 from api.resumes import router as resumes_router  # noqa: E402
-from auth.dependencies import CurrentUser  # noqa: E402
+from auth.dependencies import CurrentUser, require_metrics_token  # noqa: E402
+from auth.security import get_secret_key  # noqa: E402
+from auth.user_cache import refresh_user_async  # noqa: E402
 from auth.routes import router as auth_router  # noqa: E402
-from database.db_config import get_db  # noqa: E402
+from database.db_config import get_async_db, warm_up_async_pool  # noqa: E402
 from database.models import User  # noqa: E402
-from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
 
 # === Modèles Pydantic ===
 
@@ -187,10 +206,42 @@ class ResumeData(BaseModel):
 
 # === Application FastAPI ===
 
+
+@contextlib.asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Lire la clé JWT une seule fois : un déploiement sans clé échoue dès le démarrage
+    get_secret_key()
+    # Construire les formats LaTeX manquants ou périmés en arrière-plan :
+    # les compilations n'attendent pas, elles chargent le préambule complet en attendant
+    threading.Thread(target=get_format_cache().build_all, name="latex-formats", daemon=True).start()
+    # Compiler tous les templates Jinja une fois pour toutes
+    get_template_registry().preload()
+    # Ouvrir les premières connexions du pool sans bloquer le démarrage
+    warmup_task = asyncio.create_task(warm_up_async_pool(), name="db-pool-warmup")
+    # Envoyer en tâche de fond les emails mis en file par les requêtes
+    outbox_task = None
+    if EMAIL_OUTBOX_ENABLED and email_module.ZEPTOMAIL_API_KEY:
+        outbox_task = asyncio.create_task(run_email_outbox(), name="email-outbox")
+    yield
+    warmup_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await warmup_task
+    if outbox_task is not None:
+        outbox_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await outbox_task
+    # Fermer les connexions keep-alive vers l'API Mistral
+    await get_mistral_client().aclose()
+    # Arrêter les threads de compilation et les processus d'extraction après leurs tâches en cours
+    await asyncio.to_thread(shutdown_compile_pool)
+    await asyncio.to_thread(shutdown_text_extraction_pool)
+
+
 app = FastAPI(
     title="CV Generator API",
     description="API pour générer des CV en PDF à partir de données JSON",
     version="2.0.0",
+    lifespan=lifespan,
 )
 
 # Configuration CORS - restreint aux domaines autorisés
@@ -205,17 +256,25 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=[origin.strip() for origin in ALLOWED_ORIGINS],
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "Accept", "X-CSRF-Token"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
+    allow_headers=[
+        "Authorization",
+        "Content-Type",
+        "Accept",
+        "X-CSRF-Token",
+        "If-Match",
+        "If-None-Match",
+    ],
+    # Sans cela, le navigateur cache l'ETag au JavaScript d'une autre origine
+    expose_headers=["ETag"],
 )
 
 # Include authentication and API routers
 app.include_router(auth_router)
 app.include_router(resumes_router)
 
-# Chemin vers les templates
+# Chemin vers les ressources du backend (data.yml, static)
 TEMPLATE_DIR = Path(__file__).parent
-TEMPLATES_FOLDER = TEMPLATE_DIR / "templates"
 DEFAULT_TEMPLATE = "harvard"
 VALID_TEMPLATES = {
     "harvard",
@@ -317,37 +376,38 @@ async def _store_pdf_upload_with_limits(file: UploadFile) -> Path:
             await file.close()
 
 
-def _extract_text_from_pdf_with_limits(pdf_path: Path) -> str:
-    """Extract text while enforcing page and extracted-text limits."""
-    text_parts: list[str] = []
-    current_text_length = 0
+async def _extract_text_from_pdf_with_limits(pdf_path: Path) -> str:
+    """Extract text while enforcing page, extracted-text, time and memory limits.
 
-    with pdfplumber.open(pdf_path) as pdf:
-        if len(pdf.pages) > MAX_CV_PDF_PAGES:
-            raise HTTPException(
-                status_code=400,
-                detail=(
-                    f"Le PDF contient trop de pages ({len(pdf.pages)}). "
-                    f"Maximum autorisé : {MAX_CV_PDF_PAGES} pages."
-                ),
-            )
-
-        for page in pdf.pages:
-            page_text = (page.extract_text() or "") + "\n"
-            text_parts.append(page_text)
-            current_text_length += len(page_text)
-
-            if current_text_length > MAX_CV_TEXT_LENGTH:
-                raise HTTPException(
-                    status_code=400,
-                    detail=(
-                        f"Le document est trop volumineux ({current_text_length:,} caractères). "
-                        f"Maximum autorisé : {MAX_CV_TEXT_LENGTH:,} caractères. "
-                        "Veuillez fournir un CV plus concis."
-                    ),
-                )
+    L'extraction tourne dans un processus isolé du pool : un PDF piégé ne bloque
+    ni la boucle d'événements ni le GIL du serveur.
+    """
+    try:
+        text_content = await get_text_extraction_pool().extract_async(
+            pdf_path, MAX_CV_PDF_PAGES, MAX_CV_TEXT_LENGTH
+        )
+    except TooManyPagesError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Le PDF contient trop de pages ({e.page_count}). "
+                f"Maximum autorisé : {MAX_CV_PDF_PAGES} pages."
+            ),
+        ) from None
+    except TextTooLongError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Le document est trop volumineux ({e.length:,} caractères). "
+                f"Maximum autorisé : {MAX_CV_TEXT_LENGTH:,} caractères. "
+                "Veuillez fournir un CV plus concis."
+            ),
+        ) from None
+    except (ExtractionTimeoutError, ExtractionMemoryError):
+        raise HTTPException(
+            status_code=400, detail="Le PDF est trop complexe pour être analysé"
+        ) from None
 
-    text_content = "".join(text_parts)
     if not text_content.strip():
         raise HTTPException(status_code=400, detail="Impossible d'extraire le texte du PDF")
 
@@ -356,6 +416,12 @@ def _extract_text_from_pdf_with_limits(pdf_path: Path) -> str:
 # Variantes de taille pour l'auto-sizing
 SIZE_VARIANTS = ["large", "normal", "compact"]
 
+# Compiler toutes les tailles en parallèle pour /optimal-size (latence ≈ une compilation)
+OPTIMAL_SIZE_SPECULATIVE = os.environ.get("OPTIMAL_SIZE_SPECULATIVE", "true").lower() == "true"
+# Ne compiler que les tailles proches de la limite d'une page. Désactivé par défaut : aucune
+# calibration n'est livrée, elle se génère avec benchmarks/calibrate_page_estimator.py
+PAGE_ESTIMATOR_ENABLED = os.environ.get("PAGE_ESTIMATOR_ENABLED", "false").lower() == "true"
+
 # Dossier des fichiers statiques (frontend buildé)
 STATIC_DIR = TEMPLATE_DIR / "static"
 
@@ -387,22 +453,13 @@ def get_base_template(template_id: str) -> str:
     return template_id.replace("_compact", "").replace("_large", "")
 
 
-def generate_pdf_and_count_pages(data: ResumeData, template_id: str) -> tuple[Path, int, Path]:
+async def generate_pdf_and_count_pages(data: ResumeData, template_id: str) -> tuple[bytes, int]:
     """
-    Génère un PDF et retourne le chemin, le nombre de pages et le dossier temp.
-    Le dossier temp doit être nettoyé par l'appelant.
+    Génère un PDF via le pool de compilation et retourne son contenu et son nombre de pages.
     """
-    temp_dir = tempfile.mkdtemp(prefix="cv_")
-    temp_path = Path(temp_dir)
-
-    template_filename = f"{template_id}.tex"
-
-    # Copier le template
-    template_src = TEMPLATES_FOLDER / template_filename
-    if not template_src.exists():
-        template_src = TEMPLATES_FOLDER / f"{DEFAULT_TEMPLATE}.tex"
-    template_dst = temp_path / template_filename
-    shutil.copy(template_src, template_dst)
+    templates = get_template_registry()
+    if not templates.has(template_id):
+        template_id = DEFAULT_TEMPLATE
 
     # Préparer les données
     lang = data.lang if data.lang in ("fr", "en") else "fr"
@@ -411,24 +468,19 @@ def generate_pdf_and_count_pages(data: ResumeData, template_id: str) -> tuple[Pa
         "sections": [convert_section_items(s, lang) for s in data.sections],
     }
 
-    # Rendre et compiler
-    renderer = LatexRenderer(temp_path, template_filename)
-    tex_content = renderer.render(render_data)
-    tex_file = temp_path / "main.tex"
-    tex_file.write_text(tex_content, encoding="utf-8")
+    # Rendre le template (déjà compilé par le registre, sans copie de fichier)
+    tex_content = templates.render(template_id, render_data)
 
-    compiler = PdfCompiler(tex_file)
-    compiler.compile(clean=True)
+    # Compiler hors de la boucle asyncio
+    compiled = await get_compile_pool().compile_pdf_async(tex_content, template_id)
 
-    pdf_file = temp_path / "main.pdf"
-    if not pdf_file.exists():
-        raise RuntimeError("Échec de la génération du PDF")
+    # Nombre de pages lu dans le log LaTeX ; pdfplumber seulement s'il est introuvable
+    page_count = compiled.metadata.page_count
+    if page_count is None:
+        with pdfplumber.open(BytesIO(compiled.content)) as pdf:
+            page_count = len(pdf.pages)
 
-    # Compter les pages
-    with pdfplumber.open(str(pdf_file)) as pdf:
-        page_count = len(pdf.pages)
-
-    return pdf_file, page_count, temp_path
+    return compiled.content, page_count
 
 
 def convert_section_items(section: CVSection, lang: str = "fr") -> dict[str, Any]:
@@ -496,8 +548,9 @@ def convert_section_items(section: CVSection, lang: str = "fr") -> dict[str, Any
     return section_dict
 
 
-def _enforce_generation_quota(user: User, db: Any) -> None:
+async def _enforce_generation_quota(user: User, db: AsyncSession) -> None:
     """Apply monthly generation/download quota checks for expensive PDF operations."""
+    await refresh_user_async(db, user)
     if user.is_guest:
         max_downloads = MAX_DOWNLOADS_PER_GUEST
     elif user.is_premium:
@@ -506,7 +559,7 @@ def _enforce_generation_quota(user: User, db: Any) -> None:
         max_downloads = MAX_DOWNLOADS_PER_USER
     max_downloads += user.bonus_downloads
 
-    current_downloads = _get_monthly_download_count(user, db)
+    current_downloads = await _get_monthly_download_count(user, db)
     if current_downloads >= max_downloads:
         if user.is_guest:
             msg = (
@@ -527,7 +580,10 @@ def _enforce_generation_quota(user: User, db: Any) -> None:
 
 
 def _enforce_import_quota(user: User, db: Any) -> None:
-    """Check whether the user has remaining CV import credits."""
+    """Check whether the user has remaining CV import credits.
+
+    Call ``refresh_user_async`` first: the counters must not come from the user cache.
+    """
     if user.is_guest:
         max_imports = MAX_IMPORTS_PER_GUEST
     elif user.is_premium:
@@ -611,7 +667,7 @@ def _apply_preview_watermark(tex_content: str, lang: str) -> str:
 async def generate_cv(
     data: ResumeData,
     current_user: CurrentUser,
-    db: Any = Depends(get_db),  # noqa: B008
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     preview: bool = False,
 ):
     """
@@ -627,24 +683,16 @@ async def generate_cv(
     """
     # Preview generation is refreshed frequently in the editor and must not consume download quota.
     if not preview:
-        _enforce_generation_quota(current_user, db)
+        await _enforce_generation_quota(current_user, db)
 
-    # Créer un dossier temporaire pour la compilation
-    temp_dir = tempfile.mkdtemp(prefix="cv_")
-    temp_path = Path(temp_dir)
     pdf_content = None
 
     try:
         # Déterminer le template à utiliser (fallback sur harvard si invalide)
+        templates = get_template_registry()
         template_id = data.template_id if data.template_id in VALID_TEMPLATES else DEFAULT_TEMPLATE
-        template_filename = f"{template_id}.tex"
-
-        # Copier le template dans le dossier temporaire
-        template_src = TEMPLATES_FOLDER / template_filename
-        if not template_src.exists():
-            template_src = TEMPLATES_FOLDER / f"{DEFAULT_TEMPLATE}.tex"
-        template_dst = temp_path / template_filename
-        shutil.copy(template_src, template_dst)
+        if not templates.has(template_id):
+            template_id = DEFAULT_TEMPLATE
 
         # Préparer les données pour le rendu (avec titres traduits)
         lang = data.lang if data.lang in ("fr", "en") else "fr"
@@ -655,26 +703,12 @@ async def generate_cv(
         }
 
         # Rendre le template LaTeX
-        renderer = LatexRenderer(temp_path, template_filename)
-        tex_content = renderer.render(render_data)
+        tex_content = templates.render(template_id, render_data)
         if preview:
             tex_content = _apply_preview_watermark(tex_content, watermark_lang)
 
-        # Écrire le fichier .tex
-        tex_file = temp_path / "main.tex"
-        tex_file.write_text(tex_content, encoding="utf-8")
-
-        # Compiler en PDF
-        compiler = PdfCompiler(tex_file)
-        compiler.compile(clean=True)
-
-        # Vérifier que le PDF a été généré
-        pdf_file = temp_path / "main.pdf"
-        if not pdf_file.exists():
-            raise HTTPException(status_code=500, detail="Échec de la génération du PDF")
-
-        # SECURITY: Read PDF content before cleanup to ensure temp files are always deleted
-        pdf_content = pdf_file.read_bytes()
+        # Compiler en PDF via le pool de compilation, sans bloquer la boucle asyncio
+        pdf_content = await get_compile_pool().compile_async(tex_content, template_id)
 
     except RuntimeError as e:
         raise HTTPException(status_code=500, detail=f"Erreur de compilation LaTeX: {e}") from e
@@ -682,19 +716,13 @@ async def generate_cv(
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur inattendue: {e}") from e
-    finally:
-        # SECURITY: Always clean up temporary files, even on exceptions
-        with contextlib.suppress(Exception):
-            shutil.rmtree(temp_path)
 
     if not preview:
         # Increment download counter only for explicit exports/downloads.
         current_user.download_count += 1
-        db.commit()
+        await db.commit()
 
     # Return PDF from memory (temp files already cleaned up)
-    from io import BytesIO
-
     name = data.personal.name.strip() if data.personal.name else ""
     pdf_filename = f"{name.replace(' ', '_')}_CV.pdf" if name else "CV.pdf"
 
@@ -720,11 +748,53 @@ class OptimalSizeResponse(BaseModel):
     tested_sizes: list[dict[str, Any]]
 
 
+async def _first_fitting_size(
+    data: ResumeData, candidates: list[tuple[str, str]], tested_sizes: list[dict[str, Any]]
+) -> tuple[str, str] | None:
+    """Compile les tailles candidates et retourne la première (par priorité) tenant sur une page.
+
+    Avec OPTIMAL_SIZE_SPECULATIVE, toutes les tailles sont compilées en parallèle :
+    les résultats sont lus dans l'ordre de priorité et les compilations devenues
+    inutiles sont annulées dès qu'une taille tient sur une page.
+    """
+    tasks: list[asyncio.Task] = []
+    if OPTIMAL_SIZE_SPECULATIVE:
+        tasks = [
+            asyncio.create_task(generate_pdf_and_count_pages(data, template_id))
+            for _, template_id in candidates
+        ]
+
+    try:
+        for index, (size, template_id) in enumerate(candidates):
+            try:
+                if tasks:
+                    _, page_count = await tasks[index]
+                else:
+                    _, page_count = await generate_pdf_and_count_pages(data, template_id)
+
+                tested_sizes.append(
+                    {"size": size, "template_id": template_id, "page_count": page_count}
+                )
+
+                # Si le PDF tient sur une page, on a trouvé la taille optimale
+                if page_count == 1:
+                    return size, template_id
+            except Exception as e:
+                tested_sizes.append({"size": size, "template_id": template_id, "error": str(e)})
+    finally:
+        # Annuler les compilations restantes (encore en file d'attente ou non lues)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    return None
+
+
 @app.post("/optimal-size", response_model=OptimalSizeResponse)
 async def find_optimal_size(
     data: ResumeData,
     current_user: CurrentUser,
-    db: Any = Depends(get_db),  # noqa: B008
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     preview: bool = False,
 ):
     """
@@ -735,52 +805,60 @@ async def find_optimal_size(
     - Si > 1 page, teste 'normal'
     - Si > 1 page, utilise 'compact'
 
+    Avec PAGE_ESTIMATOR_ENABLED et une calibration du template, les tailles dont le
+    résultat est évident (nettement sous ou au-dessus d'une page) ne sont pas
+    compilées : seules les tailles proches de la limite passent par LaTeX.
+
     Returns:
         OptimalSizeResponse avec la taille optimale et le template_id correspondant.
     """
     if not preview:
-        _enforce_generation_quota(current_user, db)
+        await _enforce_generation_quota(current_user, db)
 
     base_template = get_base_template(data.template_id)
-    tested_sizes = []
-    temp_dirs = []
-
-    try:
-        for size in SIZE_VARIANTS:  # ["large", "normal", "compact"]
-            template_id = get_template_with_size(base_template, size)
+    tested_sizes: list[dict[str, Any]] = []
 
-            # Vérifier que le template existe
-            if template_id not in VALID_TEMPLATES:
-                continue
+    estimator = get_page_estimator()
+    resume = data.model_dump()
 
-            try:
-                pdf_file, page_count, temp_path = generate_pdf_and_count_pages(data, template_id)
-                temp_dirs.append(temp_path)
+    # Tailles à compiler, jusqu'à la première dont l'estimation tient sûrement sur une page
+    to_compile: list[tuple[str, str]] = []
+    estimated_fit: tuple[str, str] | None = None
+    for size in SIZE_VARIANTS:  # ["large", "normal", "compact"]
+        template_id = get_template_with_size(base_template, size)
 
-                tested_sizes.append(
-                    {"size": size, "template_id": template_id, "page_count": page_count}
-                )
+        # Vérifier que le template existe
+        if template_id not in VALID_TEMPLATES:
+            continue
 
-                # Si le PDF tient sur une page, on a trouvé la taille optimale
-                if page_count == 1:
-                    return OptimalSizeResponse(
-                        optimal_size=size, template_id=template_id, tested_sizes=tested_sizes
-                    )
-            except Exception as e:
-                tested_sizes.append({"size": size, "template_id": template_id, "error": str(e)})
+        verdict = estimator.classify(template_id, resume) if PAGE_ESTIMATOR_ENABLED else None
+        if verdict is None:
+            to_compile.append((size, template_id))
+            continue
 
-        # Si aucune taille ne permet de tenir sur une page, utiliser compact
+        estimated_pages = round(estimator.estimate_pages(template_id, resume), 2)
+        tested_sizes.append(
+            {"size": size, "template_id": template_id, "estimated_pages": estimated_pages}
+        )
+        if verdict == "fits":
+            estimated_fit = (size, template_id)
+            break
+
+    fitting = await _first_fitting_size(data, to_compile, tested_sizes) or estimated_fit
+    # Estimations et compilations dans l'ordre où les tailles sont évaluées (tri stable)
+    tested_sizes.sort(key=lambda tested: SIZE_VARIANTS.index(tested["size"]))
+    if fitting is not None:
+        size, template_id = fitting
         return OptimalSizeResponse(
-            optimal_size="compact",
-            template_id=get_template_with_size(base_template, "compact"),
-            tested_sizes=tested_sizes,
+            optimal_size=size, template_id=template_id, tested_sizes=tested_sizes
         )
 
-    finally:
-        # Nettoyer tous les dossiers temporaires
-        for temp_dir in temp_dirs:
-            with contextlib.suppress(Exception):
-                shutil.rmtree(temp_dir)
+    # Si aucune taille ne permet de tenir sur une page, utiliser compact
+    return OptimalSizeResponse(
+        optimal_size="compact",
+        template_id=get_template_with_size(base_template, "compact"),
+        tested_sizes=tested_sizes,
+    )
 
 
 @app.get("/default-data")
@@ -802,10 +880,36 @@ async def get_default_data():
     return data
 
 
+async def _cached_import(file: UploadFile, user: User) -> dict[str, Any] | None:
+    """Résultat en cache d'un import déjà fait de ce PDF par cet utilisateur.
+
+    Consulté quand le quota est atteint : rejouer un import ne consomme pas de crédit.
+    """
+    try:
+        temp_pdf_path = await _store_pdf_upload_with_limits(file)
+        try:
+            text_content = await _extract_text_from_pdf_with_limits(temp_pdf_path)
+        finally:
+            with contextlib.suppress(Exception):
+                temp_pdf_path.unlink()
+    except Exception:
+        # PDF refusé ou illisible : l'erreur de quota reste la réponse
+        return None
+
+    prompt = get_prompt_registry().get("cv_import")
+    cache = get_import_cache()
+    cache_key = cache.key(
+        text_content,
+        ImportCache.prompt_version(prompt.fingerprint, get_mistral_client().model),
+        user.id,
+    )
+    return await cache.get_async(cache_key)
+
+
 @app.post("/import")
 async def import_cv(
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     file: UploadFile = File(...),  # noqa: B008
 ):
     """
@@ -821,7 +925,15 @@ async def import_cv(
         ResumeData: Données structurées du CV.
     """
     _validate_pdf_file_metadata(file)
-    _enforce_import_quota(current_user, db)
+    await refresh_user_async(db, current_user)
+    try:
+        _enforce_import_quota(current_user, db)
+    except HTTPException:
+        # Quota atteint : seul un import déjà en cache peut encore être rejoué
+        cached = await _cached_import(file, current_user)
+        if cached is None:
+            raise
+        return cached
 
     # Vérifier la clé API Mistral
     api_key = os.environ.get("MISTRAL_API_KEY")
@@ -833,144 +945,38 @@ async def import_cv(
     try:
         temp_pdf_path = await _store_pdf_upload_with_limits(file)
         try:
-            text_content = _extract_text_from_pdf_with_limits(temp_pdf_path)
+            text_content = await _extract_text_from_pdf_with_limits(temp_pdf_path)
         finally:
             with contextlib.suppress(Exception):
                 temp_pdf_path.unlink()
 
-        # Appeler Mistral pour structurer les données
-        client = Mistral(api_key=api_key)
-
-        system_prompt = """Tu es un assistant spécialisé dans l'extraction de données de CV.
-Analyse le texte du CV fourni et retourne un JSON avec la structure exacte suivante:
-
-{
-  "personal": {
-    "name": "Nom complet",
-    "title": "Titre professionnel",
-    "location": "Ville, Pays",
-    "email": "email@example.com",
-    "phone": "+33 6 12 34 56 78",
-    "links": [
-      {"platform": "linkedin", "username": "john-doe", "url": "https://linkedin.com/in/john-doe"},
-      {"platform": "github", "username": "johndoe", "url": "https://github.com/johndoe"},
-      {"platform": "portfolio", "username": "Mon Portfolio", "url": "https://johndoe.dev"},
-      {"platform": "behance", "username": "johndoe", "url": "https://behance.net/johndoe"},
-      {"platform": "website", "username": "Site Personnel", "url": "https://example.com"},
-      {"platform": "other", "username": "Autre Lien", "url": "https://..."}
-    ]
-  },
-  "sections": [
-    {
-      "id": "sec-1",
-      "type": "summary",
-      "title": "Summary",
-      "isVisible": true,
-      "items": "Professionnel expérimenté avec X années d'expérience en..."
-    },
-    {
-      "id": "sec-2",
-      "type": "education",
-      "title": "Education",
-      "isVisible": true,
-      "items": [
-        {
-            "school": "Nom école",
-            "degree": "Diplôme",
-            "dates": "2020 - 2024",
-            "subtitle": "Mention/GPA",
-            "description": "Description",
-        }
-      ]
-    },
-    {
-      "id": "sec-3",
-      "type": "experiences",
-      "title": "Experiences",
-      "isVisible": true,
-      "items": [
-        {
-            "title": "Poste",
-            "company": "Entreprise",
-            "dates": "Jan 2023 - Present",
-            "highlights": ["Point 1", "Point 2"],
-        }
-      ]
-    },
-    {
-      "id": "sec-4",
-      "type": "projects",
-      "title": "Projects",
-      "isVisible": true,
-      "items": [
-        {
-            "name": "Nom projet",
-            "year": "2023",
-            "highlights": ["Description 1", "Description 2"],
-        }
-      ]
-    },
-    {
-      "id": "sec-5",
-      "type": "skills",
-      "title": "Technical Skills",
-      "isVisible": true,
-      "items": [
-          {"id": "sk-1", "category": "Programming Languages", "skills": "Python, JavaScript, C++"},
-          {"id": "sk-2", "category": "Tools", "skills": "Git, Docker, Linux"}
-      ]
-    },
-    {
-      "id": "sec-6",
-      "type": "leadership",
-      "title": "Leadership",
-      "isVisible": true,
-      "items": [
-        {
-            "role": "Rôle",
-            "place": "Organisation",
-            "dates": "2022 - 2023",
-            "highlights": ["Action 1"],
-        }
-      ]
-    },
-    {
-      "id": "sec-7",
-      "type": "languages",
-      "title": "Languages",
-      "isVisible": true,
-      "items": "Français (natif), Anglais (courant)"
-    }
-  ],
-  "template_id": "harvard"
-}
+        # Appeler Mistral pour structurer les données (client partagé, sans bloquer la boucle)
+        prompt = get_prompt_registry().get("cv_import")
+
+        # Même CV déjà importé avec ce prompt : rejouer le résultat sans appel ni décompte
+        mistral = get_mistral_client()
+        cache = get_import_cache()
+        cache_key = cache.key(
+            text_content,
+            ImportCache.prompt_version(prompt.fingerprint, mistral.model),
+            current_user.id,
+        )
+        cached = await cache.get_async(cache_key)
+        if cached is not None:
+            return cached
 
-IMPORTANT:
-- "links" est un ARRAY de liens professionnels. Chaque lien a: platform
-  (linkedin, github, portfolio, behance, website, other), username (texte affiché),
-  url (lien complet)
-- N'ajoute que les liens présents dans le CV
-- Pour "summary", items est une STRING (le texte du résumé/profil)
-- Pour "skills", items est un ARRAY d'objets avec: id (unique), category (nom de la catégorie), skills (compétences séparées par virgules)
-- Pour "languages", items est une STRING simple
-- Pour les autres types, items est un ARRAY d'objets
-- Génère des IDs uniques pour chaque section (sec-1, sec-2, etc.)
-- Si une info n'est pas dans le CV, utilise une chaîne vide "" ou un array vide []
-- N'invente pas d'informations, extrais uniquement ce qui est présent"""
-
-        response = client.chat.complete(
-            model="mistral-small-latest",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Voici le texte extrait du CV:\n\n{text_content}"},
-            ],
+        content = await mistral.complete(
+            prompt.messages(text_content),
+            on_usage=partial(get_prompt_registry().record_usage, prompt),
             response_format={"type": "json_object"},
         )
 
-        result = json.loads(response.choices[0].message.content)
+        result = json.loads(content)
+        if isinstance(result, dict):
+            await cache.put_async(cache_key, result)
 
         current_user.import_count += 1
-        db.commit()
+        await db.commit()
 
         return result
 
@@ -980,10 +986,24 @@ IMPORTANT:
         raise HTTPException(status_code=500, detail=f"Erreur lors de l'import: {str(e)}") from e
 
 
+def _import_replay_events(result: dict[str, Any]) -> Iterator[str]:
+    """Événements SSE d'un import déjà en cache, dans l'ordre d'un import en streaming."""
+    if isinstance(result.get("personal"), dict):
+        yield f"data: {json.dumps({'type': 'personal', 'data': result['personal']})}\n\n"
+
+    sent_section_ids = set()
+    for section in result.get("sections") or []:
+        if isinstance(section, dict) and "id" in section and section["id"] not in sent_section_ids:
+            sent_section_ids.add(section["id"])
+            yield f"data: {json.dumps({'type': 'section', 'data': section})}\n\n"
+
+    yield f"data: {json.dumps({'type': 'complete', 'data': result})}\n\n"
+
+
 @app.post("/import-stream")
 async def import_cv_stream(
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     file: UploadFile = File(...),  # noqa: B008
 ):
     """
@@ -991,7 +1011,23 @@ async def import_cv_stream(
     Envoie les sections au fur et à mesure qu'elles sont extraites.
     """
     _validate_pdf_file_metadata(file)
-    _enforce_import_quota(current_user, db)
+    await refresh_user_async(db, current_user)
+    try:
+        _enforce_import_quota(current_user, db)
+    except HTTPException:
+        # Quota atteint : seul un import déjà en cache peut encore être rejoué
+        cached = await _cached_import(file, current_user)
+        if cached is None:
+            raise
+        return StreamingResponse(
+            iter(_import_replay_events(cached)),
+            media_type="text/event-stream",
+            headers={
+                "Cache-Control": "no-cache",
+                "Connection": "keep-alive",
+                "X-Accel-Buffering": "no",
+            },
+        )
 
     # Vérifier la clé API Mistral
     api_key = os.environ.get("MISTRAL_API_KEY")
@@ -1008,7 +1044,7 @@ async def import_cv_stream(
 
             temp_pdf_path = await _store_pdf_upload_with_limits(file)
             try:
-                text_content = _extract_text_from_pdf_with_limits(temp_pdf_path)
+                text_content = await _extract_text_from_pdf_with_limits(temp_pdf_path)
             finally:
                 with contextlib.suppress(Exception):
                     temp_pdf_path.unlink()
@@ -1017,291 +1053,61 @@ async def import_cv_stream(
             yield f"data: {json.dumps({'type': 'status', 'message': 'processing'})}\n\n"
             await asyncio.sleep(0)
 
-            # Appeler Mistral avec streaming
-            client = Mistral(api_key=api_key)
-
-            system_prompt = """Tu es un assistant spécialisé dans l'extraction de données de CV.
-Analyse le texte du CV fourni et retourne un JSON avec la structure exacte suivante:
-
-{
-  "personal": {
-    "name": "Nom complet",
-    "title": "Titre professionnel",
-    "location": "Ville, Pays",
-    "email": "email@example.com",
-    "phone": "+33 6 12 34 56 78",
-    "links": [
-      {"platform": "linkedin", "username": "john-doe", "url": "https://linkedin.com/in/john-doe"},
-      {"platform": "github", "username": "johndoe", "url": "https://github.com/johndoe"},
-      {"platform": "portfolio", "username": "Mon Portfolio", "url": "https://johndoe.dev"},
-      {"platform": "behance", "username": "johndoe", "url": "https://behance.net/johndoe"},
-      {"platform": "website", "username": "Site Personnel", "url": "https://example.com"},
-      {"platform": "other", "username": "Autre Lien", "url": "https://..."}
-    ]
-  },
-  "sections": [
-    {
-      "id": "sec-1",
-      "type": "summary",
-      "title": "Summary",
-      "isVisible": true,
-      "items": "Professionnel expérimenté avec X années d'expérience en..."
-    },
-    {
-      "id": "sec-2",
-      "type": "education",
-      "title": "Education",
-      "isVisible": true,
-      "items": [
-        {
-            "school": "Nom école",
-            "degree": "Diplôme",
-            "dates": "2020 - 2024",
-            "subtitle": "Mention/GPA",
-            "description": "Description",
-        }
-      ]
-    },
-    {
-      "id": "sec-3",
-      "type": "experiences",
-      "title": "Experiences",
-      "isVisible": true,
-      "items": [
-        {
-            "title": "Poste",
-            "company": "Entreprise",
-            "dates": "Jan 2023 - Present",
-            "highlights": ["Point 1", "Point 2"],
-        }
-      ]
-    },
-    {
-      "id": "sec-4",
-      "type": "projects",
-      "title": "Projects",
-      "isVisible": true,
-      "items": [
-        {
-            "name": "Nom projet",
-            "year": "2023",
-            "highlights": ["Description 1", "Description 2"],
-        }
-      ]
-    },
-    {
-      "id": "sec-5",
-      "type": "skills",
-      "title": "Technical Skills",
-      "isVisible": true,
-      "items": [
-          {"id": "sk-1", "category": "Programming Languages", "skills": "Python, JavaScript, C++"},
-          {"id": "sk-2", "category": "Tools", "skills": "Git, Docker, Linux"}
-      ]
-    },
-    {
-      "id": "sec-6",
-      "type": "leadership",
-      "title": "Leadership",
-      "isVisible": true,
-      "items": [
-        {
-            "role": "Rôle",
-            "place": "Organisation",
-            "dates": "2022 - 2023",
-            "highlights": ["Action 1"],
-        }
-      ]
-    },
-    {
-      "id": "sec-7",
-      "type": "languages",
-      "title": "Languages",
-      "isVisible": true,
-      "items": "Français (natif), Anglais (courant)"
-    },
-    {
-      "id": "sec-8",
-      "type": "custom",
-      "title": "Centres d'intérêt",
-      "isVisible": true,
-      "items": [
-        {
-            "title": "Sport",
-            "subtitle": "",
-            "dates": "",
-            "highlights": ["Football en club", "Course à pied"],
-        },
-        {
-            "title": "Musique",
-            "subtitle": "",
-            "dates": "",
-            "highlights": ["Piano depuis 10 ans"],
-        }
-      ]
-    }
-  ],
-  "template_id": "harvard"
-}
+            # Appeler Mistral avec streaming (client partagé)
+            prompt = get_prompt_registry().get("cv_import")
 
-IMPORTANT:
-- "links" est un ARRAY de liens professionnels. Chaque lien a: platform
-  (linkedin, github, portfolio, behance, website, other), username (texte affiché),
-  url (lien complet)
-- N'ajoute que les liens présents dans le CV
-- Pour "summary", items est une STRING (le texte du résumé/profil)
-- Pour "skills", items est un ARRAY d'objets avec: id (unique), category (nom de la catégorie), skills (compétences séparées par virgules)
-- Pour "languages", items est une STRING simple
-- Pour "custom", items est un ARRAY d'objets avec: title, subtitle (optionnel),
-  dates (optionnel), highlights (array de strings)
-- Pour les autres types (education, experiences, projects, leadership), items est
-  un ARRAY d'objets selon leur structure respective
-- Les types de section connus sont: summary, education, experiences, projects,
-  skills, leadership, languages
-- Pour TOUTE autre section du CV (Centres d'intérêt, Publications, Certifications,
-  Bénévolat, Hobbies, Récompenses, etc.), utilise type="custom" avec le titre
-  original de la section
-- Génère des IDs uniques pour chaque section (sec-1, sec-2, etc.)
-- Si une info n'est pas dans le CV, utilise une chaîne vide "" ou un array vide []
-- N'invente pas d'informations, extrais uniquement ce qui est présent
-- EXTRAIS TOUTES les sections présentes dans le CV, même celles qui ne
-  correspondent pas aux types standards"""
+            # Même CV déjà importé avec ce prompt : rejouer les événements sans appel ni décompte
+            mistral = get_mistral_client()
+            cache = get_import_cache()
+            cache_key = cache.key(
+                text_content,
+                ImportCache.prompt_version(prompt.fingerprint, mistral.model),
+                current_user.id,
+            )
+            cached = await cache.get_async(cache_key)
+            if cached is not None:
+                for line in _import_replay_events(cached):
+                    yield line
+                return
 
             # Streaming depuis Mistral (async)
-            stream = await client.chat.stream_async(
-                model="mistral-small-latest",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Voici le texte extrait du CV:\n\n{text_content}"},
-                ],
+            stream = mistral.stream(
+                prompt.messages(text_content),
+                on_usage=partial(get_prompt_registry().record_usage, prompt),
                 response_format={"type": "json_object"},
             )
 
-            accumulated_json = ""
-            sent_personal = False
+            # Analyse incrémentale : chaque chunk n'est parcouru qu'une fois
+            parser = JsonEventParser(objects=("personal",), arrays=("sections",))
             sent_section_ids = set()
 
-            def extract_json_object(text: str, start_key: str) -> tuple[dict | None, int]:
-                """Extrait un objet JSON complet après une clé donnée."""
-                key_pattern = f'"{start_key}"\\s*:\\s*'
-                match = re.search(key_pattern, text)
-                if not match:
-                    return None, -1
-
-                start = match.end()
-                if start >= len(text):
-                    return None, -1
-
-                # Trouver le début de l'objet ou array
-                while start < len(text) and text[start] in " \t\n\r":
-                    start += 1
-
-                if start >= len(text):
-                    return None, -1
-
-                open_char = text[start]
-                if open_char == "{":
-                    close_char = "}"
-                elif open_char == "[":
-                    close_char = "]"
-                elif open_char == '"':
-                    # C'est une string, chercher la fin
-                    end = start + 1
-                    while end < len(text):
-                        if text[end] == '"' and text[end - 1] != "\\":
-                            try:
-                                return json.loads(text[start : end + 1]), end + 1
-                            except Exception:
-                                return None, -1
-                        end += 1
-                    return None, -1
-                else:
-                    return None, -1
-
-                # Compter les brackets pour trouver la fin
-                depth = 1
-                pos = start + 1
-                in_string = False
-
-                while pos < len(text) and depth > 0:
-                    char = text[pos]
-                    if char == '"' and (pos == 0 or text[pos - 1] != "\\"):
-                        in_string = not in_string
-                    elif not in_string:
-                        if char == open_char:
-                            depth += 1
-                        elif char == close_char:
-                            depth -= 1
-                    pos += 1
-
-                if depth == 0:
-                    try:
-                        return json.loads(text[start:pos]), pos
-                    except json.JSONDecodeError:
-                        return None, -1
-
-                return None, -1
-
-            async for event in stream:
-                if event.data.choices[0].delta.content:
-                    accumulated_json += event.data.choices[0].delta.content
-
-                    # Extraire personal dès qu'il est complet
-                    if not sent_personal and '"personal"' in accumulated_json:
-                        personal_data, _ = extract_json_object(accumulated_json, "personal")
-                        if personal_data:
-                            msg = json.dumps({"type": "personal", "data": personal_data})
-                            yield f"data: {msg}\n\n"
-                            await asyncio.sleep(0)
-                            sent_personal = True
-
-                    # Extraire les sections individuellement au fur et à mesure
-                    # Chercher tous les objets qui commencent par {"id": "sec-
-                    section_starts = [
-                        m.start() for m in re.finditer(r'\{\s*"id"\s*:\s*"sec-', accumulated_json)
-                    ]
-                    for start_pos in section_starts:
-                        # Compter les brackets pour trouver la fin de cet objet
-                        depth = 0
-                        pos = start_pos
-                        in_string = False
-
-                        while pos < len(accumulated_json):
-                            char = accumulated_json[pos]
-                            if char == '"' and (pos == 0 or accumulated_json[pos - 1] != "\\"):
-                                in_string = not in_string
-                            elif not in_string:
-                                if char == "{":
-                                    depth += 1
-                                elif char == "}":
-                                    depth -= 1
-                                    if depth == 0:
-                                        # Objet complet trouvé
-                                        try:
-                                            section_json = accumulated_json[start_pos : pos + 1]
-                                            section = json.loads(section_json)
-                                            if (
-                                                "id" in section
-                                                and section["id"] not in sent_section_ids
-                                            ):
-                                                msg = json.dumps(
-                                                    {"type": "section", "data": section}
-                                                )
-                                                yield f"data: {msg}\n\n"
-                                                await asyncio.sleep(0)
-                                                sent_section_ids.add(section["id"])
-                                        except json.JSONDecodeError:
-                                            pass
-                                        break
-                            pos += 1
+            async for delta in stream:
+                for key, value in parser.feed(delta):
+                    if key == "personal":
+                        # Envoyer personal dès qu'il est complet
+                        msg = json.dumps({"type": "personal", "data": value})
+                    elif (
+                        isinstance(value, dict)
+                        and "id" in value
+                        and value["id"] not in sent_section_ids
+                    ):
+                        # Envoyer chaque section dès qu'elle est complète
+                        sent_section_ids.add(value["id"])
+                        msg = json.dumps({"type": "section", "data": value})
+                    else:
+                        continue
+                    yield f"data: {msg}\n\n"
+                    await asyncio.sleep(0)
 
             # Parser le JSON final complet
             try:
-                result = json.loads(accumulated_json)
+                result = json.loads(parser.text)
                 msg = json.dumps({"type": "complete", "data": result})
                 yield f"data: {msg}\n\n"
+                if isinstance(result, dict):
+                    await cache.put_async(cache_key, result)
                 current_user.import_count += 1
-                db.commit()
+                await db.commit()
             except json.JSONDecodeError as e:
                 error_msg = json.dumps(
                     {"type": "error", "message": f"Erreur parsing JSON: {str(e)}"}
@@ -1330,17 +1136,45 @@ async def health():
     return {"status": "ok", "message": "CV Generator API v2"}
 
 
+@app.get("/health_pdf", dependencies=[Depends(require_metrics_token)])
+async def health_pdf():
+    """Compteurs des pools de compilation et d'extraction, du cache PDF (accès interne)."""
+    from core.PdfCache import get_pdf_cache
+
+    pool = get_compile_pool()
+    return {
+        "compile_pool": pool.stats(),
+        "compile_workspaces": pool.workspaces.stats(),
+        "pdf_cache": get_pdf_cache().stats(),
+        "text_extraction": get_text_extraction_pool().stats(),
+    }
+
+
+@app.get("/health_email", dependencies=[Depends(require_metrics_token)])
+async def health_email():
+    """Compteurs de la file d'envoi des emails (en attente, envoyés, en échec définitif)."""
+    return {"email_outbox": await asyncio.to_thread(get_email_outbox().stats)}
+
+
 @app.get("/health_db")
 async def health_db():
     """Endpoint de santé pour vérifier la connexion à la base de données."""
-    from database.db_config import check_db_connection
+    from database.db_config import check_async_db_connection
 
-    if check_db_connection():
+    if await check_async_db_connection():
         return {"status": "ok", "database": "connected"}
     else:
         raise HTTPException(status_code=503, detail="Database connection failed")
 
 
+@app.get("/health_db_pool", dependencies=[Depends(require_metrics_token)])
+async def health_db_pool():
+    """Compteurs du pool de connexions à la base de données (accès interne)."""
+    from database.db_config import pool_stats
+
+    return {"pool": pool_stats()}
+
+
 # Servir le frontend statique en production
 if STATIC_DIR.exists():
     # Monter les assets statiques
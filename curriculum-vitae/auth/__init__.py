@@ -6,12 +6,16 @@ from auth.security import (
     create_access_token,
     decode_access_token,
     get_password_hash,
+    get_password_hash_async,
     verify_password,
+    verify_password_async,
 )
 
 __all__ = [
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "decode_access_token",
     "get_current_user",
@@ -1,18 +1,24 @@
 """FastAPI dependencies for authentication."""
 
+import os
 import secrets
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, Request, status
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.security import decode_access_token
-from database.db_config import get_db
+from auth.user_cache import get_user_cache
+from database.db_config import get_async_db
 from database.models import User
 
 ACCESS_COOKIE_NAME = "access_token"
 CSRF_COOKIE_NAME = "csrf_token"
+# Shared secret for the internal metrics endpoints (/health_pdf, /health_email,
+# /health_db_pool); unset hides them
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 
 # OAuth2 scheme - token in Authorization: Bearer <token> header (optional fallback to cookie)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
@@ -21,9 +27,13 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=Fals
 async def get_current_user(
     request: Request,
     bearer_token: Annotated[str | None, Depends(oauth2_scheme)],
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> User:
-    """Dependency to get the current authenticated user from JWT token or auth cookie."""
+    """Dependency to get the current authenticated user from JWT token or auth cookie.
+
+    The user may come from the short-lived user cache: call
+    ``auth.user_cache.refresh_user_async`` before reading or updating its counters.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -62,12 +72,35 @@ async def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception from None
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user_cache = get_user_cache()
+    # Read before the query: a write committed meanwhile makes put_async drop this row
+    generation = user_cache.generation(user_id)
+    user = await user_cache.get_async(db, user_id)
+    if user is not None:
+        return user
+
+    user = await db.scalar(select(User).where(User.id == user_id))
     if user is None:
         raise credentials_exception
 
+    await user_cache.put_async(user, generation)
     return user
 
 
+def require_metrics_token(
+    x_metrics_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Dependency for internal metrics: 404 unless ``X-Metrics-Token`` matches METRICS_TOKEN.
+
+    Answers 404 rather than 401 so the endpoints are invisible to the public.
+    """
+    if (
+        not METRICS_TOKEN
+        or x_metrics_token is None
+        or not secrets.compare_digest(x_metrics_token, METRICS_TOKEN)
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+
+
 # Type alias for dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
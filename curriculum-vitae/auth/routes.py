@@ -14,18 +14,19 @@ import redis
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import CurrentUser
 from auth.schemas import (
-    FeedbackExportData,
     FeedbackCreate,
+    FeedbackExportData,
     FeedbackResponse,
     ForgotPasswordRequest,
     GuestUpgrade,
     ResendVerificationRequest,
-    ResumeExportData,
     ResetPasswordRequest,
+    ResumeExportData,
     Token,
     UserCreate,
     UserDataExport,
@@ -35,13 +36,15 @@ from auth.schemas import (
 )
 from auth.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    PasswordHasherBusyError,
     create_access_token,
     decode_access_token,
-    get_password_hash,
-    verify_password,
+    get_password_hash_async,
+    verify_password_async,
 )
+from auth.user_cache import refresh_user_async
 from core.email import send_password_reset_email, send_verification_email, send_welcome_email
-from database.db_config import get_db
+from database.db_config import get_async_db
 from database.models import Feedback, Resume, User
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
@@ -161,6 +164,23 @@ def _reset_rate_limit_state() -> None:
             break
 
 
+def _password_hasher_busy() -> HTTPException:
+    """503 returned when the password hashing pool refuses new work."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy. Please try again shortly.",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _hash_password(password: str) -> str:
+    """Hash a password off the event loop; 503 when the hashing pool is saturated."""
+    try:
+        return await get_password_hash_async(password)
+    except PasswordHasherBusyError:
+        raise _password_hasher_busy() from None
+
+
 def _set_auth_cookies(response: Response, jwt_token: str) -> None:
     """Set strictly necessary auth + CSRF cookies."""
     csrf_token = secrets.token_urlsafe(32)
@@ -220,7 +240,7 @@ async def register(
     request: Request,
     user_data: UserCreate,
     background_tasks: BackgroundTasks,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> dict[str, str]:
     """Register a new user and send a verification email.
 
@@ -240,12 +260,12 @@ async def register(
     generic_message = "If this email is not registered, a verification email has been sent."
 
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user:
         return {"message": generic_message}
 
     # Create new user with hashed password (unverified by default)
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await _hash_password(user_data.password)
     new_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -253,8 +273,8 @@ async def register(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     # Generate email verification token (valid 24h)
     verification_token = create_access_token(
@@ -275,7 +295,7 @@ async def login(
     request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     response: Response,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> Token:
     """Authenticate user and return JWT token (OAuth2 Password Flow).
 
@@ -295,14 +315,18 @@ async def login(
     _enforce_rate_limit(request, "login")
 
     # Find user by email (OAuth2 uses 'username' field)
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
 
     # Some accounts (OAuth-only or legacy/corrupted rows) may not have a usable password hash.
     # Never crash on hash verification errors: invalid credentials must always return 401.
     password_valid = False
     if user and user.password_hash:
-        with contextlib.suppress(Exception):
-            password_valid = verify_password(form_data.password, user.password_hash)
+        try:
+            password_valid = await verify_password_async(form_data.password, user.password_hash)
+        except PasswordHasherBusyError:
+            raise _password_hasher_busy() from None
+        except Exception:
+            password_valid = False
 
     if not user or not password_valid:
         raise HTTPException(
@@ -335,7 +359,7 @@ async def login(
 @router.post("/guest", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def create_guest_account(
     response: Response,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> Token:
     """Create an anonymous guest account.
 
@@ -359,8 +383,8 @@ async def create_guest_account(
     )
 
     db.add(guest_user)
-    db.commit()
-    db.refresh(guest_user)
+    await db.commit()
+    await db.refresh(guest_user)
 
     # Create access token with guest flag
     access_token = create_access_token(
@@ -381,7 +405,7 @@ async def upgrade_guest_account(
     background_tasks: BackgroundTasks,
     response: Response,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> User:
     """Upgrade a guest account to a permanent account.
 
@@ -400,6 +424,7 @@ async def upgrade_guest_account(
         HTTPException: 400 if user is not a guest, 409 if email already exists.
     """
     # Verify this is a guest account
+    await refresh_user_async(db, current_user)
     if not current_user.is_guest:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -407,7 +432,7 @@ async def upgrade_guest_account(
         )
 
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == upgrade_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == upgrade_data.email))
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -416,12 +441,12 @@ async def upgrade_guest_account(
 
     # Upgrade the account (requires email verification like normal registration)
     current_user.email = upgrade_data.email
-    current_user.password_hash = get_password_hash(upgrade_data.password)
+    current_user.password_hash = await _hash_password(upgrade_data.password)
     current_user.is_guest = False
     current_user.is_verified = False
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
 
     verification_token = create_access_token(
         data={
@@ -453,12 +478,13 @@ async def change_unverified_email(
     background_tasks: BackgroundTasks,
     response: Response,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> User:
     """Change email + password for unverified accounts.
 
     Allows correcting an email mistake before verification.
     """
+    await refresh_user_async(db, current_user)
     if current_user.is_guest:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -470,7 +496,7 @@ async def change_unverified_email(
             detail="Email is already verified",
         )
 
-    existing_user = db.query(User).filter(User.email == change_data.email).first()
+    existing_user = await db.scalar(select(User).where(User.email == change_data.email))
     if existing_user and existing_user.id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -478,11 +504,11 @@ async def change_unverified_email(
         )
 
     current_user.email = change_data.email
-    current_user.password_hash = get_password_hash(change_data.password)
+    current_user.password_hash = await _hash_password(change_data.password)
     current_user.is_verified = False
 
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
 
     verification_token = create_access_token(
         data={
@@ -558,7 +584,7 @@ async def google_callback(
     state: str,
     request: Request,
     background_tasks: BackgroundTasks,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> RedirectResponse:
     """Handle Google OAuth2 callback.
 
@@ -637,17 +663,17 @@ async def google_callback(
         )
 
     # Find or create user
-    user = db.query(User).filter(User.google_id == google_id).first()
+    user = await db.scalar(select(User).where(User.google_id == google_id))
     is_new_user = False
 
     if not user:
         # Check if email already exists (user registered with password)
-        existing_user = db.query(User).filter(User.email == email).first()
+        existing_user = await db.scalar(select(User).where(User.email == email))
         if existing_user:
             # Link Google account to existing user (Google validates email)
             existing_user.google_id = google_id
             existing_user.is_verified = True
-            db.commit()
+            await db.commit()
             user = existing_user
         else:
             # Create new user (Google already validated the email)
@@ -659,8 +685,8 @@ async def google_callback(
                 is_verified=True,
             )
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            await db.commit()
+            await db.refresh(user)
 
     if is_new_user:
         background_tasks.add_task(send_welcome_email, user.email)
@@ -733,7 +759,7 @@ async def forgot_password(
     request: Request,
     data: ForgotPasswordRequest,
     background_tasks: BackgroundTasks,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> dict[str, str]:
     """Request a password reset email.
 
@@ -742,7 +768,7 @@ async def forgot_password(
     """
     _enforce_rate_limit(request, "forgot_password")
 
-    user = db.query(User).filter(User.email == data.email).first()
+    user = await db.scalar(select(User).where(User.email == data.email))
 
     if user and user.password_hash:
         token = create_access_token(
@@ -762,7 +788,7 @@ async def forgot_password(
 @router.post("/reset-password")
 async def reset_password(
     data: ResetPasswordRequest,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> dict[str, str]:
     """Reset password using a valid reset token."""
     payload = decode_access_token(data.token)
@@ -775,7 +801,7 @@ async def reset_password(
     user_id = payload.get("sub")
     hash_prefix = payload.get("hash")
 
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.scalar(select(User).where(User.id == int(user_id)))
     if not user or not user.password_hash:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -789,8 +815,8 @@ async def reset_password(
             detail="This reset link has already been used",
         )
 
-    user.password_hash = get_password_hash(data.password)
-    db.commit()
+    user.password_hash = await _hash_password(data.password)
+    await db.commit()
 
     return {"message": "Password has been reset successfully."}
 
@@ -803,7 +829,7 @@ async def reset_password(
 @router.post("/verify-email")
 async def verify_email(
     data: VerifyEmailRequest,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> dict[str, str]:
     """Verify a user's email address using a verification token.
 
@@ -825,7 +851,7 @@ async def verify_email(
         )
 
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.scalar(select(User).where(User.id == int(user_id)))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -833,7 +859,7 @@ async def verify_email(
         )
 
     user.is_verified = True
-    db.commit()
+    await db.commit()
 
     return {"message": "Email verified successfully."}
 
@@ -843,7 +869,7 @@ async def resend_verification(
     request: Request,
     data: ResendVerificationRequest,
     background_tasks: BackgroundTasks,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> dict[str, str]:
     """Resend the email verification link.
 
@@ -858,7 +884,7 @@ async def resend_verification(
     """
     _enforce_rate_limit(request, "resend_verification")
 
-    user = db.query(User).filter(User.email == data.email).first()
+    user = await db.scalar(select(User).where(User.email == data.email))
 
     if user and not user.is_verified and not user.is_guest:
         verification_token = create_access_token(
@@ -887,7 +913,7 @@ FEEDBACK_BONUS_IMPORTS = 3
 async def submit_feedback(
     feedback_data: FeedbackCreate,
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> FeedbackResponse:
     """Submit user feedback and receive bonus limits.
 
@@ -904,6 +930,7 @@ async def submit_feedback(
     Raises:
         HTTPException: 400 if user is a guest, 409 if already submitted.
     """
+    await refresh_user_async(db, current_user)
     if current_user.is_guest:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -937,7 +964,7 @@ async def submit_feedback(
     current_user.bonus_resumes += FEEDBACK_BONUS_RESUMES
     current_user.bonus_downloads += FEEDBACK_BONUS_DOWNLOADS
     current_user.bonus_imports += FEEDBACK_BONUS_IMPORTS
-    db.commit()
+    await db.commit()
 
     return FeedbackResponse(
         message="Thank you for your feedback!",
@@ -968,7 +995,7 @@ async def get_current_user_info(current_user: CurrentUser) -> User:
 @router.get("/me/export", response_model=UserDataExport)
 async def export_user_data(
     current_user: CurrentUser,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> UserDataExport:
     """Export all user data (GDPR right to portability).
 
@@ -982,8 +1009,10 @@ async def export_user_data(
         All user data including resumes.
     """
     # Get all data owned by the user
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).all()
-    feedbacks = db.query(Feedback).filter(Feedback.user_id == current_user.id).all()
+    resumes = (await db.scalars(select(Resume).where(Resume.user_id == current_user.id))).all()
+    feedbacks = (
+        await db.scalars(select(Feedback).where(Feedback.user_id == current_user.id))
+    ).all()
 
     return UserDataExport(
         user=UserExportData(
@@ -1062,7 +1091,7 @@ def _extract_s3_key_from_url(s3_url: str) -> str | None:
 async def delete_user_account(
     current_user: CurrentUser,
     response: Response,
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_async_db)],
 ) -> None:
     """Delete user account and all associated data (GDPR right to erasure).
 
@@ -1076,7 +1105,7 @@ async def delete_user_account(
         db: Database session.
     """
     # Get all user's resumes to delete S3 files
-    resumes = db.query(Resume).filter(Resume.user_id == current_user.id).all()
+    resumes = (await db.scalars(select(Resume).where(Resume.user_id == current_user.id))).all()
 
     # Delete S3 files (best effort - don't fail if S3 deletion fails)
     s3_keys_to_delete = []
@@ -1100,6 +1129,6 @@ async def delete_user_account(
             pass
 
     # Delete user (resumes are cascade deleted via FK relationship)
-    db.delete(current_user)
-    db.commit()
+    await db.delete(current_user)
+    await db.commit()
     _clear_auth_cookies(response)
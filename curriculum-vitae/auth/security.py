@@ -1,8 +1,14 @@
 """Security utilities for password hashing and JWT management."""
 
+import asyncio
 import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -10,9 +16,20 @@ from passlib.context import CryptContext
 # Password hashing configuration using bcrypt
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt threads per app worker (bcrypt releases the GIL while hashing)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+# Hashes running or waiting beyond which new ones are refused instead of queued
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "32"))
+
+T = TypeVar("T")
+
 # JWT Configuration
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Recently verified tokens kept in memory (0 disables the cache)
+JWT_CACHE_MAX_ENTRIES = int(os.environ.get("JWT_CACHE_MAX_ENTRIES", "4096"))
+
+_secret_key: str | None = None
 
 
 def _get_secret_key() -> str:
@@ -26,6 +43,72 @@ def _get_secret_key() -> str:
     return secret_key
 
 
+def get_secret_key() -> str:
+    """JWT secret key, read from the environment once per process."""
+    global _secret_key
+    if _secret_key is None:
+        _secret_key = _get_secret_key()
+    return _secret_key
+
+
+def reload_secret_key() -> None:
+    """Re-read JWT_SECRET_KEY on next use and forget tokens verified with the old key."""
+    global _secret_key
+    _secret_key = None
+    _verified_tokens.clear()
+
+
+class VerifiedTokenCache:
+    """LRU of token payloads whose signature was already checked.
+
+    Each entry lives until its ``exp`` claim, so an expired token is never
+    served from the cache; tokens without ``exp`` are not cached.
+    """
+
+    def __init__(self, max_entries: int = JWT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        """A copy of the verified payload, or None when unknown or expired."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    del self._entries[token]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self._hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, payload: dict[str, Any]) -> None:
+        """Remember a payload that passed signature and expiry checks."""
+        exp = payload.get("exp")
+        if self.max_entries <= 0 or not isinstance(exp, int | float):
+            return
+        with self._lock:
+            self._entries[token] = (float(exp), dict(payload))
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of cache counters for monitoring."""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+
+_verified_tokens = VerifiedTokenCache()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash.
 
@@ -51,6 +134,83 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when too many password hashes are already running or queued."""
+
+
+class PasswordHasher:
+    """Bounded thread pool running bcrypt off the event loop.
+
+    A bcrypt call takes 100-300 ms; run inline in an async route it blocks
+    every other request of the worker. Here at most ``max_workers`` run at
+    once and at most ``max_pending`` wait, so a login burst is refused early
+    (PasswordHasherBusyError) rather than queueing without bound.
+    """
+
+    def __init__(
+        self, max_workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in the pool, or raise PasswordHasherBusyError when it is full."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusyError(
+                    f"{self._pending} password hashes already pending (max {self.max_pending})"
+                )
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._completed += 1
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of pool counters for monitoring."""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "pending": self._pending,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+
+_password_hasher: PasswordHasher | None = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """Get or create the process-wide password hashing pool."""
+    global _password_hasher
+    with _password_hasher_lock:
+        if _password_hasher is None:
+            _password_hasher = PasswordHasher()
+        return _password_hasher
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` run in the password hashing pool."""
+    return await get_password_hasher().run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """``get_password_hash`` run in the password hashing pool."""
+    return await get_password_hasher().run(get_password_hash, password)
+
+
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token.
 
@@ -71,21 +231,28 @@ def create_access_token(data: dict[str, Any], expires_delta: timedelta | None =
         expire = datetime.now(UTC) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, _get_secret_key(), algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_secret_key(), algorithm=ALGORITHM)
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict[str, Any] | None:
     """Decode and verify a JWT access token.
 
+    Tokens verified earlier are answered from an in-memory LRU until they expire.
+
     Args:
         token: The JWT token string to decode.
 
     Returns:
         The decoded payload if valid, None if invalid or expired.
     """
-    try:
-        payload = jwt.decode(token, _get_secret_key(), algorithms=[ALGORITHM])
+    payload = _verified_tokens.get(token)
+    if payload is not None:
         return payload
+
+    try:
+        payload = jwt.decode(token, get_secret_key(), algorithms=[ALGORITHM])
     except JWTError:
         return None
+    _verified_tokens.put(token, payload)
+    return payload
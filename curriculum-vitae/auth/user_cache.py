@@ -0,0 +1,344 @@
+"""Short-lived cache of authenticated users, so each request does not re-read its user row."""
+
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+import redis
+from sqlalchemy import DateTime, event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from database.models import User
+
+# 0 disables the cache
+USER_CACHE_TTL_SECONDS = float(os.environ.get("USER_CACHE_TTL_SECONDS", "5"))
+USER_CACHE_MAX_ENTRIES = int(os.environ.get("USER_CACHE_MAX_ENTRIES", "10000"))
+# Also share entries between app workers through Redis (REDIS_URL)
+USER_CACHE_REDIS = os.environ.get("USER_CACHE_REDIS", "false").lower() == "true"
+
+REDIS_KEY_PREFIX = "user_cache:"
+# Left in place of an invalidated entry, so a write racing the invalidation cannot restore it
+REDIS_INVALIDATED = "invalidated"
+
+# Credentials stay out of the cache (and Redis): they load on access if a route needs them
+_COLUMNS = tuple(c for c in User.__table__.columns if c.key != "password_hash")
+_DATETIME_COLUMNS = frozenset(c.key for c in _COLUMNS if isinstance(c.type, DateTime))
+# Session.info key collecting the ids of users written in the current transaction
+_WRITTEN_USERS = "user_cache_written_ids"
+
+
+class UserCache:
+    """Column snapshots of recently authenticated users, keyed by user id.
+
+    ``get`` rebuilds a User from the snapshot and attaches it to the
+    request's session without a query: it behaves like a loaded row, so
+    relationships lazy-load and changes are flushed as usual. A snapshot can
+    be up to ``ttl`` seconds old, so code that reads or increments counters
+    calls ``refresh_user`` first. Every committed write to a user row
+    invalidates its entry (in this process and in Redis); entries cached by
+    other workers' memory expire after ``ttl``.
+
+    A request that read the row before a write may only cache it afterwards
+    if nothing was invalidated in between: ``put`` takes the ``generation``
+    read before the query and drops stale snapshots, and Redis keeps an
+    invalidation marker for ``ttl`` that ``put`` does not overwrite.
+    """
+
+    def __init__(
+        self,
+        ttl: float = USER_CACHE_TTL_SECONDS,
+        max_entries: int = USER_CACHE_MAX_ENTRIES,
+        redis_client: redis.Redis | None = None,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.redis_client = redis_client
+
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[int, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        # Per-user generation, bumped by invalidate; forgotten ones fall back to the floor
+        self._clock = 0
+        self._generations: OrderedDict[int, int] = OrderedDict()
+        self._generation_floor = 0
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, db: Session | AsyncSession, user_id: int) -> User | None:
+        """The cached user attached to ``db``, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        snapshot = self._get_local(user_id)
+        if snapshot is None:
+            generation = self.generation(user_id)
+            snapshot = self._get_redis(user_id)
+            if snapshot is not None:
+                self._put_local(user_id, snapshot, generation)
+        return self._attach(db, user_id, snapshot)
+
+    async def get_async(self, db: AsyncSession, user_id: int) -> User | None:
+        """``get`` without blocking the event loop on a Redis round trip."""
+        if not self.enabled:
+            return None
+
+        snapshot = self._get_local(user_id)
+        if snapshot is None and self.redis_client is not None:
+            generation = self.generation(user_id)
+            snapshot = await asyncio.to_thread(self._get_redis, user_id)
+            if snapshot is not None:
+                self._put_local(user_id, snapshot, generation)
+        return self._attach(db, user_id, snapshot)
+
+    def generation(self, user_id: int) -> int:
+        """Token to read before loading a user, then pass to ``put``."""
+        with self._lock:
+            return self._generations.get(user_id, self._generation_floor)
+
+    def put(self, user: User, generation: int | None = None) -> None:
+        """Cache a user just loaded from the database.
+
+        With ``generation``, the user is skipped if it was invalidated since.
+        """
+        if not self.enabled:
+            return
+        snapshot = self._snapshot(user)
+        if self._put_local(user.id, snapshot, generation):
+            self._put_redis(user.id, snapshot)
+
+    async def put_async(self, user: User, generation: int | None = None) -> None:
+        """``put`` without blocking the event loop on a Redis round trip."""
+        if not self.enabled:
+            return
+        snapshot = self._snapshot(user)
+        if self._put_local(user.id, snapshot, generation) and self.redis_client is not None:
+            await asyncio.to_thread(self._put_redis, user.id, snapshot)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's entry, after its row changed."""
+        self._drop_local(user_id)
+        self._invalidate_redis([user_id])
+
+    def invalidate_committed(self, user_ids: set[int]) -> None:
+        """``invalidate`` from a commit hook, keeping Redis off the event loop thread.
+
+        Under a running loop (an asyncio session) the Redis write is scheduled
+        in a worker thread; a sync session already runs off the loop.
+        """
+        for user_id in user_ids:
+            self._drop_local(user_id)
+        if self.redis_client is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._invalidate_redis(list(user_ids))
+            return
+        task = loop.create_task(asyncio.to_thread(self._invalidate_redis, list(user_ids)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of cache counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "invalidations": self._invalidations,
+            }
+
+    def _attach(
+        self, db: Session | AsyncSession, user_id: int, snapshot: dict[str, Any] | None
+    ) -> User | None:
+        """Count a hit or miss; on a hit, rebuild the user and attach it to ``db``."""
+        with self._lock:
+            if snapshot is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+
+        if isinstance(db, AsyncSession):
+            db = db.sync_session
+
+        # The request's session may already hold this user (e.g. a second dependency)
+        existing = db.identity_map.get(db.identity_key(User, user_id))
+        if existing is not None:
+            return existing
+
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        db.add(user)
+        user._from_user_cache = True
+        return user
+
+    @staticmethod
+    def _snapshot(user: User) -> dict[str, Any]:
+        return {column.key: getattr(user, column.key) for column in _COLUMNS}
+
+    def _get_local(self, user_id: int) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def _put_local(self, user_id: int, snapshot: dict[str, Any], generation: int | None) -> bool:
+        """Store a snapshot; False (and nothing stored) if it predates an invalidation."""
+        with self._lock:
+            current = self._generations.get(user_id, self._generation_floor)
+            if generation is not None and generation != current:
+                return False
+            self._entries[user_id] = (time.monotonic() + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def _drop_local(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._invalidations += 1
+            self._clock += 1
+            self._generations[user_id] = self._clock
+            self._generations.move_to_end(user_id)
+            while len(self._generations) > self.max_entries:
+                # Forgotten tokens compare against the floor, so they still read as stale
+                _, forgotten = self._generations.popitem(last=False)
+                self._generation_floor = max(self._generation_floor, forgotten)
+
+    def _put_redis(self, user_id: int, snapshot: dict[str, Any]) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            # NX: an entry or invalidation marker already there wins over this snapshot
+            self.redis_client.set(
+                REDIS_KEY_PREFIX + str(user_id),
+                json.dumps(_encode(snapshot)),
+                ex=max(1, int(self.ttl)),
+                nx=True,
+            )
+        except redis.RedisError as e:
+            print(f"⚠️ User cache Redis write failed: {e}")
+
+    def _invalidate_redis(self, user_ids: list[int]) -> None:
+        if self.redis_client is None:
+            return
+        try:
+            pipe = self.redis_client.pipeline()
+            for user_id in user_ids:
+                pipe.set(
+                    REDIS_KEY_PREFIX + str(user_id), REDIS_INVALIDATED, ex=max(1, int(self.ttl))
+                )
+            pipe.execute()
+        except redis.RedisError as e:
+            print(f"⚠️ User cache Redis invalidation failed: {e}")
+
+    def _get_redis(self, user_id: int) -> dict[str, Any] | None:
+        if self.redis_client is None:
+            return None
+        try:
+            value = self.redis_client.get(REDIS_KEY_PREFIX + str(user_id))
+        except redis.RedisError as e:
+            print(f"⚠️ User cache Redis read failed: {e}")
+            return None
+        if value is None or value == REDIS_INVALIDATED:
+            return None
+        try:
+            return _decode(json.loads(value))
+        except (ValueError, TypeError):
+            return None
+
+
+def _encode(snapshot: dict[str, Any]) -> dict[str, Any]:
+    return {
+        key: value.isoformat() if key in _DATETIME_COLUMNS and value is not None else value
+        for key, value in snapshot.items()
+    }
+
+
+def _decode(data: dict[str, Any]) -> dict[str, Any]:
+    return {
+        column.key: (
+            datetime.fromisoformat(data[column.key])
+            if column.key in _DATETIME_COLUMNS and data.get(column.key) is not None
+            else data.get(column.key)
+        )
+        for column in _COLUMNS
+    }
+
+
+def refresh_user(db: Session, user: User) -> User:
+    """Reload a user served from the cache, before reading or changing its counters."""
+    if getattr(user, "_from_user_cache", False):
+        db.refresh(user)
+        user._from_user_cache = False
+    return user
+
+
+async def refresh_user_async(db: AsyncSession, user: User) -> User:
+    """``refresh_user`` for a user attached to an asyncio session."""
+    if getattr(user, "_from_user_cache", False):
+        await db.refresh(user)
+        user._from_user_cache = False
+    return user
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_users(session: Session, _flush_context: Any) -> None:
+    for instance in (*session.dirty, *session.deleted):
+        if isinstance(instance, User) and instance.id is not None:
+            session.info.setdefault(_WRITTEN_USERS, set()).add(instance.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_written_users(session: Session) -> None:
+    # Only once committed: before that, a concurrent request could re-cache the old row
+    user_ids = session.info.pop(_WRITTEN_USERS, None)
+    if user_ids:
+        get_user_cache().invalidate_committed(user_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_written_users(session: Session) -> None:
+    session.info.pop(_WRITTEN_USERS, None)
+
+
+_user_cache: UserCache | None = None
+_user_cache_lock = threading.Lock()
+
+
+def get_user_cache() -> UserCache:
+    """Get or create the process-wide user cache."""
+    global _user_cache
+    with _user_cache_lock:
+        if _user_cache is None:
+            redis_client = None
+            if USER_CACHE_REDIS:
+                redis_client = redis.Redis.from_url(
+                    os.environ.get("REDIS_URL", "redis://localhost:6379"),
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+            _user_cache = UserCache(redis_client=redis_client)
+        return _user_cache
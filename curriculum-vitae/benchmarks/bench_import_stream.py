@@ -0,0 +1,97 @@
+"""Micro-benchmark of the /import-stream JSON event parser on replayed token streams.
+
+A stream is a JSON file holding the list of content deltas received from the
+model, in order. Without ``--streams`` the benchmark corpus resumes are
+serialised and split into token-sized deltas (2-6 characters, like Mistral's).
+
+    uv run python benchmarks/bench_import_stream.py
+    uv run python benchmarks/bench_import_stream.py --streams recorded/*.json --iterations 200
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.resumes import SMALL, TYPICAL, max_length_resume  # noqa: E402
+from core.JsonEventParser import JsonEventParser  # noqa: E402
+
+
+def synthetic_stream(document: dict, seed: int = 0) -> list[str]:
+    """Split a pretty-printed document into deltas of 2 to 6 characters."""
+    rng = random.Random(seed)
+    text = json.dumps(document, indent=2, ensure_ascii=False)
+    deltas = []
+    pos = 0
+    while pos < len(text):
+        size = rng.randint(2, 6)
+        deltas.append(text[pos : pos + size])
+        pos += size
+    return deltas
+
+
+def replay(deltas: list[str]) -> int:
+    """Feed a stream through the parser and return the number of events emitted."""
+    parser = JsonEventParser(objects=("personal",), arrays=("sections",))
+    events = 0
+    for delta in deltas:
+        events += len(parser.feed(delta))
+    json.loads(parser.text)
+    return events
+
+
+def bench(name: str, deltas: list[str], iterations: int) -> dict:
+    events = replay(deltas)
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        replay(deltas)
+        timings.append(time.perf_counter() - started)
+
+    characters = sum(len(d) for d in deltas)
+    median = statistics.median(timings)
+    result = {
+        "deltas": len(deltas),
+        "characters": characters,
+        "events": events,
+        "median_ms": round(median * 1000, 3),
+        "us_per_delta": round(median / len(deltas) * 1e6, 3),
+        "mb_per_second": round(characters / median / 1e6, 1),
+    }
+    print(
+        f"{name}: {result['deltas']} deltas, {result['events']} events, "
+        f"{result['median_ms']:.2f}ms ({result['us_per_delta']:.2f}µs/delta)"
+    )
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--streams", nargs="*", type=Path, help="Recorded delta lists (JSON)")
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.streams:
+        streams = {path.stem: json.loads(path.read_text(encoding="utf-8")) for path in args.streams}
+    else:
+        streams = {
+            name: synthetic_stream(document)
+            for name, document in (
+                ("small", SMALL),
+                ("typical", TYPICAL),
+                ("max", max_length_resume()),
+            )
+        }
+
+    for name, deltas in streams.items():
+        bench(name, deltas, args.iterations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Compare the PDF text extraction backends of the CV import on CVs from our own templates.
+
+The corpus is one PDF per template, compiled from the typical benchmark
+resume, with the resume's text saved next to each PDF (``<name>.txt``). For
+every backend the benchmark reports the time to extract the whole corpus
+(p50/p95, PDFs per second) and its text fidelity: the share of the source
+words found in the extracted text (mean and worst PDF).
+
+Building the corpus needs a TeX installation (e.g. the dev container); pass
+``--corpus`` to keep it and reuse it anywhere. PDFs without a ``.txt`` file
+(real CVs dropped into the directory) are scored against the first backend.
+
+    uv run python benchmarks/bench_text_extraction.py --corpus /tmp/cv_corpus
+    uv run python benchmarks/bench_text_extraction.py --corpus /tmp/cv_corpus --iterations 20
+"""
+
+import argparse
+import json
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import VALID_TEMPLATES  # noqa: E402
+from benchmarks.resumes import TYPICAL  # noqa: E402
+from benchmarks.run_benchmarks import measure, render_data  # noqa: E402
+from core.PdfCompiler import PdfCompiler  # noqa: E402
+from core.TemplateRegistry import get_template_registry  # noqa: E402
+from core.TextExtractor import EXTRACTORS, extract_text  # noqa: E402
+
+# Words the templates print as-is: hyphenated or accented forms still match
+_WORD = re.compile(r"[^\W\d_]{3,}")
+# Resume fields that are not printed as text
+_HIDDEN_FIELDS = {"id", "type", "template_id", "lang", "url", "platform"}
+
+MAX_PAGES = 10
+MAX_CHARS = 1_000_000
+
+
+def source_text(value: Any) -> str:
+    """Printable text of a resume (or any part of it), one field per line."""
+    if isinstance(value, dict):
+        return "\n".join(source_text(v) for k, v in value.items() if k not in _HIDDEN_FIELDS)
+    if isinstance(value, list):
+        return "\n".join(source_text(v) for v in value)
+    return value if isinstance(value, str) else ""
+
+
+def word_recall(expected: str, extracted: str) -> float:
+    """Share of the distinct words of ``expected`` present in ``extracted``."""
+    expected_words = {word.lower() for word in _WORD.findall(expected)}
+    if not expected_words:
+        return 1.0
+    extracted_words = {word.lower() for word in _WORD.findall(extracted)}
+    return len(expected_words & extracted_words) / len(expected_words)
+
+
+def build_corpus(directory: Path, templates: list[str], resume: dict[str, Any] = TYPICAL) -> None:
+    """Compile ``resume`` with every template into ``directory``."""
+    registry = get_template_registry()
+    context = render_data(resume)
+    expected = source_text(resume)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for template_id in templates:
+        workdir = Path(tempfile.mkdtemp(prefix="cv_extract_bench_"))
+        try:
+            tex_file = workdir / "main.tex"
+            tex_file.write_text(registry.render(template_id, context), encoding="utf-8")
+            PdfCompiler(tex_file).compile(clean=True)
+            shutil.copyfile(workdir / "main.pdf", directory / f"{template_id}.pdf")
+            (directory / f"{template_id}.txt").write_text(expected, encoding="utf-8")
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+def load_corpus(directory: Path) -> dict[str, tuple[Path, str | None]]:
+    """PDFs of a corpus directory with their source text, when there is one."""
+    corpus = {}
+    for pdf_path in sorted(directory.glob("*.pdf")):
+        text_path = pdf_path.with_suffix(".txt")
+        expected = text_path.read_text(encoding="utf-8") if text_path.exists() else None
+        corpus[pdf_path.stem] = (pdf_path, expected)
+    return corpus
+
+
+def bench(
+    corpus: dict[str, tuple[Path, str | None]], extractors: list[str], iterations: int
+) -> dict[str, dict[str, Any]]:
+    """Throughput and fidelity of each extractor over the whole corpus."""
+    results = {}
+    reference: dict[str, str] = {}
+
+    for extractor in extractors:
+        texts = {
+            name: extract_text(path, MAX_PAGES, MAX_CHARS, extractor)
+            for name, (path, _) in corpus.items()
+        }
+        recalls = {}
+        for name, (_, expected) in corpus.items():
+            # Without a source text, the first backend's output is the reference
+            expected = expected if expected is not None else reference.get(name)
+            if expected is not None:
+                recalls[name] = word_recall(expected, texts[name])
+        if not reference:
+            reference = texts
+
+        def extract_all(extractor=extractor):
+            for path, _ in corpus.values():
+                extract_text(path, MAX_PAGES, MAX_CHARS, extractor)
+
+        metrics = measure(extract_all, iterations, warmup=0)
+        worst = min(recalls, key=recalls.get) if recalls else None
+        results[extractor] = {
+            **metrics,
+            "pdfs": len(corpus),
+            "pdfs_per_second": round(len(corpus) / (metrics["p50_ms"] / 1000), 1)
+            if metrics["p50_ms"]
+            else None,
+            "word_recall_mean": round(statistics.fmean(recalls.values()), 4) if recalls else None,
+            "word_recall_min": round(recalls[worst], 4) if worst else None,
+            "word_recall_worst": worst,
+        }
+        print(
+            f"{extractor}: {len(corpus)} PDFs in {metrics['p50_ms']:.0f}ms "
+            f"(p95 {metrics['p95_ms']:.0f}ms, {results[extractor]['pdfs_per_second']} PDF/s), "
+            f"word recall {results[extractor]['word_recall_mean']} "
+            f"(worst {results[extractor]['word_recall_min']} on {worst})"
+        )
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--corpus", type=Path, help="Corpus directory (built when it has no PDF)")
+    parser.add_argument("--templates", nargs="*", help="Template ids (default: all)")
+    parser.add_argument(
+        "--extractors", nargs="*", choices=sorted(EXTRACTORS), help="Backends (default: all)"
+    )
+    parser.add_argument("--iterations", type=int, default=5, help="Timed passes over the corpus")
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    args = parser.parse_args()
+
+    directory = args.corpus or Path(tempfile.mkdtemp(prefix="cv_extract_corpus_"))
+    try:
+        if not any(directory.glob("*.pdf")):
+            if shutil.which("latexmk") is None:
+                print("latexmk not found: pass --corpus with PDFs built elsewhere")
+                return 1
+            templates = sorted(VALID_TEMPLATES)
+            if args.templates:
+                templates = [t for t in templates if t in args.templates]
+            build_corpus(directory, templates)
+
+        # pdfplumber (the default backend) first: it is the reference for PDFs without source
+        extractors = args.extractors or sorted(EXTRACTORS, key=lambda name: name != "pdfplumber")
+        results = bench(load_corpus(directory), extractors, args.iterations)
+        if args.output:
+            args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    finally:
+        if args.corpus is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Calibrate the page estimator against real latexmk output.
+
+For every template (11 families x 3 sizes) this finds the layout capacity of
+one page by growing a synthetic resume until it overflows, then measures how
+well ``units / capacity`` predicts the one-page decision on random resumes.
+The smallest margin that makes every measured decision correct is stored with
+the capacity, so the API only skips compiles the estimator gets right.
+
+Requires a TeX installation (e.g. the dev container, which mounts the code):
+
+    uv run python benchmarks/calibrate_page_estimator.py
+    uv run python benchmarks/calibrate_page_estimator.py --templates harvard --samples 10
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app import (  # noqa: E402
+    SIZE_VARIANTS,
+    VALID_TEMPLATES,
+    ResumeData,
+    generate_pdf_and_count_pages,
+    get_base_template,
+    get_template_with_size,
+)
+from benchmarks.resumes import make_resume, random_resume  # noqa: E402
+from core.PageEstimator import (  # noqa: E402
+    BULLET_WEIGHT,
+    DEFAULT_MARGIN,
+    ITEM_WEIGHT,
+    PAGE_ESTIMATOR_CALIBRATION,
+    SECTION_WEIGHT,
+    layout_units,
+)
+
+MAX_EXPERIENCES = 30
+MIN_MARGIN = 0.03
+
+
+async def count_pages(resume: dict, template_id: str) -> int:
+    _, page_count = await generate_pdf_and_count_pages(ResumeData(**resume), template_id)
+    return page_count
+
+
+async def find_capacity(template_id: str) -> float | None:
+    """Binary search the number of experiences where the resume stops fitting on a page."""
+    lo, hi = 0, MAX_EXPERIENCES
+    if await count_pages(make_resume(experiences=lo), template_id) > 1:
+        return None
+    if await count_pages(make_resume(experiences=hi), template_id) == 1:
+        # Never overflows within the search range: capacity is at least this large
+        return layout_units(make_resume(experiences=hi))
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if await count_pages(make_resume(experiences=mid), template_id) == 1:
+            lo = mid
+        else:
+            hi = mid
+
+    return (
+        layout_units(make_resume(experiences=lo)) + layout_units(make_resume(experiences=hi))
+    ) / 2
+
+
+async def calibrate(template_id: str, samples: int) -> dict | None:
+    started = time.perf_counter()
+    capacity = await find_capacity(template_id)
+    if capacity is None:
+        print(f"❌ {template_id}: even an empty resume overflows, skipped")
+        return None
+
+    estimates = []
+    for seed in range(samples):
+        resume = random_resume(seed, template_id)
+        estimated = layout_units(resume) / capacity
+        actual = await count_pages(resume, template_id)
+        estimates.append((estimated, actual))
+
+    # Smallest margin that keeps every decided sample on the right side of the boundary
+    wrong = [abs(est - 1) for est, actual in estimates if (est <= 1) != (actual == 1)]
+    margin = max(MIN_MARGIN, max(wrong) + 0.01) if wrong else MIN_MARGIN
+    decided = sum(1 for est, _ in estimates if abs(est - 1) >= margin)
+    naive_accuracy = 1 - len(wrong) / samples if samples else 1.0
+
+    result = {
+        "capacity": round(capacity, 1),
+        "margin": round(margin, 3),
+        "samples": samples,
+        "naive_accuracy": round(naive_accuracy, 3),
+        "decided_ratio": round(decided / samples, 3) if samples else 0.0,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
+    print(
+        f"✅ {template_id}: capacity={result['capacity']} margin={result['margin']} "
+        f"accuracy={result['naive_accuracy']:.0%} compiles skipped={result['decided_ratio']:.0%}"
+    )
+    return result
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--templates", nargs="*", help="Template families (default: all)")
+    parser.add_argument("--samples", type=int, default=40, help="Random resumes per template")
+    parser.add_argument("--output", type=Path, default=PAGE_ESTIMATOR_CALIBRATION)
+    args = parser.parse_args()
+
+    families = sorted({get_base_template(t) for t in VALID_TEMPLATES})
+    if args.templates:
+        families = [f for f in families if f in args.templates]
+
+    existing = {}
+    if args.output.exists():
+        existing = json.loads(args.output.read_text(encoding="utf-8")).get("templates", {})
+
+    templates = dict(existing)
+    for family in families:
+        for size in SIZE_VARIANTS:
+            template_id = get_template_with_size(family, size)
+            if template_id not in VALID_TEMPLATES:
+                continue
+            result = await calibrate(template_id, args.samples)
+            if result is not None:
+                templates[template_id] = result
+
+    report = {
+        "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "weights": {"bullet": BULLET_WEIGHT, "item": ITEM_WEIGHT, "section": SECTION_WEIGHT},
+        "default_margin": DEFAULT_MARGIN,
+        "templates": dict(sorted(templates.items())),
+    }
+    args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Calibration written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
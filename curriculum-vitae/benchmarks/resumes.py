@@ -0,0 +1,287 @@
+"""Synthetic resumes for calibration and benchmarks.
+
+All generators are deterministic for a given seed so measurements can be
+compared between runs.
+"""
+
+import random
+import typing
+from typing import Any
+
+WORDS = [
+    "led",
+    "designed",
+    "delivered",
+    "optimised",
+    "migrated",
+    "platform",
+    "customers",
+    "revenue",
+    "pipeline",
+    "latency",
+    "reliability",
+    "team",
+    "product",
+    "analytics",
+    "data",
+    "cloud",
+    "security",
+    "automation",
+    "launched",
+    "reduced",
+    "improved",
+    "scaled",
+    "mentored",
+    "stakeholders",
+    "roadmap",
+    "strategy",
+    "infrastructure",
+    "quality",
+    "release",
+    "monitoring",
+    "budget",
+    "partners",
+    "growth",
+    "research",
+]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + "."
+
+
+def make_resume(
+    experiences: int = 3,
+    bullets: int = 3,
+    education: int = 2,
+    projects: int = 1,
+    skill_categories: int = 3,
+    summary_words: int = 40,
+    bullet_words: int = 16,
+    template_id: str = "harvard",
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Build a ResumeData-shaped dict with the requested amount of content."""
+    rng = random.Random(seed)
+    sections: list[dict[str, Any]] = []
+
+    if summary_words:
+        sections.append(
+            {
+                "id": "summary",
+                "type": "summary",
+                "title": "Summary",
+                "items": _sentence(rng, summary_words),
+            }
+        )
+    if education:
+        sections.append(
+            {
+                "id": "education",
+                "type": "education",
+                "title": "Education",
+                "items": [
+                    {
+                        "school": f"University {i + 1}",
+                        "degree": "MSc Computer Science",
+                        "dates": f"{2010 + i} -- {2012 + i}",
+                        "subtitle": "Paris, France",
+                        "description": _sentence(rng, 12),
+                    }
+                    for i in range(education)
+                ],
+            }
+        )
+    if experiences:
+        sections.append(
+            {
+                "id": "experiences",
+                "type": "experiences",
+                "title": "Experience",
+                "items": [
+                    {
+                        "title": "Senior Engineer",
+                        "company": f"Company {i + 1}",
+                        "dates": f"{2014 + i} -- {2015 + i}",
+                        "highlights": [_sentence(rng, bullet_words) for _ in range(bullets)],
+                    }
+                    for i in range(experiences)
+                ],
+            }
+        )
+    if projects:
+        sections.append(
+            {
+                "id": "projects",
+                "type": "projects",
+                "title": "Projects",
+                "items": [
+                    {
+                        "name": f"Project {i + 1}",
+                        "year": str(2020 + i),
+                        "highlights": [_sentence(rng, bullet_words) for _ in range(2)],
+                    }
+                    for i in range(projects)
+                ],
+            }
+        )
+    if skill_categories:
+        sections.append(
+            {
+                "id": "skills",
+                "type": "skills",
+                "title": "Skills",
+                "items": [
+                    {
+                        "id": f"skill-{i}",
+                        "category": f"Category {i + 1}",
+                        "skills": ", ".join(rng.choice(WORDS) for _ in range(8)),
+                    }
+                    for i in range(skill_categories)
+                ],
+            }
+        )
+
+    return {
+        "personal": {
+            "name": "Alex Martin",
+            "title": "Software Engineer",
+            "location": "Paris, France",
+            "email": "alex.martin@example.com",
+            "phone": "+33 6 12 34 56 78",
+            "links": [
+                {
+                    "platform": "github",
+                    "username": "alexmartin",
+                    "url": "https://github.com/alexmartin",
+                }
+            ],
+        },
+        "sections": sections,
+        "template_id": template_id,
+        "lang": "en",
+    }
+
+
+def random_resume(seed: int, template_id: str = "harvard") -> dict[str, Any]:
+    """Resume with a random mix of sections, spanning well under to well over a page."""
+    rng = random.Random(seed)
+    return make_resume(
+        experiences=rng.randint(1, 7),
+        bullets=rng.randint(1, 5),
+        education=rng.randint(0, 3),
+        projects=rng.randint(0, 3),
+        skill_categories=rng.randint(0, 5),
+        summary_words=rng.choice((0, 30, 60)),
+        bullet_words=rng.randint(8, 24),
+        template_id=template_id,
+        seed=seed,
+    )
+
+
+def _text(rng: random.Random, length: int) -> str:
+    """Words filling exactly ``length`` characters."""
+    text = ""
+    while len(text) < length:
+        text += rng.choice(WORDS) + " "
+    return text[:length]
+
+
+def _max_length(field_info: Any) -> int | None:
+    for constraint in field_info.metadata:
+        limit = getattr(constraint, "max_length", None)
+        if limit is not None:
+            return limit
+    return None
+
+
+def _fill_model(model: Any, rng: random.Random, bullet_words: int) -> dict[str, Any]:
+    """Every field of a Pydantic model that has a ``max_length`` filled up to it."""
+    values: dict[str, Any] = {}
+    for name, field_info in model.model_fields.items():
+        limit = _max_length(field_info)
+        if limit is None or name in ("github", "github_url"):
+            continue
+        if typing.get_origin(field_info.annotation) is list:
+            (item_type,) = typing.get_args(field_info.annotation)
+            if item_type is str:
+                values[name] = [_sentence(rng, bullet_words) for _ in range(limit)]
+            else:
+                values[name] = [_fill_model(item_type, rng, bullet_words) for _ in range(limit)]
+        elif name == "url":
+            prefix = "https://example.com/"
+            values[name] = prefix + _text(rng, limit - len(prefix)).replace(" ", "-")
+        else:
+            values[name] = _text(rng, limit)
+    return values
+
+
+def max_length_resume(
+    items_per_section: int = 3,
+    bullet_words: int = 30,
+    free_text_length: int = 2000,
+    template_id: str = "harvard",
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Worst-case resume: every bounded field of the API models at its ``max_length``.
+
+    Bounded lists (links, highlights) are filled to their limit. The API does
+    not bound the number of sections or items, nor the length of a highlight
+    or of the summary/languages text, so those use the given sizes instead.
+    """
+    # Imported here so the other generators stay usable without the app settings
+    from app import (
+        CustomItem,
+        CVSection,
+        EducationItem,
+        ExperienceItem,
+        LeadershipItem,
+        PersonalInfo,
+        ProjectItem,
+        SkillCategory,
+    )
+
+    rng = random.Random(seed)
+    item_models = {
+        "education": EducationItem,
+        "experiences": ExperienceItem,
+        "projects": ProjectItem,
+        "leadership": LeadershipItem,
+        "custom": CustomItem,
+    }
+    id_length = _max_length(CVSection.model_fields["id"])
+    title_length = _max_length(CVSection.model_fields["title"])
+
+    def section(section_type: str, items: Any) -> dict[str, Any]:
+        return {
+            "id": (section_type * id_length)[:id_length],
+            "type": section_type,
+            "title": _text(rng, title_length),
+            "items": items,
+        }
+
+    sections = [section("summary", _text(rng, free_text_length))]
+    for section_type, model in item_models.items():
+        items = [_fill_model(model, rng, bullet_words) for _ in range(items_per_section)]
+        sections.append(section(section_type, items))
+    skills = [
+        {"id": f"skill-{i}", **_fill_model(SkillCategory, rng, bullet_words)}
+        for i in range(items_per_section)
+    ]
+    sections.append(section("skills", skills))
+    sections.append(section("languages", _text(rng, free_text_length)))
+
+    return {
+        "personal": _fill_model(PersonalInfo, rng, bullet_words),
+        "sections": sections,
+        "template_id": template_id,
+        "lang": "en",
+    }
+
+
+SMALL = make_resume(experiences=1, bullets=2, education=1, projects=0, skill_categories=1)
+TYPICAL = make_resume()
+MAX = make_resume(
+    experiences=10, bullets=6, education=3, projects=4, skill_categories=6, summary_words=80
+)
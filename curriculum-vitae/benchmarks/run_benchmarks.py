@@ -0,0 +1,330 @@
+"""Benchmark the PDF generation pipeline: section conversion, rendering, compilation, endpoints.
+
+The auth suite measures the JWT verification done on every authenticated
+request, with and without the verified-token cache.
+
+Every suite runs over a corpus of synthetic resumes (small, typical, and one
+with every field at its API ``max_length``) and, where it applies, over every
+template. Each case reports p50/p95/mean wall time, CPU time per iteration
+(this process plus child TeX processes) and peak RSS. Results are written as
+JSON keyed by ``suite/case`` so two runs can be compared with ``--compare``.
+
+The compile, generate and optimal_size suites need a TeX installation and are
+skipped without one (e.g. run them in the dev container):
+
+    uv run python benchmarks/run_benchmarks.py
+    uv run python benchmarks/run_benchmarks.py --suites render convert --iterations 50
+    uv run python benchmarks/run_benchmarks.py --output new.json --compare old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# The app reads its JWT secret at startup; benchmark tokens never leave the process
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from jose import jwt  # noqa: E402
+
+from app import (  # noqa: E402
+    VALID_TEMPLATES,
+    ResumeData,
+    app,
+    convert_section_items,
+    get_base_template,
+)
+from auth.dependencies import get_current_user  # noqa: E402
+from auth.security import (  # noqa: E402
+    ALGORITHM,
+    _get_secret_key,
+    _verified_tokens,
+    create_access_token,
+    decode_access_token,
+)
+from benchmarks.resumes import SMALL, TYPICAL, max_length_resume  # noqa: E402
+from core.LatexRenderer import LatexRenderer  # noqa: E402
+from core.PdfCache import get_pdf_cache  # noqa: E402
+from core.PdfCompiler import PdfCompiler  # noqa: E402
+from core.TemplateRegistry import TEMPLATES_FOLDER, get_template_registry  # noqa: E402
+from database.db_config import get_async_db  # noqa: E402
+
+SUITES = ("convert", "render", "render_cold", "compile", "generate", "optimal_size", "auth")
+TEX_SUITES = {"compile", "generate", "optimal_size"}
+
+
+def corpus() -> dict[str, dict[str, Any]]:
+    return {"small": SMALL, "typical": TYPICAL, "max": max_length_resume()}
+
+
+def render_data(resume: dict[str, Any]) -> dict[str, Any]:
+    """Template context, built the way the /generate endpoint builds it."""
+    data = ResumeData(**resume)
+    return {
+        "personal": data.personal.model_dump(),
+        "sections": [convert_section_items(s, data.lang) for s in data.sections],
+    }
+
+
+def _cpu_seconds() -> float:
+    usages = (
+        resource.getrusage(resource.RUSAGE_SELF),
+        resource.getrusage(resource.RUSAGE_CHILDREN),
+    )
+    return sum(usage.ru_utime + usage.ru_stime for usage in usages)
+
+
+def _percentile(samples: list[float], percent: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[percent - 1]
+
+
+def measure(fn: Callable[[], Any], iterations: int, warmup: int = 1) -> dict[str, Any]:
+    """Time ``fn`` over ``iterations`` runs after ``warmup`` untimed ones."""
+    for _ in range(warmup):
+        fn()
+
+    wall = []
+    cpu_started = _cpu_seconds()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        wall.append(time.perf_counter() - started)
+    cpu = _cpu_seconds() - cpu_started
+
+    # ru_maxrss is a high-water mark in KiB on Linux: it never decreases within a run
+    return {
+        "iterations": iterations,
+        "p50_ms": round(_percentile(wall, 50) * 1000, 3),
+        "p95_ms": round(_percentile(wall, 95) * 1000, 3),
+        "mean_ms": round(statistics.fmean(wall) * 1000, 3),
+        "cpu_ms": round(cpu / iterations * 1000, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "children_peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1
+        ),
+    }
+
+
+def convert_cases(resumes: dict[str, dict], templates: list[str]) -> Iterator[tuple[str, Callable]]:
+    for name, resume in resumes.items():
+        data = ResumeData(**resume)
+        yield name, lambda data=data: [convert_section_items(s, data.lang) for s in data.sections]
+
+
+def render_cases(resumes: dict[str, dict], templates: list[str]) -> Iterator[tuple[str, Callable]]:
+    """Rendering through the process-wide registry, as the API does."""
+    registry = get_template_registry()
+    for name, resume in resumes.items():
+        context = render_data(resume)
+        for template_id in templates:
+            yield (
+                f"{template_id}/{name}",
+                lambda t=template_id, c=context: registry.render(t, c),
+            )
+
+
+def _render_cold(template_id: str, context: dict[str, Any]) -> str:
+    return LatexRenderer(TEMPLATES_FOLDER, f"{template_id}.tex").render(context)
+
+
+def render_cold_cases(
+    resumes: dict[str, dict], templates: list[str]
+) -> Iterator[tuple[str, Callable]]:
+    """A fresh LatexRenderer per call: template loading and compilation included."""
+    for name, resume in resumes.items():
+        context = render_data(resume)
+        for template_id in templates:
+            yield f"{template_id}/{name}", lambda t=template_id, c=context: _render_cold(t, c)
+
+
+def _compile_tex(tex_content: str) -> None:
+    workdir = Path(tempfile.mkdtemp(prefix="cv_bench_"))
+    try:
+        tex_file = workdir / "main.tex"
+        tex_file.write_text(tex_content, encoding="utf-8")
+        PdfCompiler(tex_file).compile(clean=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compile_cases(resumes: dict[str, dict], templates: list[str]) -> Iterator[tuple[str, Callable]]:
+    """latexmk on the full rendered source, without the pool, formats or PDF cache."""
+    registry = get_template_registry()
+    for name, resume in resumes.items():
+        context = render_data(resume)
+        for template_id in templates:
+            tex_content = registry.render(template_id, context)
+            yield f"{template_id}/{name}", lambda tex=tex_content: _compile_tex(tex)
+
+
+def auth_cases(_resumes: dict[str, dict], _templates: list[str]) -> Iterator[tuple[str, Callable]]:
+    """Per-request token verification: environment lookup plus signature check, then cached."""
+    token = create_access_token(data={"sub": "1"})
+
+    def verify_uncached():
+        jwt.decode(token, _get_secret_key(), algorithms=[ALGORITHM])
+
+    def verify_cached():
+        decode_access_token(token)
+
+    _verified_tokens.clear()
+    decode_access_token(token)
+    yield "verify_uncached", verify_uncached
+    yield "verify_cached", verify_cached
+
+
+def _post(client: TestClient, path: str, body: dict[str, Any], warm_cache: bool) -> None:
+    if not warm_cache:
+        get_pdf_cache().clear()
+    response = client.post(path, json=body)
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}: {response.text[:200]}")
+
+
+def endpoint_cases(
+    client: TestClient, path: str, resumes: dict[str, dict], templates: list[str], warm_cache: bool
+) -> Iterator[tuple[str, Callable]]:
+    for name, resume in resumes.items():
+        for template_id in templates:
+            body = {**resume, "template_id": template_id}
+            yield (
+                f"{template_id}/{name}",
+                lambda b=body: _post(client, path, b, warm_cache),
+            )
+
+
+def _override_dependencies() -> None:
+    """Preview requests skip quotas, so a stub user and no database session are enough."""
+
+    async def _no_db():
+        yield None
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=0, is_guest=True, is_premium=False
+    )
+    app.dependency_overrides[get_async_db] = _no_db
+
+
+def run(
+    suites: list[str],
+    templates: list[str],
+    iterations: int,
+    warm_cache: bool = False,
+    log: Callable[[str], None] = print,
+) -> dict[str, dict[str, Any]]:
+    """Run the selected suites and return metrics keyed by ``suite/case``."""
+    resumes = corpus()
+    has_tex = shutil.which("latexmk") is not None
+    results: dict[str, dict[str, Any]] = {}
+
+    families = sorted({get_base_template(t) for t in templates})
+    local_cases = {
+        "convert": convert_cases,
+        "render": render_cases,
+        "render_cold": render_cold_cases,
+        "compile": compile_cases,
+        "auth": auth_cases,
+    }
+
+    _override_dependencies()
+    try:
+        with TestClient(app) as client:
+            for suite in suites:
+                if suite in TEX_SUITES and not has_tex:
+                    log(f"⏭️  {suite}: skipped (latexmk not found)")
+                    continue
+
+                if suite == "generate":
+                    cases = endpoint_cases(
+                        client, "/generate?preview=true", resumes, templates, warm_cache
+                    )
+                elif suite == "optimal_size":
+                    cases = endpoint_cases(
+                        client, "/optimal-size?preview=true", resumes, families, warm_cache
+                    )
+                else:
+                    cases = local_cases[suite](resumes, templates)
+
+                for case, fn in cases:
+                    key = f"{suite}/{case}"
+                    results[key] = measure(fn, iterations)
+                    log(
+                        f"{key}: p50={results[key]['p50_ms']:.3f}ms "
+                        f"p95={results[key]['p95_ms']:.3f}ms cpu={results[key]['cpu_ms']:.3f}ms"
+                    )
+    finally:
+        app.dependency_overrides.clear()
+
+    return results
+
+
+def compare(baseline: dict[str, dict], current: dict[str, dict]) -> list[str]:
+    """One line per case present in both runs, with the p50/p95 change."""
+    lines = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        deltas = []
+        for metric in ("p50_ms", "p95_ms"):
+            change = (new[metric] - old[metric]) / old[metric] * 100 if old[metric] else 0.0
+            deltas.append(f"{metric[:3]} {old[metric]:.1f} → {new[metric]:.1f}ms ({change:+.0f}%)")
+        lines.append(f"{key}: " + ", ".join(deltas))
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--suites", nargs="*", choices=SUITES, help="Suites (default: all)")
+    parser.add_argument("--templates", nargs="*", help="Template ids (default: all)")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per case")
+    parser.add_argument(
+        "--warm-cache", action="store_true", help="Keep the PDF cache between endpoint calls"
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    templates = sorted(VALID_TEMPLATES)
+    if args.templates:
+        templates = [t for t in templates if t in args.templates]
+
+    results = run(args.suites or list(SUITES), templates, args.iterations, args.warm_cache)
+
+    report = {
+        "generated_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "latexmk": shutil.which("latexmk"),
+        },
+        "iterations": args.iterations,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        print(f"\nCompared with {args.compare}:")
+        for line in compare(baseline, results):
+            print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""Bounded pool of LaTeX compile workers shared by the PDF endpoints."""
+
+import asyncio
+import os
+import queue
+import threading
+import weakref
+from concurrent.futures import Future
+from pathlib import Path
+
+from core.CompileWorkspace import CompileWorkspaces
+from core.FormatCache import FormatCache, get_format_cache
+from core.PdfCache import PdfCache, get_pdf_cache
+from core.PdfCompiler import CompiledPdf, CompileTimeoutError, PdfCompiler
+
+PDF_COMPILE_WORKERS = int(os.environ.get("PDF_COMPILE_WORKERS", "2"))
+PDF_COMPILE_TIMEOUT_SECONDS = float(os.environ.get("PDF_COMPILE_TIMEOUT_SECONDS", "60"))
+PDF_COMPILE_MAX_JOBS_PER_WORKER = int(os.environ.get("PDF_COMPILE_MAX_JOBS_PER_WORKER", "500"))
+
+
+class CompilePool:
+    """Runs LaTeX compile jobs on a fixed set of long-lived worker threads.
+
+    A TeX engine cannot be reused across documents, so each worker drives one
+    latexmk process at a time. The pool bounds how many TeX processes run at
+    once, enforces a per-job timeout, and retires a worker after
+    ``max_jobs_per_worker`` jobs, starting a fresh one in its place.
+
+    Jobs submitted with a ``template_id`` are compiled against that template's
+    precompiled preamble format when one is available. When a ``result_cache``
+    is given, ``compile_async`` returns identical documents from it without
+    spawning TeX.
+
+    Documents are compiled in scratch directories borrowed from
+    ``workspaces`` (one per worker, on tmpfs when available), which are
+    emptied after every job rather than created and deleted each time.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PDF_COMPILE_WORKERS,
+        job_timeout: float | None = PDF_COMPILE_TIMEOUT_SECONDS,
+        max_jobs_per_worker: int | None = PDF_COMPILE_MAX_JOBS_PER_WORKER,
+        format_cache: FormatCache | None = None,
+        result_cache: PdfCache | None = None,
+        workspaces: CompileWorkspaces | None = None,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.max_workers = max_workers
+        self.job_timeout = job_timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.format_cache = format_cache if format_cache is not None else get_format_cache()
+        self.result_cache = result_cache
+        self.workspaces = (
+            workspaces if workspaces is not None else CompileWorkspaces(size=max_workers)
+        )
+
+        self._queue: queue.Queue[tuple[Future, str, str | None] | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._workers: set[threading.Thread] = set()
+        self._shutdown = False
+        self._jobs_completed = 0
+        self._workers_recycled = 0
+        # One admission semaphore per event loop (asyncio primitives are loop-bound).
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+        for _ in range(max_workers):
+            self._start_worker()
+
+    def submit(self, tex_content: str, template_id: str | None = None) -> Future:
+        """Queue a rendered TeX document and return a future resolving to a ``CompiledPdf``."""
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Compile pool is shut down")
+            self._queue.put((future, tex_content, template_id))
+        return future
+
+    def compile(self, tex_content: str, template_id: str | None = None) -> bytes:
+        """Compile a rendered TeX document and wait for the PDF bytes."""
+        return self.submit(tex_content, template_id).result().content
+
+    async def compile_async(self, tex_content: str, template_id: str | None = None) -> bytes:
+        """Compile a rendered TeX document without blocking the event loop."""
+        return (await self.compile_pdf_async(tex_content, template_id)).content
+
+    async def compile_pdf_async(
+        self, tex_content: str, template_id: str | None = None
+    ) -> CompiledPdf:
+        """Compile without blocking the event loop; returns the PDF and its compile metadata.
+
+        At most ``max_workers`` jobs per event loop are handed to the pool at a
+        time. Extra callers wait on an asyncio semaphore instead of the thread
+        queue, so a request cancelled while waiting never starts a TeX process.
+        """
+        if self.result_cache is None:
+            async with self._get_semaphore():
+                return await asyncio.wrap_future(self.submit(tex_content, template_id))
+
+        key = self.result_cache.key(tex_content, template_id)
+        compiled = await self.result_cache.get_async(key)
+        if compiled is not None:
+            return compiled
+
+        async with self._get_semaphore():
+            compiled = await asyncio.wrap_future(self.submit(tex_content, template_id))
+        await self.result_cache.put_async(key, compiled)
+        return compiled
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of pool counters for monitoring."""
+        with self._lock:
+            return {
+                "workers": len(self._workers),
+                "queued": self._queue.qsize(),
+                "jobs_completed": self._jobs_completed,
+                "workers_recycled": self._workers_recycled,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and let workers exit once the queue is drained."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            workers = list(self._workers)
+            for _ in workers:
+                self._queue.put(None)
+
+        if wait:
+            for worker in workers:
+                worker.join()
+            self.workspaces.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_workers)
+                self._semaphores[loop] = semaphore
+            return semaphore
+
+    def _start_worker(self) -> None:
+        worker = threading.Thread(target=self._worker_loop, name="latex-compile", daemon=True)
+        self._workers.add(worker)
+        worker.start()
+
+    def _worker_loop(self) -> None:
+        jobs_done = 0
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            future, tex_content, template_id = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            result: CompiledPdf | None = None
+            error: BaseException | None = None
+            try:
+                result = self._run_job(tex_content, template_id)
+            except BaseException as e:
+                error = e
+
+            jobs_done += 1
+            retire = bool(self.max_jobs_per_worker) and jobs_done >= self.max_jobs_per_worker
+            with self._lock:
+                self._jobs_completed += 1
+                if retire:
+                    # Retire this worker; a replacement takes over its slot.
+                    self._workers.discard(threading.current_thread())
+                    self._workers_recycled += 1
+                    if not self._shutdown:
+                        self._start_worker()
+
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+            if retire:
+                return
+
+        with self._lock:
+            self._workers.discard(threading.current_thread())
+
+    def _run_job(self, tex_content: str, template_id: str | None = None) -> CompiledPdf:
+        """Compile one document, using the template's preamble format when available."""
+        source, fmt_file = self.format_cache.prepare(template_id, tex_content)
+        if fmt_file is None:
+            return self._compile_once(tex_content)
+
+        try:
+            return self._compile_once(source, fmt_file)
+        except CompileTimeoutError:
+            raise
+        except RuntimeError:
+            # The format may be unusable (TeX upgraded, corrupt dump): retry the plain source
+            compiled = self._compile_once(tex_content)
+            print(f"⚠️ Precompiled format {fmt_file.name} failed, disabling it.")
+            self.format_cache.invalidate(template_id)
+            return compiled
+
+    def _compile_once(self, tex_content: str, fmt_file: Path | None = None) -> CompiledPdf:
+        """Compile one document in a borrowed workspace and return the PDF with metadata."""
+        with self.workspaces.workspace() as workspace:
+            tex_file = workspace.write_source(tex_content)
+
+            compiler = PdfCompiler(tex_file, timeout=self.job_timeout, fmt_file=fmt_file)
+            metadata = compiler.compile(clean=True)
+
+            content = workspace.read_pdf()
+            if content is None:
+                raise RuntimeError("PDF generation failed.")
+
+            return CompiledPdf(content=content, metadata=metadata)
+
+
+_compile_pool: CompilePool | None = None
+_compile_pool_lock = threading.Lock()
+
+
+def get_compile_pool() -> CompilePool:
+    """Get or create the process-wide compile pool."""
+    global _compile_pool
+    with _compile_pool_lock:
+        if _compile_pool is None:
+            _compile_pool = CompilePool(result_cache=get_pdf_cache())
+        return _compile_pool
+
+
+def shutdown_compile_pool() -> None:
+    """Shut down the process-wide compile pool if it was started; a later get creates a new one."""
+    global _compile_pool
+    with _compile_pool_lock:
+        pool, _compile_pool = _compile_pool, None
+    if pool is not None:
+        pool.shutdown()
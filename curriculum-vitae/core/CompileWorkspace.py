@@ -0,0 +1,139 @@
+"""Reusable scratch directories for LaTeX compile jobs."""
+
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# Where scratch directories live; defaults to tmpfs (/dev/shm) when available
+PDF_COMPILE_WORKSPACE_ROOT = os.environ.get("PDF_COMPILE_WORKSPACE_ROOT", "")
+
+TMPFS_ROOT = Path("/dev/shm")
+
+
+def default_workspace_root() -> Path:
+    """tmpfs when it is usable, the system temp directory otherwise."""
+    if PDF_COMPILE_WORKSPACE_ROOT:
+        return Path(PDF_COMPILE_WORKSPACE_ROOT)
+    if TMPFS_ROOT.is_dir() and os.access(TMPFS_ROOT, os.W_OK | os.X_OK):
+        return TMPFS_ROOT
+    return Path(tempfile.gettempdir())
+
+
+class CompileWorkspace:
+    """One private scratch directory, used by a single compile job at a time."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tex_file = path / "main.tex"
+        self.pdf_file = path / "main.pdf"
+
+    def write_source(self, tex_content: str) -> Path:
+        """Write the rendered document in a single write and return its path."""
+        self.tex_file.write_text(tex_content, encoding="utf-8")
+        return self.tex_file
+
+    def read_pdf(self) -> bytes | None:
+        """PDF produced by the last compile, or None if there is none."""
+        try:
+            return self.pdf_file.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def scrub(self) -> None:
+        """Delete everything inside the directory, keeping the directory itself."""
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+
+    def destroy(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class CompileWorkspaces:
+    """Pool of pre-created scratch directories handed out to compile jobs.
+
+    Creating and deleting a directory tree per request costs several syscalls
+    and, on disk-backed /tmp, journal writes. Directories here are created once
+    (``mkdtemp``, mode 0700), lent to one job at a time and scrubbed before they
+    go back to the pool, so nothing user-derived outlives the job that wrote it.
+    A directory that cannot be scrubbed is deleted instead of being reused.
+    """
+
+    def __init__(self, root: Path | None = None, size: int = 0):
+        self.root = root if root is not None else default_workspace_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._idle: list[CompileWorkspace] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._created = 0
+        self._discarded = 0
+
+        for _ in range(size):
+            self._idle.append(self._create())
+
+    @contextmanager
+    def workspace(self):
+        """Borrow an empty workspace for the duration of a ``with`` block."""
+        workspace = self.acquire()
+        try:
+            yield workspace
+        finally:
+            self.release(workspace)
+
+    def acquire(self) -> CompileWorkspace:
+        """Take an idle workspace, creating one if the pool is empty."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._create()
+
+    def release(self, workspace: CompileWorkspace) -> None:
+        """Scrub a workspace and return it to the pool."""
+        try:
+            # SECURITY: Always remove compile inputs and outputs, even on exceptions
+            workspace.scrub()
+        except OSError as e:
+            print(f"⚠️ Could not scrub compile workspace {workspace.path}: {e}")
+            self._discard(workspace)
+            return
+
+        with self._lock:
+            if not self._closed:
+                self._idle.append(workspace)
+                return
+        self._discard(workspace)
+
+    def close(self) -> None:
+        """Delete every idle workspace; workspaces still in use are deleted on release."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for workspace in idle:
+            workspace.destroy()
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of workspace counters for monitoring."""
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "created": self._created,
+                "discarded": self._discarded,
+            }
+
+    def _create(self) -> CompileWorkspace:
+        path = Path(tempfile.mkdtemp(prefix="cv_", dir=self.root))
+        with self._lock:
+            self._created += 1
+        return CompileWorkspace(path)
+
+    def _discard(self, workspace: CompileWorkspace) -> None:
+        workspace.destroy()
+        with self._lock:
+            self._discarded += 1
@@ -0,0 +1,293 @@
+"""Redis-backed outbox: requests queue emails, a background task delivers them."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Any
+
+import httpx
+import redis
+
+from core import email
+
+logger = logging.getLogger(__name__)
+
+# Queue emails instead of sending them from the request (false: send inline)
+EMAIL_OUTBOX_ENABLED = os.environ.get("EMAIL_OUTBOX_ENABLED", "true").lower() == "true"
+# Emails sent concurrently per drain pass
+EMAIL_OUTBOX_BATCH_SIZE = int(os.environ.get("EMAIL_OUTBOX_BATCH_SIZE", "20"))
+# Attempts before an email is moved to the dead-letter list
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.environ.get("EMAIL_OUTBOX_MAX_ATTEMPTS", "6"))
+# Delay before the first retry, doubled on each following one up to the max
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = float(os.environ.get("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "5"))
+EMAIL_OUTBOX_RETRY_MAX_SECONDS = float(os.environ.get("EMAIL_OUTBOX_RETRY_MAX_SECONDS", "900"))
+# Pause between drain passes once the queue has nothing due
+EMAIL_OUTBOX_POLL_SECONDS = float(os.environ.get("EMAIL_OUTBOX_POLL_SECONDS", "1"))
+# Lifetime of the dead-letter list, renewed by each new entry
+EMAIL_OUTBOX_DEAD_LETTER_TTL_SECONDS = int(
+    os.environ.get("EMAIL_OUTBOX_DEAD_LETTER_TTL_SECONDS", str(7 * 24 * 3600))
+)
+
+QUEUE_KEY = "email_outbox:queue"
+DEAD_LETTER_KEY = "email_outbox:dead"
+DEAD_LETTER_MAX = 1000
+# Kept on dead letters; the body is dropped, as it may hold live links and tokens
+_DEAD_LETTER_FIELDS = ("id", "to", "subject", "attempts", "error", "queued_at", "raw")
+
+# Client errors worth retrying; any other 4xx means the message itself is rejected
+_RETRYABLE_STATUS = frozenset({408, 429})
+
+
+class EmailOutbox:
+    """Queue of outgoing emails in a Redis sorted set scored by due time.
+
+    ``enqueue`` is a single ZADD, so request handlers return immediately.
+    ``run`` drains due messages in batches, sending each batch concurrently
+    through one shared ``httpx.AsyncClient``. A failed send is rescheduled
+    with exponential backoff; after ``max_attempts``, or on a permanent 4xx,
+    its metadata (not its body) goes to a capped, expiring dead-letter list.
+    Every app worker may run a drainer: a message is claimed by whoever
+    removes it from the set first, so it is sent at most once (a worker
+    dying mid-send loses it).
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        api_url: str | None = None,
+        batch_size: int = EMAIL_OUTBOX_BATCH_SIZE,
+        max_attempts: int = EMAIL_OUTBOX_MAX_ATTEMPTS,
+        retry_base: float = EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+        retry_max: float = EMAIL_OUTBOX_RETRY_MAX_SECONDS,
+        poll_interval: float = EMAIL_OUTBOX_POLL_SECONDS,
+        timeout: float = 10,
+    ):
+        self.redis_client = redis_client
+        self.api_url = api_url or email.ZEPTOMAIL_API_URL
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+        self._client: httpx.AsyncClient | None = None
+        self._lock = threading.Lock()
+        self._counters = {"enqueued": 0, "sent": 0, "retried": 0, "dead_lettered": 0}
+        self._unsettled: list[tuple[dict[str, Any], BaseException | None]] = []
+
+    def enqueue(self, to: str, subject: str, html_body: str) -> bool:
+        """Queue an email for delivery; False when Redis is unavailable."""
+        message = {
+            "id": uuid.uuid4().hex,
+            "to": to,
+            "subject": subject,
+            "html_body": html_body,
+            "attempts": 0,
+            "queued_at": time.time(),
+        }
+        try:
+            self.redis_client.zadd(QUEUE_KEY, {json.dumps(message): time.time()})
+        except redis.RedisError as e:
+            logger.warning("Email outbox unavailable, sending to %s inline: %s", to, e)
+            return False
+        self._count("enqueued")
+        return True
+
+    async def drain_once(self) -> int:
+        """Send the emails due now, at most one batch; returns how many were claimed."""
+        if self._unsettled:
+            # Failures of a previous pass that Redis could not take back yet
+            self._unsettled = await asyncio.to_thread(self._settle, self._unsettled)
+            if self._unsettled:
+                return 0
+        messages = await asyncio.to_thread(self._claim_due)
+        if not messages:
+            return 0
+        errors = await asyncio.gather(
+            *(self._send(message) for message in messages), return_exceptions=True
+        )
+        self._unsettled = await asyncio.to_thread(
+            self._settle, list(zip(messages, errors, strict=True))
+        )
+        return len(messages)
+
+    async def run(self) -> None:
+        """Drain the outbox until cancelled; a failed pass is logged and the next one follows."""
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except redis.RedisError as e:
+                logger.warning("Email outbox drain failed: %s", e)
+                claimed = 0
+            except Exception:
+                logger.exception("Email outbox drain failed")
+                claimed = 0
+            # A full batch means more may be due: go again without waiting
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def dead_letters(self, limit: int = 50) -> list[dict[str, Any]]:
+        """Most recent undeliverable emails (without their body), newest first."""
+        return [
+            json.loads(item) for item in self.redis_client.lrange(DEAD_LETTER_KEY, 0, limit - 1)
+        ]
+
+    def stats(self) -> dict[str, int | None]:
+        """Outbox counters for monitoring; queue sizes are None when Redis is down."""
+        with self._lock:
+            stats: dict[str, int | None] = dict(self._counters)
+        try:
+            stats["queued"] = self.redis_client.zcard(QUEUE_KEY)
+            stats["dead_letters"] = self.redis_client.llen(DEAD_LETTER_KEY)
+        except redis.RedisError:
+            stats["queued"] = stats["dead_letters"] = None
+        return stats
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the next attempt, with jitter so retries spread out."""
+        delay = min(self.retry_max, self.retry_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.batch_size),
+            )
+        return self._client
+
+    def _claim_due(self) -> list[dict[str, Any]]:
+        members = self.redis_client.zrangebyscore(
+            QUEUE_KEY, "-inf", time.time(), start=0, num=self.batch_size
+        )
+        claimed = []
+        for member in members:
+            try:
+                # ZREM returns 0 when another worker claimed the message first
+                if not self.redis_client.zrem(QUEUE_KEY, member):
+                    continue
+            except redis.RedisError as e:
+                # Keep what was already removed from the queue
+                logger.warning("Email outbox claim interrupted: %s", e)
+                break
+            try:
+                message = json.loads(member)
+            except ValueError:
+                message = None
+            # A malformed member fails to send and is dead-lettered as is
+            claimed.append(message if isinstance(message, dict) else {"raw": member})
+        return claimed
+
+    async def _send(self, message: dict[str, Any]) -> Exception | None:
+        """Deliver one message; the error, or None once ZeptoMail accepted it."""
+        payload, headers = email.build_request(
+            message["to"], message["subject"], message["html_body"]
+        )
+        try:
+            response = await self._get_client().post(self.api_url, json=payload, headers=headers)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            return e
+        return None
+
+    def _settle(
+        self, results: list[tuple[dict[str, Any], BaseException | None]]
+    ) -> list[tuple[dict[str, Any], BaseException | None]]:
+        """Record sent messages and reschedule or dead-letter the failed ones.
+
+        Returns the failures Redis could not store, to settle again on the next pass.
+        """
+        unsettled = []
+        for message, error in results:
+            if error is None:
+                logger.info("Email sent to %s", message["to"])
+                self._count("sent")
+                continue
+            try:
+                self._settle_failure(message, error)
+            except redis.RedisError as e:
+                logger.warning("Email outbox could not settle a failed email: %s", e)
+                unsettled.append((message, error))
+        return unsettled
+
+    def _settle_failure(self, message: dict[str, Any], error: BaseException) -> None:
+        message = {**message, "attempts": message.get("attempts", 0) + 1, "error": str(error)}
+        # Anything but an HTTP error comes from the message itself: retrying cannot help
+        permanent = not isinstance(error, httpx.HTTPError) or (
+            isinstance(error, httpx.HTTPStatusError)
+            and error.response.is_client_error
+            and error.response.status_code not in _RETRYABLE_STATUS
+        )
+        if permanent or message["attempts"] >= self.max_attempts:
+            logger.error(
+                "Email to %s dead-lettered after %d attempt(s): %r",
+                message.get("to"),
+                message["attempts"],
+                error,
+            )
+            dead_letter = {key: message[key] for key in _DEAD_LETTER_FIELDS if key in message}
+            dead_letter["failed_at"] = time.time()
+            pipe = self.redis_client.pipeline()
+            pipe.lpush(DEAD_LETTER_KEY, json.dumps(dead_letter))
+            pipe.ltrim(DEAD_LETTER_KEY, 0, DEAD_LETTER_MAX - 1)
+            pipe.expire(DEAD_LETTER_KEY, EMAIL_OUTBOX_DEAD_LETTER_TTL_SECONDS)
+            pipe.execute()
+            self._count("dead_lettered")
+        else:
+            delay = self.retry_delay(message["attempts"])
+            logger.warning(
+                "Email to %s failed (attempt %d), retrying in %.0fs: %s",
+                message["to"],
+                message["attempts"],
+                delay,
+                error,
+            )
+            self.redis_client.zadd(QUEUE_KEY, {json.dumps(message): time.time() + delay})
+            self._count("retried")
+
+
+_email_outbox: EmailOutbox | None = None
+_email_outbox_lock = threading.Lock()
+
+
+def get_email_outbox() -> EmailOutbox:
+    """Get or create the process-wide email outbox."""
+    global _email_outbox
+    with _email_outbox_lock:
+        if _email_outbox is None:
+            _email_outbox = EmailOutbox(
+                redis.Redis.from_url(
+                    os.environ.get("REDIS_URL", "redis://localhost:6379"),
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+            )
+        return _email_outbox
+
+
+async def run_email_outbox() -> None:
+    """Background task of the app: drain the outbox, close its client when cancelled."""
+    outbox = get_email_outbox()
+    try:
+        await outbox.run()
+    finally:
+        with contextlib.suppress(Exception):
+            await outbox.aclose()
@@ -0,0 +1,280 @@
+"""Precompiled LaTeX formats holding the static preamble of each template.
+
+Every template starts with a preamble that never depends on user data
+(document class, fonts, titlesec, geometry...). It is dumped once into a
+``.fmt`` file with ``mylatexformat``; documents compiled with ``-fmt`` then
+skip everything up to ``\\endofdump`` instead of re-loading those packages.
+
+Build all formats ahead of time (Docker image build) with:
+
+    python -m core.FormatCache
+
+A template whose format cannot be built still compiles, without ``-fmt``:
+failures are reported but only fail the command with ``--strict`` (CI).
+"""
+
+import argparse
+import contextlib
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+TEMPLATES_FOLDER = Path(__file__).parent.parent / "templates"
+LATEX_FORMAT_DIR = Path(
+    os.environ.get("LATEX_FORMAT_DIR", str(Path(__file__).parent.parent / "formats"))
+)
+LATEX_PRECOMPILED_FORMATS = os.environ.get("LATEX_PRECOMPILED_FORMATS", "true").lower() == "true"
+FORMAT_BUILD_TIMEOUT_SECONDS = 120
+
+ENDOFDUMP = "\\endofdump\n"
+
+# Jinja delimiters configured in LatexRenderer: anything after them depends on user data.
+_JINJA_MARKERS = (r"\VAR{", r"\BLOCK{", r"\#{")
+# hyperref patches too many internals at \begin{document} to be dumped reliably.
+_UNDUMPABLE_PACKAGE = re.compile(
+    r"\\(?:usepackage|RequirePackage)(?:\[[^\]]*\])?\{[^}]*\bhyperref\b"
+)
+
+
+def split_static_preamble(source: str) -> str | None:
+    """Return the leading part of a template that is plain LaTeX and can be dumped.
+
+    The prefix stops at the first Jinja tag, the first package that cannot live in
+    a format, or ``\\begin{document}``. Returns None when nothing useful can be dumped.
+    """
+    prefix: list[str] = []
+    for line in source.splitlines(keepends=True):
+        if (
+            any(marker in line for marker in _JINJA_MARKERS)
+            or _UNDUMPABLE_PACKAGE.search(line)
+            or line.lstrip().startswith(r"\begin{document}")
+        ):
+            break
+        prefix.append(line)
+    else:
+        return None
+
+    static = "".join(prefix)
+    if not static.lstrip().startswith(r"\documentclass"):
+        return None
+    return static
+
+
+class FormatCache:
+    """Builds and tracks one precompiled format per template, keyed by preamble hash."""
+
+    def __init__(
+        self,
+        templates_folder: Path = TEMPLATES_FOLDER,
+        format_dir: Path = LATEX_FORMAT_DIR,
+        enabled: bool = LATEX_PRECOMPILED_FORMATS,
+    ):
+        self.templates_folder = templates_folder
+        self.format_dir = format_dir
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._build_locks: dict[str, threading.Lock] = {}
+        # template_id -> ((mtime_ns, size), static preamble) so templates are only re-read on change
+        self._preambles: dict[str, tuple[tuple[int, int], str | None]] = {}
+        # Format names whose build failed; not retried until the preamble changes.
+        self._failed: set[str] = set()
+        self._engine_version: str | None = None
+
+    def prepare(self, template_id: str | None, tex_content: str) -> tuple[str, Path | None]:
+        """Return the TeX source to compile and the format to load it with, if any.
+
+        Never builds on the caller's thread: a missing or stale format is rebuilt in
+        the background and the unmodified source (and no format) is used meanwhile.
+        """
+        if not self.enabled or not template_id:
+            return tex_content, None
+
+        preamble = self._static_preamble(template_id)
+        if preamble is None or not tex_content.startswith(preamble):
+            return tex_content, None
+
+        name = self._format_name(template_id, preamble)
+        fmt_file = self.format_dir / f"{name}.fmt"
+        if not fmt_file.exists():
+            self._schedule_build(template_id, name)
+            return tex_content, None
+
+        return preamble + ENDOFDUMP + tex_content[len(preamble) :], fmt_file
+
+    def get_format(self, template_id: str) -> Path | None:
+        """Return the up-to-date format for a template, building it if missing or stale."""
+        preamble = self._static_preamble(template_id)
+        if preamble is None:
+            return None
+
+        name = self._format_name(template_id, preamble)
+        fmt_file = self.format_dir / f"{name}.fmt"
+        if fmt_file.exists():
+            return fmt_file
+
+        with self._build_lock(template_id):
+            if fmt_file.exists():
+                return fmt_file
+            if name in self._failed:
+                return None
+            try:
+                self._build(name, preamble)
+            except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+                print(f"⚠️ Could not build LaTeX format {name}: {e}")
+                with self._lock:
+                    self._failed.add(name)
+                return None
+            self._prune(template_id, keep=fmt_file)
+        return fmt_file
+
+    def invalidate(self, template_id: str) -> None:
+        """Drop a template's format (e.g. it was dumped by another TeX version)."""
+        preamble = self._static_preamble(template_id)
+        if preamble is None:
+            return
+        name = self._format_name(template_id, preamble)
+        with self._lock:
+            self._failed.add(name)
+        with contextlib.suppress(FileNotFoundError):
+            (self.format_dir / f"{name}.fmt").unlink()
+
+    def build_all(self) -> dict[str, bool]:
+        """Build every missing or stale format. Returns template_id -> format available."""
+        if not self.enabled:
+            return {}
+        return {
+            template.stem: self.get_format(template.stem) is not None
+            for template in sorted(self.templates_folder.glob("*.tex"))
+        }
+
+    def _schedule_build(self, template_id: str, name: str) -> None:
+        """Build a template's format on a background thread unless a build is running."""
+        if name in self._failed or self._build_lock(template_id).locked():
+            return
+        threading.Thread(
+            target=self.get_format, args=(template_id,), name="latex-format", daemon=True
+        ).start()
+
+    def _static_preamble(self, template_id: str) -> str | None:
+        template_file = self.templates_folder / f"{template_id}.tex"
+        try:
+            stat = template_file.stat()
+        except FileNotFoundError:
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._preambles.get(template_id)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        preamble = split_static_preamble(template_file.read_text(encoding="utf-8"))
+        with self._lock:
+            self._preambles[template_id] = (signature, preamble)
+        return preamble
+
+    def _format_name(self, template_id: str, preamble: str) -> str:
+        # The engine version is part of the key: a format only loads in the TeX that dumped it.
+        digest = hashlib.sha256(f"{self._get_engine_version()}\n{preamble}".encode()).hexdigest()
+        return f"{template_id}-{digest[:12]}"
+
+    def _get_engine_version(self) -> str:
+        if self._engine_version is None:
+            try:
+                result = subprocess.run(
+                    ["pdftex", "--version"], capture_output=True, text=True, timeout=10
+                )
+                version = result.stdout.splitlines()[0] if result.stdout else "unknown"
+            except (OSError, subprocess.SubprocessError):
+                version = "unknown"
+            self._engine_version = version
+        return self._engine_version
+
+    def _build_lock(self, template_id: str) -> threading.Lock:
+        with self._lock:
+            return self._build_locks.setdefault(template_id, threading.Lock())
+
+    def _build(self, name: str, preamble: str) -> None:
+        """Dump the preamble into ``format_dir/<name>.fmt`` with mylatexformat."""
+        self.format_dir.mkdir(parents=True, exist_ok=True)
+        build_dir = Path(tempfile.mkdtemp(prefix="fmt_"))
+        try:
+            source = build_dir / f"{name}.tex"
+            source.write_text(
+                preamble + ENDOFDUMP + "\\begin{document}\n\\end{document}\n", encoding="utf-8"
+            )
+            # SECURITY: -no-shell-escape, same as regular compilations
+            cmd = [
+                "pdftex",
+                "-ini",
+                "-no-shell-escape",
+                "-interaction=nonstopmode",
+                "-halt-on-error",
+                f"-jobname={name}",
+                "&pdflatex",
+                "mylatexformat.ltx",
+                source.name,
+            ]
+            subprocess.run(
+                cmd,
+                cwd=build_dir,
+                check=True,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=FORMAT_BUILD_TIMEOUT_SECONDS,
+            )
+
+            built = build_dir / f"{name}.fmt"
+            if not built.exists():
+                raise RuntimeError("pdftex did not produce a format file")
+            # Atomic publish: concurrent app workers may build the same format.
+            os.replace(built, self.format_dir / f"{name}.fmt")
+            print(f"✅ LaTeX format {name} built.")
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def _prune(self, template_id: str, keep: Path) -> None:
+        """Remove formats left over from previous versions of a template."""
+        for old in self.format_dir.glob(f"{template_id}-*.fmt"):
+            if old != keep:
+                with contextlib.suppress(OSError):
+                    old.unlink()
+
+
+_format_cache: FormatCache | None = None
+_format_cache_lock = threading.Lock()
+
+
+def get_format_cache() -> FormatCache:
+    """Get or create the process-wide format cache."""
+    global _format_cache
+    with _format_cache_lock:
+        if _format_cache is None:
+            _format_cache = FormatCache()
+        return _format_cache
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--strict", action="store_true", help="Exit with status 1 if any format fails to build"
+    )
+    args = parser.parse_args(argv)
+
+    results = FormatCache(enabled=True).build_all()
+    for template_id, available in results.items():
+        print(f"{'✅' if available else '❌'} {template_id}")
+    failed = [template_id for template_id, available in results.items() if not available]
+    if failed:
+        print(f"⚠️ {len(failed)} template(s) will compile without a format: {', '.join(failed)}")
+    return 1 if failed and args.strict else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
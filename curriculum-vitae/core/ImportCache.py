@@ -0,0 +1,128 @@
+"""Cache of structured CV imports, keyed on the extracted PDF text."""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Any
+
+import redis
+
+IMPORT_CACHE_ENABLED = os.environ.get("IMPORT_CACHE_ENABLED", "false").lower() == "true"
+IMPORT_CACHE_TTL_SECONDS = int(os.environ.get("IMPORT_CACHE_TTL_SECONDS", "86400"))
+
+REDIS_KEY_PREFIX = "import_cache:"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ImportCache:
+    """Redis cache of the LLM's structured result for a given CV text and prompt.
+
+    Re-uploading the same CV (retry after a failed session, guest account then
+    registered account) replays the stored result instead of calling the
+    model again. The key covers the user, the normalized text and the prompt
+    version: results hold personal data and are never shared between users,
+    and changing the prompt or the model invalidates every entry. Entries
+    expire after ``ttl`` seconds; any Redis error is treated as a miss.
+    """
+
+    def __init__(self, redis_client: redis.Redis | None, ttl: int = IMPORT_CACHE_TTL_SECONDS):
+        self.redis_client = redis_client
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Text with Unicode composed and whitespace runs collapsed."""
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+    @staticmethod
+    def prompt_version(prompt: str, model: str) -> str:
+        """Short digest identifying the prompt (text or fingerprint) and model of a result."""
+        return hashlib.sha256(f"{model}\0{prompt}".encode()).hexdigest()[:16]
+
+    @classmethod
+    def key(cls, text: str, prompt_version: str, user_id: int) -> str:
+        """Cache key of an import: user, prompt version and normalized CV text."""
+        digest = hashlib.sha256()
+        digest.update(f"{user_id}\0{prompt_version}\0".encode())
+        digest.update(cls.normalize_text(text).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Cached result for a key, or None."""
+        value = None
+        if self.redis_client is not None:
+            try:
+                value = self.redis_client.get(REDIS_KEY_PREFIX + key)
+            except redis.RedisError as e:
+                print(f"⚠️ Import cache Redis read failed: {e}")
+
+        result = None
+        if value is not None:
+            try:
+                result = json.loads(value)
+            except ValueError:
+                result = None
+
+        with self._lock:
+            if isinstance(result, dict):
+                self._hits += 1
+                return result
+            self._misses += 1
+        return None
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """Store a result for ``ttl`` seconds."""
+        if self.redis_client is None:
+            return
+        try:
+            self.redis_client.set(
+                REDIS_KEY_PREFIX + key, json.dumps(result, ensure_ascii=False), ex=self.ttl
+            )
+        except redis.RedisError as e:
+            print(f"⚠️ Import cache Redis write failed: {e}")
+
+    async def get_async(self, key: str) -> dict[str, Any] | None:
+        """``get`` without blocking the event loop on a Redis round trip."""
+        if self.redis_client is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, result: dict[str, Any]) -> None:
+        """``put`` without blocking the event loop on a Redis round trip."""
+        if self.redis_client is not None:
+            await asyncio.to_thread(self.put, key, result)
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of cache counters for monitoring."""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+
+_import_cache: ImportCache | None = None
+_import_cache_lock = threading.Lock()
+
+
+def get_import_cache() -> ImportCache:
+    """Get or create the process-wide import cache."""
+    global _import_cache
+    with _import_cache_lock:
+        if _import_cache is None:
+            redis_client = None
+            if IMPORT_CACHE_ENABLED:
+                redis_client = redis.Redis.from_url(
+                    os.environ.get("REDIS_URL", "redis://localhost:6379"),
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+            _import_cache = ImportCache(redis_client)
+        return _import_cache
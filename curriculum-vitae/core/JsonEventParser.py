@@ -0,0 +1,156 @@
+"""Incremental extraction of complete values from a streamed JSON document."""
+
+import json
+import re
+from collections.abc import Iterable
+from typing import Any
+
+# Characters that change the parser state outside of a string
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+# Characters that end or escape inside a string
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JsonEventParser:
+    """Emits selected values of a top-level JSON object as soon as they are complete.
+
+    Chunks are fed as they arrive; the scan resumes where the previous chunk
+    stopped, so the whole stream is parsed in linear time and every value is
+    decoded once. For each key in ``objects`` the value is emitted when it
+    closes; for each key in ``arrays`` every element is emitted when it closes.
+    Only object and array values are emitted; scalars are ignored.
+
+        parser = JsonEventParser(objects=("personal",), arrays=("sections",))
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+        document = parser.text
+    """
+
+    def __init__(self, objects: Iterable[str] = (), arrays: Iterable[str] = ()):
+        self.objects = frozenset(objects)
+        self.arrays = frozenset(arrays)
+
+        self._chunks: list[str] = []
+        # One [kind, key, expecting_key] entry per open container
+        self._stack: list[list[Any]] = []
+        self._in_string = False
+        self._escaped = False
+        self._key_parts: list[str] | None = None
+
+        # Value being captured: its emit key, stack depth and text so far
+        self._capture_key: str | None = None
+        self._capture_depth = 0
+        self._capture_parts: list[str] = []
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        """Scan a chunk and return the ``(key, value)`` pairs it completed, in order."""
+        self._chunks.append(chunk)
+        events: list[tuple[str, Any]] = []
+        capture_from = 0
+        pos = 0
+        end = len(chunk)
+
+        while pos < end:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                    if self._key_parts is not None:
+                        self._key_parts.append(chunk[pos])
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, pos)
+                if match is None:
+                    if self._key_parts is not None:
+                        self._key_parts.append(chunk[pos:])
+                    break
+                stop = match.start()
+                if chunk[stop] == "\\":
+                    self._escaped = True
+                    if self._key_parts is not None:
+                        self._key_parts.append(chunk[pos : stop + 1])
+                    pos = stop + 1
+                    continue
+                self._in_string = False
+                if self._key_parts is not None:
+                    self._key_parts.append(chunk[pos:stop])
+                    self._stack[-1][1] = self._decode_key("".join(self._key_parts))
+                    self._key_parts = None
+                pos = stop + 1
+                continue
+
+            match = _STRUCTURAL.search(chunk, pos)
+            if match is None:
+                break
+            pos = match.start()
+            char = chunk[pos]
+
+            if char == '"':
+                self._in_string = True
+                top = self._stack[-1] if self._stack else None
+                if top is not None and top[0] == "{" and top[2]:
+                    self._key_parts = []
+            elif char in "{[":
+                if self._capture_key is None:
+                    key = self._target_key()
+                    if key is not None:
+                        self._capture_key = key
+                        self._capture_depth = len(self._stack)
+                        self._capture_parts = []
+                        capture_from = pos
+                self._stack.append([char, None, char == "{"])
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if self._capture_key is not None and len(self._stack) == self._capture_depth:
+                    self._capture_parts.append(chunk[capture_from : pos + 1])
+                    event = self._emit()
+                    if event is not None:
+                        events.append(event)
+            elif char == ":":
+                if self._stack and self._stack[-1][0] == "{":
+                    self._stack[-1][2] = False
+            elif char == "," and self._stack and self._stack[-1][0] == "{":
+                self._stack[-1][2] = True
+            pos += 1
+
+        if self._capture_key is not None:
+            self._capture_parts.append(chunk[capture_from:])
+        return events
+
+    def _target_key(self) -> str | None:
+        """Emit key for a container opening at the current position, if it is a target."""
+        if not self._stack or self._stack[0][0] != "{":
+            return None
+        key = self._stack[0][1]
+        if len(self._stack) == 1 and key in self.objects:
+            return key
+        if len(self._stack) == 2 and key in self.arrays and self._stack[1][0] == "[":
+            return key
+        return None
+
+    def _emit(self) -> tuple[str, Any] | None:
+        key = self._capture_key
+        raw = "".join(self._capture_parts)
+        self._capture_key = None
+        self._capture_parts = []
+        try:
+            return key, json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+    @staticmethod
+    def _decode_key(raw: str) -> str:
+        if "\\" not in raw:
+            return raw
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return raw
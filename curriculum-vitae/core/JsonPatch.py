@@ -0,0 +1,164 @@
+"""JSON Patch (RFC 6902) over JSON Pointers (RFC 6901), for partial resume updates."""
+
+import copy
+import re
+from typing import Any
+
+OPERATIONS = ("add", "remove", "replace", "move", "copy", "test")
+
+# Array indexes as RFC 6901 spells them: no sign, no leading zero
+_ARRAY_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+
+class JsonPatchError(ValueError):
+    """A patch operation is malformed or does not apply to the document."""
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Reference tokens of a JSON Pointer; "" points at the whole document."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON Pointer '{pointer}': must start with '/'")
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def apply_patch(document: Any, operations: list[dict[str, Any]]) -> Any:
+    """Apply ``operations`` in order and return the patched document.
+
+    ``document`` is left untouched: each operation copies only the containers
+    on its path, the rest of the new document is shared with the old one. The
+    patch is atomic: if any operation fails, JsonPatchError is raised and no
+    patched document is produced.
+    """
+    for index, operation in enumerate(operations):
+        try:
+            document = _apply_operation(document, operation)
+        except JsonPatchError as e:
+            raise JsonPatchError(f"Operation {index} ({operation.get('op')}): {e}") from None
+    return document
+
+
+def _apply_operation(document: Any, operation: dict[str, Any]) -> Any:
+    op = operation.get("op")
+    if op not in OPERATIONS:
+        raise JsonPatchError(f"unknown op '{op}'")
+    path = _require(operation, "path", str)
+    tokens = parse_pointer(path)
+
+    if op == "test":
+        if not _json_equal(_get(document, tokens), _require(operation, "value")):
+            raise JsonPatchError(f"value at '{path}' differs")
+        return document
+    if op == "add":
+        return _add(document, tokens, _require(operation, "value"))
+    if op == "remove":
+        document, _ = _remove(document, tokens)
+        return document
+    if op == "replace":
+        _get(document, tokens)
+        document, _ = _remove(document, tokens)
+        return _add(document, tokens, _require(operation, "value"))
+
+    from_tokens = parse_pointer(_require(operation, "from", str))
+    if op == "copy":
+        return _add(document, tokens, copy.deepcopy(_get(document, from_tokens)))
+    # move
+    if tokens[: len(from_tokens)] == from_tokens and tokens != from_tokens:
+        raise JsonPatchError("cannot move a value into one of its children")
+    document, value = _remove(document, from_tokens)
+    return _add(document, tokens, value)
+
+
+def _require(operation: dict[str, Any], member: str, kind: type | None = None) -> Any:
+    if member not in operation:
+        raise JsonPatchError(f"missing '{member}'")
+    value = operation[member]
+    if kind is not None and not isinstance(value, kind):
+        raise JsonPatchError(f"'{member}' must be a {kind.__name__}")
+    return value
+
+
+def _get(document: Any, tokens: list[str]) -> Any:
+    node = document
+    for token in tokens:
+        node = node[_child_key(node, token)]
+    return node
+
+
+def _add(document: Any, tokens: list[str], value: Any) -> Any:
+    if not tokens:
+        return value
+    document, parent = _copy_to_parent(document, tokens)
+    token = tokens[-1]
+    if isinstance(parent, list):
+        if token == "-":
+            parent.append(value)
+        else:
+            index = _array_index(token)
+            if index > len(parent):
+                raise JsonPatchError(f"index {index} is out of range")
+            parent.insert(index, value)
+    else:
+        parent[token] = value
+    return document
+
+
+def _remove(document: Any, tokens: list[str]) -> tuple[Any, Any]:
+    """The document without the value at ``tokens``, and that value."""
+    if not tokens:
+        return None, document
+    document, parent = _copy_to_parent(document, tokens)
+    return document, parent.pop(_child_key(parent, tokens[-1]))
+
+
+def _copy_to_parent(document: Any, tokens: list[str]) -> tuple[Any, Any]:
+    """Shallow-copy the containers from the root down to the parent of ``tokens``."""
+    document = _copy_container(document, tokens[0])
+    parent = document
+    for token in tokens[:-1]:
+        key = _child_key(parent, token)
+        parent[key] = _copy_container(parent[key], token)
+        parent = parent[key]
+    return document, parent
+
+
+def _copy_container(node: Any, token: str) -> list[Any] | dict[str, Any]:
+    if isinstance(node, list):
+        return list(node)
+    if isinstance(node, dict):
+        return dict(node)
+    raise JsonPatchError(f"cannot reach '{token}' inside a {type(node).__name__}")
+
+
+def _child_key(node: Any, token: str) -> int | str:
+    """Key of an existing child of ``node``."""
+    if isinstance(node, dict):
+        if token not in node:
+            raise JsonPatchError(f"member '{token}' not found")
+        return token
+    if isinstance(node, list):
+        index = _array_index(token)
+        if index >= len(node):
+            raise JsonPatchError(f"index {index} is out of range")
+        return index
+    raise JsonPatchError(f"cannot reach '{token}' inside a {type(node).__name__}")
+
+
+def _array_index(token: str) -> int:
+    if not _ARRAY_INDEX.fullmatch(token):
+        raise JsonPatchError(f"invalid array index '{token}'")
+    return int(token)
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    """Equality of JSON values: unlike ``==``, true and 1 differ."""
+    if isinstance(a, bool) or isinstance(b, bool) or a is None or b is None:
+        return a is b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b, strict=True))
+    if isinstance(a, int | float) and isinstance(b, int | float):
+        return a == b
+    return type(a) is type(b) and a == b
@@ -1,14 +1,23 @@
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+from jinja2 import BytecodeCache, Environment, FileSystemLoader, TemplateNotFound
 
 
 class LatexRenderer:
     """Responsible for rendering the Jinja2 template into LaTeX code."""
 
-    def __init__(self, template_dir: Path, template_name: str):
-        self.env = Environment(
+    def __init__(self, template_dir: Path, template_name: str, env: Environment | None = None):
+        # A shared environment keeps compiled templates across renderers (see TemplateRegistry)
+        self.env = env if env is not None else self.create_environment(template_dir)
+        self.template_name = template_name
+
+    @classmethod
+    def create_environment(
+        cls, template_dir: Path, bytecode_cache: BytecodeCache | None = None
+    ) -> Environment:
+        """Builds a Jinja2 environment with LaTeX-friendly delimiters."""
+        env = Environment(
             loader=FileSystemLoader(str(template_dir)),
             block_start_string=r"\BLOCK{",
             block_end_string=r"}",
@@ -18,9 +27,10 @@ class LatexRenderer:
             comment_end_string=r"}",
             trim_blocks=True,
             lstrip_blocks=True,
+            bytecode_cache=bytecode_cache,
         )
-        self.env.filters["escape_latex"] = self.escape_latex
-        self.template_name = template_name
+        env.filters["escape_latex"] = cls.escape_latex
+        return env
 
     @staticmethod
     def escape_latex(text: str) -> str:
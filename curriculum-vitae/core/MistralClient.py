@@ -0,0 +1,154 @@
+"""App-lifetime async Mistral client shared by the import endpoints."""
+
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import httpx
+from mistralai import Mistral
+from mistralai.utils.retries import BackoffStrategy, RetryConfig
+
+MISTRAL_MODEL = os.environ.get("MISTRAL_MODEL", "mistral-small-latest")
+MISTRAL_MAX_CONCURRENCY = int(os.environ.get("MISTRAL_MAX_CONCURRENCY", "8"))
+MISTRAL_TIMEOUT_SECONDS = float(os.environ.get("MISTRAL_TIMEOUT_SECONDS", "120"))
+# Total time spent retrying 429/5xx responses and connection errors (0 disables retries)
+MISTRAL_RETRY_MAX_ELAPSED_SECONDS = float(os.environ.get("MISTRAL_RETRY_MAX_ELAPSED_SECONDS", "30"))
+
+
+class MistralClient:
+    """Mistral chat API over a pooled keep-alive HTTP connection, with bounded concurrency.
+
+    Each event loop gets its own SDK instance and ``httpx.AsyncClient`` (both
+    are loop-bound), reused for every call on that loop so TLS connections
+    to the API stay open between requests. At most ``max_concurrency`` calls
+    per loop are in flight; a stream holds its slot until it is exhausted.
+    Every call gets the same timeout and retry policy.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = MISTRAL_MODEL,
+        max_concurrency: int = MISTRAL_MAX_CONCURRENCY,
+        timeout: float = MISTRAL_TIMEOUT_SECONDS,
+        retry_max_elapsed: float = MISTRAL_RETRY_MAX_ELAPSED_SECONDS,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        # None: MISTRAL_API_KEY is read on every call, so a rotated key is picked up
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retry_max_elapsed = retry_max_elapsed
+        self.transport = transport
+
+        self._lock = threading.Lock()
+        self._clients: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, tuple[Mistral, httpx.AsyncClient, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+
+    async def complete(
+        self,
+        messages: list[dict[str, Any]],
+        on_usage: Callable[[Any], None] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """Run a chat completion and return the content of the first choice.
+
+        ``on_usage`` receives the response's token usage block.
+        """
+        sdk, semaphore = self._get_client()
+        async with semaphore:
+            response = await sdk.chat.complete_async(
+                model=self.model, messages=messages, **self._call_options(), **kwargs
+            )
+        if on_usage is not None and response.usage is not None:
+            on_usage(response.usage)
+        return response.choices[0].message.content
+
+    async def stream(
+        self,
+        messages: list[dict[str, Any]],
+        on_usage: Callable[[Any], None] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """Stream a chat completion, yielding the non-empty content deltas.
+
+        ``on_usage`` receives the token usage block sent with the last chunk.
+        """
+        sdk, semaphore = self._get_client()
+        async with semaphore:
+            events = await sdk.chat.stream_async(
+                model=self.model, messages=messages, **self._call_options(), **kwargs
+            )
+            async for event in events:
+                if on_usage is not None and event.data.usage is not None:
+                    on_usage(event.data.usage)
+                if not event.data.choices:
+                    continue
+                delta = event.data.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    async def aclose(self) -> None:
+        """Close the HTTP connections opened on the current event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.pop(loop, None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def _call_options(self) -> dict[str, Any]:
+        options: dict[str, Any] = {"timeout_ms": int(self.timeout * 1000)}
+        if self.retry_max_elapsed > 0:
+            options["retries"] = RetryConfig(
+                "backoff",
+                BackoffStrategy(
+                    initial_interval=500,
+                    max_interval=8000,
+                    exponent=2.0,
+                    max_elapsed_time=int(self.retry_max_elapsed * 1000),
+                ),
+                retry_connection_errors=True,
+            )
+        return options
+
+    def _resolve_api_key(self) -> str | None:
+        return self.api_key or os.environ.get("MISTRAL_API_KEY")
+
+    def _get_client(self) -> tuple[Mistral, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.get(loop)
+            if entry is None:
+                http_client = httpx.AsyncClient(
+                    transport=self.transport,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrency,
+                        max_keepalive_connections=self.max_concurrency,
+                    ),
+                )
+                sdk = Mistral(api_key=self._resolve_api_key, async_client=http_client)
+                entry = (sdk, http_client, asyncio.Semaphore(self.max_concurrency))
+                self._clients[loop] = entry
+            return entry[0], entry[2]
+
+
+_mistral_client: MistralClient | None = None
+_mistral_client_lock = threading.Lock()
+
+
+def get_mistral_client() -> MistralClient:
+    """Get or create the process-wide Mistral client."""
+    global _mistral_client
+    with _mistral_client_lock:
+        if _mistral_client is None:
+            _mistral_client = MistralClient()
+        return _mistral_client
@@ -0,0 +1,131 @@
+"""Page-count estimation from structured resume data, calibrated per template.
+
+A resume is reduced to a single "layout units" figure: its character count
+plus a fixed cost for every bullet, item and section (each one starts a new
+line or adds vertical space). Each template has a calibrated capacity, the
+number of units that fill exactly one page, so ``units / capacity`` is the
+estimated page count.
+
+Calibrations are produced from real latexmk output with
+``python benchmarks/calibrate_page_estimator.py``. Templates without a
+calibration are never estimated. None ships with the app: the API uses the
+estimator only once a calibration is generated and PAGE_ESTIMATOR_ENABLED is set.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Literal
+
+PAGE_ESTIMATOR_CALIBRATION = Path(
+    os.environ.get(
+        "PAGE_ESTIMATOR_CALIBRATION", str(Path(__file__).parent / "page_calibration.json")
+    )
+)
+
+# Layout cost of structural elements, in characters. Shared by all templates;
+# template differences (font size, margins, columns) are absorbed by the capacity.
+BULLET_WEIGHT = 40
+ITEM_WEIGHT = 80
+SECTION_WEIGHT = 120
+
+DEFAULT_MARGIN = 0.1
+
+Verdict = Literal["fits", "overflows"]
+
+
+def resume_features(resume: dict[str, Any]) -> dict[str, int]:
+    """Count characters, bullets, items and visible sections of a resume dict."""
+    features = {"chars": 0, "bullets": 0, "items": 0, "sections": 0}
+
+    def walk(value: Any) -> None:
+        if isinstance(value, str):
+            features["chars"] += len(value)
+        elif isinstance(value, dict):
+            for nested in value.values():
+                walk(nested)
+        elif isinstance(value, list):
+            for nested in value:
+                if isinstance(nested, str):
+                    features["bullets"] += 1
+                walk(nested)
+
+    walk(resume.get("personal", {}))
+    for section in resume.get("sections", []):
+        if not section.get("isVisible", True):
+            continue
+        items = section.get("items")
+        if not items:
+            continue
+        features["sections"] += 1
+        features["chars"] += len(section.get("title", ""))
+        if isinstance(items, list):
+            features["items"] += len(items)
+        walk(items)
+
+    return features
+
+
+def layout_units(resume: dict[str, Any]) -> float:
+    """Single size figure combining all resume features."""
+    features = resume_features(resume)
+    return (
+        features["chars"]
+        + BULLET_WEIGHT * features["bullets"]
+        + ITEM_WEIGHT * features["items"]
+        + SECTION_WEIGHT * features["sections"]
+    )
+
+
+class PageEstimator:
+    """Predicts page counts and flags confident one-page / overflow decisions."""
+
+    def __init__(self, calibration: dict[str, dict[str, float]] | None = None):
+        # template_id -> {"capacity": units per page, "margin": relative uncertainty}
+        self.calibration = calibration or {}
+
+    @classmethod
+    def from_file(cls, path: Path = PAGE_ESTIMATOR_CALIBRATION) -> "PageEstimator":
+        """Load calibrations, or an empty estimator if the file does not exist."""
+        try:
+            calibration = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls()
+        return cls(calibration.get("templates", {}))
+
+    def estimate_pages(self, template_id: str, resume: dict[str, Any]) -> float | None:
+        """Estimated page count, or None if the template is not calibrated."""
+        entry = self.calibration.get(template_id)
+        if not entry:
+            return None
+        return layout_units(resume) / entry["capacity"]
+
+    def classify(self, template_id: str, resume: dict[str, Any]) -> Verdict | None:
+        """Return a verdict only when the estimate is clear of the one-page boundary.
+
+        None means the template is not calibrated or the resume is too close to
+        the boundary to decide without compiling.
+        """
+        pages = self.estimate_pages(template_id, resume)
+        if pages is None:
+            return None
+        margin = self.calibration[template_id].get("margin", DEFAULT_MARGIN)
+        if pages <= 1 - margin:
+            return "fits"
+        if pages >= 1 + margin:
+            return "overflows"
+        return None
+
+
+_page_estimator: PageEstimator | None = None
+_page_estimator_lock = threading.Lock()
+
+
+def get_page_estimator() -> PageEstimator:
+    """Get or create the process-wide estimator from the calibration file."""
+    global _page_estimator
+    with _page_estimator_lock:
+        if _page_estimator is None:
+            _page_estimator = PageEstimator.from_file()
+        return _page_estimator
@@ -0,0 +1,180 @@
+"""Content-addressed cache of compiled PDFs, keyed on the rendered TeX source."""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import redis
+
+from core.PdfCompiler import CompiledPdf, CompileMetadata
+
+PDF_CACHE_MAX_BYTES = int(os.environ.get("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+PDF_CACHE_REDIS = os.environ.get("PDF_CACHE_REDIS", "false").lower() == "true"
+PDF_CACHE_REDIS_TTL_SECONDS = int(os.environ.get("PDF_CACHE_REDIS_TTL_SECONDS", "3600"))
+
+REDIS_KEY_PREFIX = "pdf_cache:"
+
+
+class PdfCache:
+    """Two-tier PDF cache: a size-bounded in-process LRU, then optionally Redis.
+
+    Compilation is deterministic for a given TeX source and template, so the
+    SHA-256 of both is enough to identify the resulting PDF. Redis is a
+    best-effort shared tier: any Redis error is treated as a miss.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = PDF_CACHE_MAX_BYTES,
+        redis_client: redis.Redis | None = None,
+        redis_ttl: int = PDF_CACHE_REDIS_TTL_SECONDS,
+    ):
+        self.max_bytes = max_bytes
+        self.redis_client = redis_client
+        self.redis_ttl = redis_ttl
+
+        self._entries: OrderedDict[str, CompiledPdf] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(tex_content: str, template_id: str | None = None) -> str:
+        """Content address of a compile job."""
+        digest = hashlib.sha256()
+        digest.update((template_id or "").encode())
+        digest.update(b"\0")
+        digest.update(tex_content.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CompiledPdf | None:
+        """Return the cached PDF for a key, checking memory then Redis."""
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return compiled
+
+        compiled = self._redis_get(key)
+        if compiled is not None:
+            self._store(key, compiled)
+            with self._lock:
+                self._redis_hits += 1
+            return compiled
+
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def put(self, key: str, compiled: CompiledPdf) -> None:
+        """Cache a compiled PDF in every tier."""
+        self._store(key, compiled)
+        self._redis_set(key, compiled)
+
+    async def get_async(self, key: str) -> CompiledPdf | None:
+        """``get`` without blocking the event loop on a Redis round trip."""
+        if self.redis_client is None:
+            return self.get(key)
+        return await asyncio.to_thread(self.get, key)
+
+    async def put_async(self, key: str, compiled: CompiledPdf) -> None:
+        """``put`` without blocking the event loop on a Redis round trip."""
+        if self.redis_client is None:
+            self.put(key, compiled)
+        else:
+            await asyncio.to_thread(self.put, key, compiled)
+
+    def clear(self) -> None:
+        """Drop every in-process entry and reset counters (Redis is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self._hits = self._redis_hits = self._misses = self._evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of cache counters for monitoring."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "redis_hits": self._redis_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+            }
+
+    def _store(self, key: str, compiled: CompiledPdf) -> None:
+        size = len(compiled.content)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous.content)
+            self._entries[key] = compiled
+            self._size += size
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted.content)
+                self._evictions += 1
+
+    def _redis_get(self, key: str) -> CompiledPdf | None:
+        if self.redis_client is None:
+            return None
+        try:
+            value = self.redis_client.get(REDIS_KEY_PREFIX + key)
+        except redis.RedisError as e:
+            print(f"⚠️ PDF cache Redis read failed: {e}")
+            return None
+        if value is None:
+            return None
+        # Stored as one JSON metadata line followed by the PDF bytes
+        header, _, content = value.partition(b"\n")
+        try:
+            metadata = CompileMetadata(**json.loads(header))
+        except (TypeError, ValueError):
+            return None
+        return CompiledPdf(content=content, metadata=metadata)
+
+    def _redis_set(self, key: str, compiled: CompiledPdf) -> None:
+        if self.redis_client is None:
+            return
+        header = json.dumps(dataclasses.asdict(compiled.metadata)).encode()
+        try:
+            self.redis_client.set(
+                REDIS_KEY_PREFIX + key, header + b"\n" + compiled.content, ex=self.redis_ttl
+            )
+        except redis.RedisError as e:
+            print(f"⚠️ PDF cache Redis write failed: {e}")
+
+
+_pdf_cache: PdfCache | None = None
+_pdf_cache_lock = threading.Lock()
+
+
+def get_pdf_cache() -> PdfCache:
+    """Get or create the process-wide PDF cache."""
+    global _pdf_cache
+    with _pdf_cache_lock:
+        if _pdf_cache is None:
+            redis_client = None
+            if PDF_CACHE_REDIS:
+                # Binary-safe client: the auth client decodes responses to str.
+                redis_client = redis.Redis.from_url(
+                    os.environ.get("REDIS_URL", "redis://localhost:6379"),
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+            _pdf_cache = PdfCache(redis_client=redis_client)
+        return _pdf_cache
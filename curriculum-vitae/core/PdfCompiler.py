@@ -1,15 +1,54 @@
+import contextlib
+import os
+import re
+import signal
 import subprocess
+import time
+from dataclasses import dataclass
 from pathlib import Path
 
+# pdfTeX's last log line, e.g. "Output written on main.pdf (1 page, 41235 bytes)."
+_OUTPUT_WRITTEN = re.compile(r"Output written on .*?\((\d+) pages?, (\d+) bytes\)\.", re.DOTALL)
+_OVERFULL_BOX = re.compile(r"^Overfull \\[hv]box", re.MULTILINE)
+
+
+class CompileTimeoutError(RuntimeError):
+    """Raised when a LaTeX compilation exceeds its timeout."""
+
+
+@dataclass(frozen=True)
+class CompileMetadata:
+    """What a compilation produced, read from the TeX log rather than the PDF.
+
+    ``page_count`` is None when the log has no "Output written on" line; the
+    caller then has to count the pages of the PDF itself.
+    """
+
+    page_count: int | None
+    overfull_boxes: int
+    elapsed_seconds: float
+    size_bytes: int
+
+
+@dataclass(frozen=True)
+class CompiledPdf:
+    """PDF bytes together with the metadata of the compilation that produced them."""
+
+    content: bytes
+    metadata: CompileMetadata
+
 
 class PdfCompiler:
     """Responsible for compiling LaTeX to PDF."""
 
-    def __init__(self, tex_file: Path):
+    def __init__(self, tex_file: Path, timeout: float | None = None, fmt_file: Path | None = None):
         self.tex_file = tex_file
+        self.timeout = timeout
+        # Optional precompiled format (see core.FormatCache) holding the static preamble
+        self.fmt_file = fmt_file
 
-    def compile(self, clean: bool = True) -> None:
-        """Compiles the TeX file using latexmk."""
+    def compile(self, clean: bool = True) -> CompileMetadata:
+        """Compiles the TeX file using latexmk and returns metadata about the output."""
         if not self.tex_file.exists():
             raise FileNotFoundError(f"TeX file not found for compilation: {self.tex_file}")
 
@@ -25,19 +64,70 @@ class PdfCompiler:
             "-outdir=" + str(self.tex_file.parent),
             str(self.tex_file),
         ]
+        if self.fmt_file is not None:
+            # pdflatex appends ".fmt" itself
+            cmd.insert(1, f"-pdflatex=pdflatex -fmt={self.fmt_file.with_suffix('')} %O %S")
 
         try:
-            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+            started = time.perf_counter()
+            self._run(cmd)
+            elapsed = time.perf_counter() - started
             print("✅ PDF generated successfully.")
 
+            # Read the log before it is cleaned up with the other auxiliary files
+            metadata = self._read_metadata(elapsed)
+
             if clean:
                 self._clean_auxiliary_files()
 
+            return metadata
+
         except subprocess.CalledProcessError as e:
             print("❌ Error during LaTeX compilation.")
             if e.stderr:
                 print(e.stderr.decode("utf-8", errors="ignore")[-500:])  # Last 500 chars
             raise RuntimeError("LaTeX compilation failed.") from e
+        except subprocess.TimeoutExpired as e:
+            print(f"❌ LaTeX compilation timed out after {self.timeout}s.")
+            raise CompileTimeoutError("LaTeX compilation timed out.") from e
+
+    def _run(self, cmd: list[str]) -> None:
+        """Runs latexmk, killing the whole TeX process tree if the timeout expires.
+
+        latexmk spawns pdflatex as a child: it is started in its own session so a
+        timeout can signal the process group instead of leaving pdflatex orphaned.
+        """
+        with subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, start_new_session=True
+        ) as process:
+            try:
+                _, stderr = process.communicate(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(process.pid, signal.SIGKILL)
+                process.communicate()
+                raise
+
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+
+    def _read_metadata(self, elapsed: float) -> CompileMetadata:
+        """Extracts page count and warnings from the TeX log."""
+        log_file = self.tex_file.with_suffix(".log")
+        pdf_file = self.tex_file.with_suffix(".pdf")
+
+        log = log_file.read_text(encoding="latin-1") if log_file.exists() else ""
+        size_bytes = pdf_file.stat().st_size if pdf_file.exists() else 0
+
+        # TeX hard-wraps log lines at 79 characters, so join them before matching
+        output = _OUTPUT_WRITTEN.search(log.replace("\n", ""))
+
+        return CompileMetadata(
+            page_count=int(output.group(1)) if output else None,
+            overfull_boxes=len(_OVERFULL_BOX.findall(log)),
+            elapsed_seconds=elapsed,
+            size_bytes=size_bytes,
+        )
 
     def _clean_auxiliary_files(self):
         """Removes auxiliary files generated by LaTeX."""
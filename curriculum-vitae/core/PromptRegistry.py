@@ -0,0 +1,159 @@
+"""Versioned LLM prompts, loaded once, and the provider prompt-cache usage they get."""
+
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROMPTS_FOLDER = Path(__file__).parent / "prompts"
+
+
+@dataclass(frozen=True)
+class Prompt:
+    """A system prompt plus the user message template the input is appended to.
+
+    Everything before ``{text}`` is identical on every call and comes first,
+    so providers that cache prompt prefixes can reuse it across requests.
+    """
+
+    name: str
+    version: int
+    system: str
+    user_template: str
+
+    @property
+    def key(self) -> str:
+        """``name@vN``, as shown in logs and stats."""
+        return f"{self.name}@v{self.version}"
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of the prompt content: changes whenever its wording does."""
+        digest = hashlib.sha256()
+        for part in (self.key, self.system, self.user_template):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()[:16]
+
+    def messages(self, text: str) -> list[dict[str, str]]:
+        """Chat messages for one input."""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user_template.format(text=text)},
+        ]
+
+
+def load_prompt(name: str, version: int, user_template: str) -> Prompt:
+    """Prompt whose system text is ``prompts/<name>.v<version>.txt``."""
+    path = PROMPTS_FOLDER / f"{name}.v{version}.txt"
+    system = path.read_text(encoding="utf-8").rstrip("\n")
+    return Prompt(name=name, version=version, system=system, user_template=user_template)
+
+
+# Read once at import: every request reuses the same strings
+CV_IMPORT_PROMPT = load_prompt(
+    "cv_import", 1, user_template="Voici le texte extrait du CV:\n\n{text}"
+)
+
+BUILTIN_PROMPTS = (CV_IMPORT_PROMPT,)
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Prompt tokens the provider served from its prompt cache, 0 when not reported."""
+    extra = getattr(usage, "additional_properties", None)
+    if extra is None:
+        extra = usage if isinstance(usage, dict) else {}
+
+    details = extra.get("prompt_tokens_details")
+    if isinstance(details, dict) and isinstance(details.get("cached_tokens"), int):
+        return details["cached_tokens"]
+    cached = extra.get("num_cached_tokens")
+    return cached if isinstance(cached, int) else 0
+
+
+class PromptRegistry:
+    """Prompts by name and version, with per-prompt provider cache statistics.
+
+    ``get(name)`` returns the latest version, so a prompt is changed by adding
+    a new version file rather than editing one that cached results (see
+    core.ImportCache) were produced with. ``record_usage`` takes the usage
+    block of a completion and logs how many prompt tokens the provider
+    served from its prefix cache.
+    """
+
+    def __init__(self, prompts: tuple[Prompt, ...] = BUILTIN_PROMPTS):
+        self._prompts: dict[str, dict[int, Prompt]] = {}
+        self._lock = threading.Lock()
+        self._usage: dict[str, dict[str, int]] = {}
+        for prompt in prompts:
+            self.register(prompt)
+
+    def register(self, prompt: Prompt) -> None:
+        """Add a prompt version; registering a version twice is an error."""
+        with self._lock:
+            versions = self._prompts.setdefault(prompt.name, {})
+            if prompt.version in versions:
+                raise ValueError(f"Prompt {prompt.key} is already registered")
+            versions[prompt.version] = prompt
+
+    def get(self, name: str, version: int | None = None) -> Prompt:
+        """A prompt version, the latest one by default."""
+        with self._lock:
+            versions = self._prompts.get(name)
+            if not versions:
+                raise KeyError(f"Unknown prompt '{name}'")
+            if version is None:
+                return versions[max(versions)]
+            if version not in versions:
+                raise KeyError(f"Unknown prompt version {name}@v{version}")
+            return versions[version]
+
+    def record_usage(self, prompt: Prompt, usage: Any) -> None:
+        """Account for one completion's token usage and log the prompt cache hit rate."""
+        prompt_tokens = getattr(usage, "prompt_tokens", None) or 0
+        cached = cached_prompt_tokens(usage)
+
+        with self._lock:
+            totals = self._usage.setdefault(
+                prompt.key, {"requests": 0, "prompt_tokens": 0, "cached_prompt_tokens": 0}
+            )
+            totals["requests"] += 1
+            totals["prompt_tokens"] += prompt_tokens
+            totals["cached_prompt_tokens"] += cached
+            requests = totals["requests"]
+            hit_rate = (
+                totals["cached_prompt_tokens"] / totals["prompt_tokens"]
+                if totals["prompt_tokens"]
+                else 0.0
+            )
+
+        logger.info(
+            "Prompt %s: %d/%d prompt tokens from the provider cache (%.1f%% over %d requests)",
+            prompt.key,
+            cached,
+            prompt_tokens,
+            hit_rate * 100,
+            requests,
+        )
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Token usage per prompt version for monitoring."""
+        with self._lock:
+            return {key: dict(totals) for key, totals in self._usage.items()}
+
+
+_prompt_registry: PromptRegistry | None = None
+_prompt_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Get or create the process-wide prompt registry."""
+    global _prompt_registry
+    with _prompt_registry_lock:
+        if _prompt_registry is None:
+            _prompt_registry = PromptRegistry()
+        return _prompt_registry
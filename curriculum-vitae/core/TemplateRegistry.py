@@ -0,0 +1,83 @@
+"""Process-wide registry of compiled LaTeX templates."""
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from jinja2 import FileSystemBytecodeCache
+
+from core.LatexRenderer import LatexRenderer
+
+TEMPLATES_FOLDER = Path(__file__).parent.parent / "templates"
+# Optional on-disk cache of compiled template bytecode, reused across restarts
+JINJA_BYTECODE_CACHE_DIR = os.environ.get("JINJA_BYTECODE_CACHE_DIR", "")
+
+
+class TemplateRegistry:
+    """Renders templates straight from the templates folder with one shared environment.
+
+    Jinja keeps every compiled template in the environment's cache, so a template
+    is parsed once per process (and re-parsed only if its file changes) instead
+    of once per request.
+    """
+
+    def __init__(
+        self,
+        templates_folder: Path = TEMPLATES_FOLDER,
+        bytecode_cache_dir: str = JINJA_BYTECODE_CACHE_DIR,
+    ):
+        self.templates_folder = templates_folder
+
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            Path(bytecode_cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+        self.env = LatexRenderer.create_environment(templates_folder, bytecode_cache)
+        self._renderers: dict[str, LatexRenderer] = {}
+        self._lock = threading.Lock()
+
+    def template_ids(self) -> list[str]:
+        """Ids of every template in the templates folder."""
+        return sorted(template.stem for template in self.templates_folder.glob("*.tex"))
+
+    def has(self, template_id: str) -> bool:
+        """Whether a template with this id exists."""
+        # Reject anything that is not a bare file name (no path traversal)
+        if not template_id or Path(template_id).name != template_id:
+            return False
+        return (self.templates_folder / f"{template_id}.tex").is_file()
+
+    def preload(self) -> int:
+        """Compile every template up front. Returns the number of templates loaded."""
+        template_ids = self.template_ids()
+        for template_id in template_ids:
+            self.env.get_template(f"{template_id}.tex")
+        return len(template_ids)
+
+    def get_renderer(self, template_id: str) -> LatexRenderer:
+        """Renderer bound to the shared environment."""
+        with self._lock:
+            renderer = self._renderers.get(template_id)
+            if renderer is None:
+                renderer = LatexRenderer(self.templates_folder, f"{template_id}.tex", env=self.env)
+                self._renderers[template_id] = renderer
+            return renderer
+
+    def render(self, template_id: str, data: dict[str, Any]) -> str:
+        """Render a template to LaTeX source."""
+        return self.get_renderer(template_id).render(data)
+
+
+_template_registry: TemplateRegistry | None = None
+_template_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Get or create the process-wide template registry."""
+    global _template_registry
+    with _template_registry_lock:
+        if _template_registry is None:
+            _template_registry = TemplateRegistry()
+        return _template_registry
@@ -0,0 +1,315 @@
+"""Pool of sandboxed worker processes extracting text from uploaded PDFs."""
+
+import asyncio
+import contextlib
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from multiprocessing.connection import Connection
+from pathlib import Path
+from typing import Any
+
+from core.TextExtractor import (
+    PDF_TEXT_EXTRACTOR,
+    ExtractionError,
+    TextTooLongError,
+    TooManyPagesError,
+    extract_text,
+    get_extractor,
+)
+
+PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", "2"))
+PDF_EXTRACT_TIMEOUT_SECONDS = float(os.environ.get("PDF_EXTRACT_TIMEOUT_SECONDS", "15"))
+PDF_EXTRACT_MAX_MEMORY_MB = int(os.environ.get("PDF_EXTRACT_MAX_MEMORY_MB", "1024"))
+PDF_EXTRACT_MAX_JOBS_PER_WORKER = int(os.environ.get("PDF_EXTRACT_MAX_JOBS_PER_WORKER", "200"))
+
+
+class ExtractionTimeoutError(ExtractionError):
+    """Raised when an extraction exceeds its wall-clock budget."""
+
+
+class ExtractionMemoryError(ExtractionError):
+    """Raised when an extraction exceeds its memory budget."""
+
+
+def _worker_main(conn: Connection, max_memory_bytes: int) -> None:
+    """Child process loop: run extraction jobs received over ``conn`` until told to stop."""
+    # Load the extraction code up front: the memory limit is meant for the jobs
+    import pdfminer.converter  # noqa: F401
+    import pdfplumber  # noqa: F401
+
+    if max_memory_bytes:
+        import resource
+
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (max_memory_bytes, max_memory_bytes))
+        except (ValueError, OSError) as e:
+            print(f"⚠️ Could not limit PDF extraction memory: {e}")
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+
+        try:
+            conn.send(("ok", extract_text(*job)))
+        except TooManyPagesError as e:
+            conn.send(("pages", e.page_count))
+        except TextTooLongError as e:
+            conn.send(("length", e.length))
+        except Exception as e:
+            if _caused_by_memory_error(e):
+                # The heap may be fragmented past the limit: let the pool start a fresh process
+                conn.send(("memory", None))
+                return
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _caused_by_memory_error(error: BaseException | None) -> bool:
+    """Whether ``error`` is, or wraps, a MemoryError (pdfplumber re-raises its own type)."""
+    while error is not None:
+        if isinstance(error, MemoryError):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class _WorkerProcess:
+    """One extraction child process and the pipe used to drive it."""
+
+    def __init__(self, context: Any, max_memory_bytes: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, max_memory_bytes),
+            name="pdf-extract",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def run(self, job: tuple, timeout: float | None) -> tuple[str, Any]:
+        self.conn.send(job)
+        if not self.conn.poll(timeout):
+            raise ExtractionTimeoutError(f"PDF text extraction timed out after {timeout}s")
+        try:
+            return self.conn.recv()
+        except EOFError:
+            # Killed by the kernel (e.g. out of memory) before it could answer
+            raise ExtractionMemoryError("PDF extraction process died") from None
+
+    def stop(self) -> None:
+        with contextlib.suppress(OSError):
+            self.conn.send(None)
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class TextExtractionPool:
+    """Runs PDF text extraction in long-lived child processes with hard limits.
+
+    pdfminer is pure Python: a hostile but valid PDF (huge content streams,
+    deeply nested objects) can keep it busy for seconds and hold the GIL the
+    whole time. Each job therefore runs in a separate process, capped in
+    address space (``max_memory_mb``) and wall-clock time (``job_timeout``).
+    A process that overruns either budget is killed and replaced. Like
+    CompilePool, one thread per worker feeds jobs from a shared queue;
+    ``stats()`` exposes the queue depth used to size the pool. The backend
+    is chosen by name (``extractor``, see core.TextExtractor).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PDF_EXTRACT_WORKERS,
+        job_timeout: float | None = PDF_EXTRACT_TIMEOUT_SECONDS,
+        max_memory_mb: int = PDF_EXTRACT_MAX_MEMORY_MB,
+        max_jobs_per_worker: int | None = PDF_EXTRACT_MAX_JOBS_PER_WORKER,
+        extractor: str = PDF_TEXT_EXTRACTOR,
+    ):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        get_extractor(extractor)  # Fail fast on an unknown backend
+
+        self.max_workers = max_workers
+        self.job_timeout = job_timeout
+        self.max_memory_mb = max_memory_mb
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.extractor = extractor
+        # Never fork the (multi-threaded) server process
+        self._context = multiprocessing.get_context("spawn")
+
+        self._queue: queue.Queue[tuple[Future, tuple] | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads: set[threading.Thread] = set()
+        self._shutdown = False
+        self._busy = 0
+        self._jobs_completed = 0
+        self._timeouts = 0
+        self._memory_errors = 0
+        self._processes_recycled = 0
+
+        for _ in range(max_workers):
+            self._start_thread()
+
+    def submit(
+        self, pdf_path: str | Path, max_pages: int, max_chars: int, extractor: str | None = None
+    ) -> Future:
+        """Queue an extraction and return a future resolving to the text.
+
+        ``extractor`` overrides the pool's backend for this job.
+        """
+        extractor = extractor or self.extractor
+        get_extractor(extractor)
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Text extraction pool is shut down")
+            self._queue.put((future, (str(pdf_path), max_pages, max_chars, extractor)))
+        return future
+
+    def extract(
+        self, pdf_path: str | Path, max_pages: int, max_chars: int, extractor: str | None = None
+    ) -> str:
+        """Extract the text of a PDF and wait for the result."""
+        return self.submit(pdf_path, max_pages, max_chars, extractor).result()
+
+    async def extract_async(
+        self, pdf_path: str | Path, max_pages: int, max_chars: int, extractor: str | None = None
+    ) -> str:
+        """Extract without blocking the event loop.
+
+        Cancelling the awaiting coroutine before a worker picks the job up
+        removes it from the queue without running it.
+        """
+        return await asyncio.wrap_future(self.submit(pdf_path, max_pages, max_chars, extractor))
+
+    def stats(self) -> dict[str, int]:
+        """Snapshot of pool counters for monitoring."""
+        with self._lock:
+            return {
+                "workers": len(self._threads),
+                "busy": self._busy,
+                "queued": self._queue.qsize(),
+                "jobs_completed": self._jobs_completed,
+                "timeouts": self._timeouts,
+                "memory_errors": self._memory_errors,
+                "processes_recycled": self._processes_recycled,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and stop the worker processes once the queue is drained."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            threads = list(self._threads)
+            for _ in threads:
+                self._queue.put(None)
+
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _start_thread(self) -> None:
+        thread = threading.Thread(target=self._thread_loop, name="pdf-extract", daemon=True)
+        self._threads.add(thread)
+        thread.start()
+
+    def _new_process(self) -> _WorkerProcess:
+        return _WorkerProcess(self._context, self.max_memory_mb * 1024 * 1024)
+
+    def _thread_loop(self) -> None:
+        worker = self._new_process()
+        jobs_done = 0
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+
+                future, job = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                with self._lock:
+                    self._busy += 1
+                result: str | None = None
+                error: BaseException | None = None
+                try:
+                    result = self._run(worker, job)
+                except BaseException as e:
+                    error = e
+
+                jobs_done += 1
+                recycle = isinstance(error, ExtractionTimeoutError | ExtractionMemoryError) or (
+                    bool(self.max_jobs_per_worker) and jobs_done >= self.max_jobs_per_worker
+                )
+                with self._lock:
+                    self._busy -= 1
+                    self._jobs_completed += 1
+                    self._timeouts += isinstance(error, ExtractionTimeoutError)
+                    self._memory_errors += isinstance(error, ExtractionMemoryError)
+                    if recycle:
+                        self._processes_recycled += 1
+
+                if recycle:
+                    # Killed mid-job or past its job budget: start from a clean process
+                    worker.kill()
+                    worker = self._new_process()
+                    jobs_done = 0
+
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+        finally:
+            worker.stop()
+            with self._lock:
+                self._threads.discard(threading.current_thread())
+
+    def _run(self, worker: _WorkerProcess, job: tuple) -> str:
+        status, value = worker.run(job, self.job_timeout)
+        if status == "ok":
+            return value
+        if status == "pages":
+            raise TooManyPagesError(value)
+        if status == "length":
+            raise TextTooLongError(value)
+        if status == "memory":
+            raise ExtractionMemoryError(
+                f"PDF text extraction exceeded {self.max_memory_mb} MB of memory"
+            )
+        raise ExtractionError(value)
+
+
+_text_extraction_pool: TextExtractionPool | None = None
+_text_extraction_pool_lock = threading.Lock()
+
+
+def get_text_extraction_pool() -> TextExtractionPool:
+    """Get or create the process-wide text extraction pool."""
+    global _text_extraction_pool
+    with _text_extraction_pool_lock:
+        if _text_extraction_pool is None:
+            _text_extraction_pool = TextExtractionPool()
+        return _text_extraction_pool
+
+
+def shutdown_text_extraction_pool() -> None:
+    """Shut down the process-wide extraction pool if started; a later get creates a new one."""
+    global _text_extraction_pool
+    with _text_extraction_pool_lock:
+        pool, _text_extraction_pool = _text_extraction_pool, None
+    if pool is not None:
+        pool.shutdown()
@@ -0,0 +1,109 @@
+"""Interchangeable backends turning an uploaded PDF into plain text for the CV import."""
+
+import os
+from collections.abc import Iterator
+from io import StringIO
+from pathlib import Path
+
+# Backend used by the import endpoints (see EXTRACTORS)
+PDF_TEXT_EXTRACTOR = os.environ.get("PDF_TEXT_EXTRACTOR", "pdfplumber")
+
+
+class ExtractionError(RuntimeError):
+    """Raised when text cannot be extracted from a PDF."""
+
+
+class TooManyPagesError(ExtractionError):
+    """Raised when a PDF has more pages than allowed."""
+
+    def __init__(self, page_count: int):
+        super().__init__(f"PDF has too many pages ({page_count})")
+        self.page_count = page_count
+
+
+class TextTooLongError(ExtractionError):
+    """Raised as soon as the extracted text exceeds the allowed length."""
+
+    def __init__(self, length: int):
+        super().__init__(f"Extracted text is too long ({length} characters)")
+        self.length = length
+
+
+class PdfplumberExtractor:
+    """pdfplumber's layout-aware text: its own character clustering on top of pdfminer."""
+
+    name = "pdfplumber"
+
+    def iter_pages(self, pdf_path: str | Path, max_pages: int) -> Iterator[str]:
+        import pdfplumber
+
+        with pdfplumber.open(pdf_path) as pdf:
+            if len(pdf.pages) > max_pages:
+                raise TooManyPagesError(len(pdf.pages))
+            for page in pdf.pages:
+                yield page.extract_text() or ""
+
+
+class PdfminerExtractor:
+    """pdfminer alone, grouping characters into lines without ordering text boxes.
+
+    Skips pdfplumber's per-character objects and clustering and pdfminer's
+    box-ordering pass, the costly parts of layout analysis. Lines keep their
+    words; columns come out in content-stream order, which the LLM copes with.
+    """
+
+    name = "pdfminer"
+
+    def iter_pages(self, pdf_path: str | Path, max_pages: int) -> Iterator[str]:
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        with open(pdf_path, "rb") as fp:
+            pages = list(PDFPage.create_pages(PDFDocument(PDFParser(fp))))
+            if len(pages) > max_pages:
+                raise TooManyPagesError(len(pages))
+
+            resources = PDFResourceManager(caching=True)
+            laparams = LAParams(boxes_flow=None)
+            for page in pages:
+                output = StringIO()
+                device = TextConverter(resources, output, laparams=laparams)
+                try:
+                    PDFPageInterpreter(resources, device).process_page(page)
+                finally:
+                    device.close()
+                yield output.getvalue().replace("\f", "").strip()
+
+
+EXTRACTORS = {extractor.name: extractor for extractor in (PdfplumberExtractor, PdfminerExtractor)}
+
+
+def get_extractor(name: str = PDF_TEXT_EXTRACTOR) -> PdfplumberExtractor | PdfminerExtractor:
+    """Extractor registered under ``name``."""
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown PDF text extractor '{name}' (available: {', '.join(sorted(EXTRACTORS))})"
+        ) from None
+
+
+def extract_text(
+    pdf_path: str | Path, max_pages: int, max_chars: int, extractor: str = PDF_TEXT_EXTRACTOR
+) -> str:
+    """Extract the text of every page, stopping at the first page over ``max_chars``."""
+    text_parts: list[str] = []
+    length = 0
+
+    for page_text in get_extractor(extractor).iter_pages(pdf_path, max_pages):
+        page_text += "\n"
+        text_parts.append(page_text)
+        length += len(page_text)
+        if length > max_chars:
+            raise TextTooLongError(length)
+
+    return "".join(text_parts)
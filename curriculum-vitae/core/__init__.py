@@ -1,7 +1,15 @@
+from .CompilePool import CompilePool
 from .DataManager import DataManager
 from .LatexRenderer import LatexRenderer
 from .PdfCompiler import PdfCompiler
 from .ResumeBuilder import ResumeBuilder
 from .ResumeConfig import ResumeConfig
 
-__all__ = ["DataManager", "LatexRenderer", "PdfCompiler", "ResumeBuilder", "ResumeConfig"]
+__all__ = [
+    "CompilePool",
+    "DataManager",
+    "LatexRenderer",
+    "PdfCompiler",
+    "ResumeBuilder",
+    "ResumeConfig",
+]
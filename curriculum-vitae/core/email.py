@@ -4,6 +4,7 @@
 
 import logging
 import os
+from typing import Any
 
 import httpx
 
@@ -15,15 +16,8 @@ EMAIL_FROM = os.environ.get("EMAIL_FROM", "noreply@sivee.pro")
 FRONTEND_URL = os.environ.get("FRONTEND_URL", "https://sivee.pro")
 
 
-def send_email(to: str, subject: str, html_body: str) -> None:
-    """Send an email via ZeptoMail transactional API.
-
-    If the API key is not configured, logs a warning and returns silently.
-    """
-    if not ZEPTOMAIL_API_KEY:
-        logger.warning("ZEPTOMAIL_API_KEY not configured — skipping email to %s", to)
-        return
-
+def build_request(to: str, subject: str, html_body: str) -> tuple[dict[str, Any], dict[str, str]]:
+    """JSON payload and headers of a ZeptoMail send request."""
     payload = {
         "from": {"address": EMAIL_FROM},
         "to": [{"email_address": {"address": to}}],
@@ -35,7 +29,16 @@ def send_email(to: str, subject: str, html_body: str) -> None:
         "content-type": "application/json",
         "authorization": ZEPTOMAIL_API_KEY,
     }
+    return payload, headers
+
 
+def deliver_email(to: str, subject: str, html_body: str) -> None:
+    """Send an email right away, blocking until ZeptoMail answers.
+
+    Failures are logged, never raised. Used when the outbox is disabled or
+    unreachable.
+    """
+    payload, headers = build_request(to, subject, html_body)
     try:
         response = httpx.post(ZEPTOMAIL_API_URL, json=payload, headers=headers, timeout=10)
         response.raise_for_status()
@@ -44,6 +47,25 @@ def send_email(to: str, subject: str, html_body: str) -> None:
         logger.exception("Failed to send email to %s", to)
 
 
+def send_email(to: str, subject: str, html_body: str) -> None:
+    """Send an email via ZeptoMail transactional API.
+
+    The message is queued in the outbox (core.EmailOutbox) and delivered by
+    its background task; without Redis, or with EMAIL_OUTBOX_ENABLED=false,
+    it is sent immediately. If the API key is not configured, logs a warning
+    and returns silently.
+    """
+    if not ZEPTOMAIL_API_KEY:
+        logger.warning("ZEPTOMAIL_API_KEY not configured — skipping email to %s", to)
+        return
+
+    from core.EmailOutbox import EMAIL_OUTBOX_ENABLED, get_email_outbox
+
+    if EMAIL_OUTBOX_ENABLED and get_email_outbox().enqueue(to, subject, html_body):
+        return
+    deliver_email(to, subject, html_body)
+
+
 def send_welcome_email(email: str) -> None:
     """Send a welcome email to a newly registered user."""
     subject = "Bienvenue sur Sivee.pro !"
@@ -33,3 +33,17 @@ def build_content_disposition(
     quoted = safe_name.replace("\\", "\\\\").replace('"', '\\"')
     encoded = quote(safe_name, safe="")
     return f'{disposition}; filename="{quoted}"; filename*=UTF-8\'\'{encoded}'
+
+
+def etag_matches(header: str, etag: str, *, weak: bool = False) -> bool:
+    """Whether an If-Match / If-None-Match header value lists ``etag`` (or is "*").
+
+    If-None-Match uses weak comparison (``W/`` prefixes ignored), If-Match
+    strong comparison, where a weak tag never matches (RFC 9110 §8.8.3.2).
+    """
+    tags = [tag.strip() for tag in header.split(",") if tag.strip()]
+    if "*" in tags:
+        return True
+    if weak:
+        return etag.removeprefix("W/") in {tag.removeprefix("W/") for tag in tags}
+    return not etag.startswith("W/") and etag in tags
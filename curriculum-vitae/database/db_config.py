@@ -1,16 +1,222 @@
 """Database configuration and session management."""
 
 import os
-from collections.abc import Generator
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, Generator
+from typing import Any
 
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+    QueuePool,
+)
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
+# Connection pool of each app worker (gunicorn runs WORKERS of them: keep
+# WORKERS * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the server's max_connections)
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+# How long a request waits for a free connection before failing
+DB_POOL_TIMEOUT_SECONDS = float(os.environ.get("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Connections older than this are replaced on checkout (-1 keeps them forever)
+DB_POOL_RECYCLE_SECONDS = int(os.environ.get("DB_POOL_RECYCLE_SECONDS", "1800"))
+# Connections opened at startup so the first requests do not pay for them
+DB_POOL_WARMUP = int(os.environ.get("DB_POOL_WARMUP", "2"))
+# Liveness check on checkout: "always", "never", or "idle" to ping only
+# connections unused for more than DB_POOL_PING_IDLE_SECONDS
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "idle").lower()
+DB_POOL_PING_IDLE_SECONDS = float(os.environ.get("DB_POOL_PING_IDLE_SECONDS", "30"))
+# PostgreSQL statement_timeout of every connection (0 disables)
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get("DB_STATEMENT_TIMEOUT_MS", "0"))
+
+PRE_PING_MODES = ("always", "idle", "never")
+# asyncio drivers used by the request path, per database backend
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+# Synchronous engine: Alembic, scripts and tests
 engine: Engine | None = None
 SessionLocal: sessionmaker[Session] | None = None
+# asyncio engine: request handlers (get_async_db)
+async_engine: AsyncEngine | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+
+class PoolMetrics:
+    """Checkout wait times and connection counts of the engine's pool.
+
+    Wait times cover the whole checkout (queueing for a free connection,
+    opening a new one, the liveness ping) and are summarized over the last
+    ``window`` checkouts.
+    """
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=window)
+        self._counters = {
+            "checkouts": 0,
+            "in_use": 0,
+            "connections_opened": 0,
+            "timeouts": 0,
+            "pings": 0,
+            "ping_failures": 0,
+        }
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+
+    def count(self, counter: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counters[counter] += delta
+
+    def reset(self) -> None:
+        with self._lock:
+            self._waits.clear()
+            for counter in self._counters:
+                self._counters[counter] = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of pool counters and checkout wait percentiles for monitoring."""
+        with self._lock:
+            waits = sorted(self._waits)
+            stats: dict[str, Any] = dict(self._counters)
+        if waits:
+            stats["checkout_wait_ms"] = {
+                "p50": round(waits[len(waits) // 2] * 1000, 3),
+                "p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 3),
+                "max": round(waits[-1] * 1000, 3),
+                "mean": round(statistics.fmean(waits) * 1000, 3),
+            }
+        else:
+            stats["checkout_wait_ms"] = None
+        return stats
+
+
+_pool_metrics = PoolMetrics()
+
+
+def get_pool_metrics() -> PoolMetrics:
+    """Metrics of the process-wide engine's connection pool."""
+    return _pool_metrics
+
+
+class _CheckoutTimer:
+    """Pool mixin recording how long each checkout takes."""
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            _pool_metrics.count("timeouts")
+            raise
+        finally:
+            _pool_metrics.record_wait(time.perf_counter() - started)
+
+
+class MeteredQueuePool(_CheckoutTimer, QueuePool):
+    """QueuePool of the synchronous engine, with checkout timing."""
+
+
+class MeteredAsyncAdaptedQueuePool(_CheckoutTimer, AsyncAdaptedQueuePool):
+    """Pool of the asyncio engine, with checkout timing."""
+
+
+def _ping(dbapi_connection: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("SELECT 1")
+    finally:
+        cursor.close()
+
+
+def _install_pool_events(db_engine: Engine, pre_ping: str, idle_seconds: float) -> None:
+    """Count connections in use and, in "idle" mode, ping connections left unused too long."""
+
+    @event.listens_for(db_engine, "connect")
+    def _on_connect(_dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        _pool_metrics.count("connections_opened")
+        record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(db_engine, "checkout")
+    def _on_checkout(dbapi_connection: Any, record: ConnectionPoolEntry, _proxy: Any) -> None:
+        if pre_ping == "idle":
+            idle = time.monotonic() - record.info.get("checked_in_at", 0.0)
+            if idle > idle_seconds:
+                _pool_metrics.count("pings")
+                try:
+                    _ping(dbapi_connection)
+                except Exception as e:
+                    # The pool discards this connection and retries with a new one
+                    _pool_metrics.count("ping_failures")
+                    raise exc.DisconnectionError() from e
+        _pool_metrics.count("checkouts")
+        _pool_metrics.count("in_use")
+
+    @event.listens_for(db_engine, "checkin")
+    def _on_checkin(_dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        _pool_metrics.count("in_use", -1)
+        record.info["checked_in_at"] = time.monotonic()
+
+
+def _engine_options(url: str, asyncio: bool = False) -> dict[str, Any]:
+    """Engine arguments for ``url``; SQLite keeps SQLAlchemy's own pool choice."""
+    if DB_POOL_PRE_PING not in PRE_PING_MODES:
+        raise ValueError(
+            f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_MODES)}, got '{DB_POOL_PRE_PING}'"
+        )
+    options: dict[str, Any] = {"pool_pre_ping": DB_POOL_PRE_PING == "always"}
+
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        return options
+
+    options.update(
+        poolclass=MeteredAsyncAdaptedQueuePool if asyncio else MeteredQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        # Reuse the most recently returned connection: it skips the idle ping
+        pool_use_lifo=True,
+    )
+    if backend == "postgresql" and DB_STATEMENT_TIMEOUT_MS > 0:
+        if asyncio:
+            # asyncpg takes server settings directly rather than a libpq options string
+            settings = {"statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)}
+            options["connect_args"] = {"server_settings": settings}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def async_database_url(url: str) -> str:
+    """``url`` with its driver swapped for the backend's asyncio driver (see ASYNC_DRIVERS)."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No asyncio driver configured for '{backend}' databases")
+    parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    # libpq's sslmode is spelled ssl by asyncpg
+    if backend == "postgresql" and "sslmode" in parsed.query:
+        query = dict(parsed.query)
+        query["ssl"] = query.pop("sslmode")
+        parsed = parsed.set(query=query)
+    return parsed.render_as_string(hide_password=False)
 
 
 def get_engine() -> Engine:
@@ -19,10 +225,90 @@ def get_engine() -> Engine:
     if engine is None:
         if DATABASE_URL is None:
             raise ValueError("DATABASE_URL environment variable is not set")
-        engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+        engine = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+        _install_pool_events(engine, DB_POOL_PRE_PING, DB_POOL_PING_IDLE_SECONDS)
     return engine
 
 
+def get_async_engine() -> AsyncEngine:
+    """Get or create the asyncio engine, on the same database and pool settings."""
+    global async_engine
+    if async_engine is None:
+        if DATABASE_URL is None:
+            raise ValueError("DATABASE_URL environment variable is not set")
+        async_engine = create_async_engine(
+            async_database_url(DATABASE_URL), **_engine_options(DATABASE_URL, asyncio=True)
+        )
+        _install_pool_events(async_engine.sync_engine, DB_POOL_PRE_PING, DB_POOL_PING_IDLE_SECONDS)
+    return async_engine
+
+
+def warm_up_pool(connections: int = DB_POOL_WARMUP) -> int:
+    """Open up to ``connections`` pooled connections ahead of the first requests.
+
+    Returns how many were opened; failures are reported, not raised, so the
+    app still starts while the database is unreachable.
+    """
+    if connections <= 0 or DATABASE_URL is None:
+        return 0
+    db_engine = get_engine()
+    # SQLite's pools hold one connection per thread: nothing to warm up
+    if not isinstance(db_engine.pool, QueuePool):
+        return 0
+    connections = min(connections, db_engine.pool.size())
+
+    opened = []
+    try:
+        # Hold them all at once, otherwise the pool hands back the same connection
+        for _ in range(connections):
+            opened.append(db_engine.connect())
+    except Exception as e:
+        print(f"⚠️ Database pool warmup stopped after {len(opened)} connection(s): {e}")
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+async def warm_up_async_pool(connections: int = DB_POOL_WARMUP) -> int:
+    """``warm_up_pool`` for the asyncio engine used by request handlers."""
+    if connections <= 0 or DATABASE_URL is None:
+        return 0
+    db_engine = get_async_engine()
+    if not isinstance(db_engine.pool, QueuePool):
+        return 0
+    connections = min(connections, db_engine.pool.size())
+
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(await db_engine.connect())
+    except Exception as e:
+        print(f"⚠️ Database pool warmup stopped after {len(opened)} connection(s): {e}")
+    finally:
+        for connection in opened:
+            await connection.close()
+    return len(opened)
+
+
+def pool_stats() -> dict[str, Any]:
+    """Checkout metrics plus the configuration and occupancy of each engine's pool."""
+    stats = get_pool_metrics().stats()
+    engines = {
+        "sync": engine,
+        "async": async_engine.sync_engine if async_engine is not None else None,
+    }
+    for name, db_engine in engines.items():
+        if db_engine is not None and isinstance(db_engine.pool, QueuePool):
+            stats[name] = {
+                "pool_size": db_engine.pool.size(),
+                "max_overflow": DB_MAX_OVERFLOW,
+                "checked_out": db_engine.pool.checkedout(),
+                "idle": db_engine.pool.checkedin(),
+            }
+    return stats
+
+
 def get_session_local() -> sessionmaker[Session]:
     """Get or create the session factory."""
     global SessionLocal
@@ -41,6 +327,26 @@ def get_db() -> Generator[Session]:
         db.close()
 
 
+def get_async_session_local() -> async_sessionmaker[AsyncSession]:
+    """Get or create the asyncio session factory.
+
+    Objects stay loaded after commit: an expired attribute would need an
+    implicit query, which AsyncSession cannot run on attribute access.
+    """
+    global AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        AsyncSessionLocal = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return AsyncSessionLocal
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession]:
+    """Dependency for FastAPI to get an asyncio database session."""
+    async with get_async_session_local()() as db:
+        yield db
+
+
 def check_db_connection() -> bool:
     """Check if the database connection is working.
 
@@ -54,3 +360,13 @@ def check_db_connection() -> bool:
         return True
     except Exception:
         return False
+
+
+async def check_async_db_connection() -> bool:
+    """``check_db_connection`` through the asyncio engine."""
+    try:
+        async with get_async_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return True
+    except Exception:
+        return False
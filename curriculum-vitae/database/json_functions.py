@@ -0,0 +1,174 @@
+"""SQL functions on JSON columns, rendered for PostgreSQL (JSONB) and SQLite (tests).
+
+They let listings read a few facts about a document, and patches replace values in
+it, without loading the document into Python.
+"""
+
+import json
+import re
+from typing import Any
+
+from sqlalchemy import Boolean, Integer, literal
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class json_array_length(FunctionElement[int]):
+    """Length of the array under a top-level ``key``; NULL when it is not an array."""
+
+    type = Integer()
+    inherit_cache = True
+
+    def __init__(self, column: Any, key: str):
+        # A bound parameter, not an attribute: cached compiled statements still get each key
+        super().__init__(column, literal(key))
+
+
+class json_size(FunctionElement[int]):
+    """Approximate stored size of a JSON value in bytes (compressed size on PostgreSQL)."""
+
+    type = Integer()
+    inherit_cache = True
+
+
+class json_replace(FunctionElement[Any]):
+    """``column`` with the value at a JSON Pointer's tokens replaced by ``value_json``.
+
+    The document is unchanged when the path does not exist: guard the update
+    with ``json_path_exists``. Tokens must pass ``sql_path_supported``.
+    """
+
+    inherit_cache = True
+
+    def __init__(self, column: Any, tokens: list[str], value_json: str):
+        super().__init__(column, *_path_literals(tokens), literal(value_json))
+
+
+class json_path_exists(FunctionElement[bool]):
+    """Whether a value (JSON null included) exists at a JSON Pointer's tokens."""
+
+    type = Boolean()
+    inherit_cache = True
+
+    def __init__(self, column: Any, tokens: list[str]):
+        super().__init__(column, *_path_literals(tokens))
+
+
+class json_text_length(FunctionElement[int]):
+    """Size of a JSON value in the database, measured like ``json_text_size``.
+
+    On SQLite the count matches only if strings are stored unescaped
+    (``ensure_ascii=False``), as PostgreSQL's jsonb does.
+    """
+
+    type = Integer()
+    inherit_cache = True
+
+
+def json_text_size(value: Any) -> int:
+    """UTF-8 size of a JSON value printed as PostgreSQL prints jsonb.
+
+    Separators are ", " and ": " and non-ASCII characters are not escaped.
+    Resume size limits use this measure, in Python and (``json_text_length``) in SQL.
+    """
+    return len(json.dumps(value, ensure_ascii=False).encode())
+
+
+# Tokens both renderings spell without quoting: identifiers and array indexes
+_SQL_PATH_TOKEN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|0|[1-9][0-9]*")
+
+
+def sql_path_supported(tokens: list[str]) -> bool:
+    """Whether ``json_replace`` and ``json_path_exists`` can address these tokens.
+
+    Numeric tokens are array indexes on SQLite; PostgreSQL resolves them
+    against the actual container, like JSON Pointer does.
+    """
+    return bool(tokens) and all(_SQL_PATH_TOKEN.fullmatch(token) for token in tokens)
+
+
+def _path_literals(tokens: list[str]) -> tuple[Any, Any]:
+    """The path as a PostgreSQL text[] and as a SQLite JSON path, both bound parameters."""
+    postgresql_path = "{" + ",".join(tokens) + "}"
+    sqlite_path = "$" + "".join(f"[{t}]" if t.isdigit() else f".{t}" for t in tokens)
+    return literal(postgresql_path), literal(sqlite_path)
+
+
+@compiles(json_array_length)
+def _json_array_length_default(element: json_array_length, compiler: SQLCompiler, **kw: Any) -> str:
+    column, key = (compiler.process(clause, **kw) for clause in element.clauses)
+    path = f"""('$."' || {key} || '"')"""
+    return (
+        f"CASE json_type({column}, {path}) "
+        f"WHEN 'array' THEN json_array_length({column}, {path}) END"
+    )
+
+
+@compiles(json_array_length, "postgresql")
+def _json_array_length_postgresql(
+    element: json_array_length, compiler: SQLCompiler, **kw: Any
+) -> str:
+    column, key = (compiler.process(clause, **kw) for clause in element.clauses)
+    value = f"({column} -> {key})"
+    return f"CASE jsonb_typeof({value}) WHEN 'array' THEN jsonb_array_length({value}) END"
+
+
+@compiles(json_size)
+def _json_size_default(element: json_size, compiler: SQLCompiler, **kw: Any) -> str:
+    return f"length({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_size, "postgresql")
+def _json_size_postgresql(element: json_size, compiler: SQLCompiler, **kw: Any) -> str:
+    # Reads the varlena header only: large documents are not decompressed
+    return f"pg_column_size({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(json_replace)
+def _json_replace_default(element: json_replace, compiler: SQLCompiler, **kw: Any) -> str:
+    column, _, path, value = element.clauses
+    column, path, value = (compiler.process(clause, **kw) for clause in (column, path, value))
+    return f"json_replace({column}, {path}, json({value}))"
+
+
+@compiles(json_replace, "postgresql")
+def _json_replace_postgresql(element: json_replace, compiler: SQLCompiler, **kw: Any) -> str:
+    column, path, _, value = element.clauses
+    column, path, value = (compiler.process(clause, **kw) for clause in (column, path, value))
+    return f"jsonb_set({column}, CAST({path} AS TEXT[]), CAST({value} AS JSONB), false)"
+
+
+@compiles(json_path_exists)
+def _json_path_exists_default(element: json_path_exists, compiler: SQLCompiler, **kw: Any) -> str:
+    column, _, path = element.clauses
+    column, path = compiler.process(column, **kw), compiler.process(path, **kw)
+    return f"(json_type({column}, {path}) IS NOT NULL)"
+
+
+@compiles(json_path_exists, "postgresql")
+def _json_path_exists_postgresql(
+    element: json_path_exists, compiler: SQLCompiler, **kw: Any
+) -> str:
+    column, path, _ = element.clauses
+    column, path = compiler.process(column, **kw), compiler.process(path, **kw)
+    return f"(({column} #> CAST({path} AS TEXT[])) IS NOT NULL)"
+
+
+@compiles(json_text_length)
+def _json_text_length_default(element: json_text_length, compiler: SQLCompiler, **kw: Any) -> str:
+    value = compiler.process(element.clauses, **kw)
+    # json() prints without spaces: add one after each ',' and ':' separator, i.e. per
+    # container child but the first, and per object member
+    separators = (
+        f"SELECT count(*) - count(DISTINCT parent) + sum(typeof(key) = 'text') "
+        f"FROM json_tree({value}) WHERE parent IS NOT NULL"
+    )
+    return f"(length(CAST(json({value}) AS BLOB)) + coalesce(({separators}), 0))"
+
+
+@compiles(json_text_length, "postgresql")
+def _json_text_length_postgresql(
+    element: json_text_length, compiler: SQLCompiler, **kw: Any
+) -> str:
+    return f"octet_length(CAST({compiler.process(element.clauses, **kw)} AS TEXT))"
@@ -2,7 +2,7 @@
 
 from datetime import UTC, datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, relationship
 
@@ -77,8 +77,20 @@ class Resume(Base):
     json_content = Column(JSONB, nullable=True)
     s3_url = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(UTC), nullable=False)
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+        nullable=False,
+    )
+    # Bumped by every write (optimistic concurrency: an update of a stale version fails)
+    version = Column(Integer, nullable=False, server_default="1")
 
     user = relationship("User", back_populates="resumes")
 
+    # Per-user listings, paginated by id
+    __table_args__ = (Index("ix_resumes_user_id_id", "user_id", "id"),)
+    __mapper_args__ = {"version_id_col": version}
+
     def __repr__(self) -> str:
         return f"<Resume(id={self.id}, name={self.name}, user_id={self.user_id})>"
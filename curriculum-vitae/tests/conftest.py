@@ -1,23 +1,34 @@
 """Shared fixtures for API integration tests."""
 
+import atexit
+import json
 import os
+import tempfile
 import unittest.mock
+from functools import partial
 
 # Set test environment variables BEFORE importing app modules
 os.environ["JWT_SECRET_KEY"] = "test-secret-key-for-unit-tests-only"
 os.environ["DATABASE_URL"] = "sqlite://"  # won't be used, but prevents ValueError
 os.environ["ZEPTOMAIL_API_KEY"] = ""  # disable real email sending in tests
+os.environ["LATEX_PRECOMPILED_FORMATS"] = "false"  # no pdftex -ini runs in tests
 
 import fakeredis
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import JSON, StaticPool, create_engine, event
+from sqlalchemy import JSON, NullPool, create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 import auth.routes as auth_routes_module
+import auth.user_cache as user_cache_module
+import core.ImportCache as import_cache_module
 from app import app
 from auth.routes import _reset_rate_limit_state
-from database.db_config import get_db
+from auth.user_cache import UserCache
+from core.ImportCache import ImportCache
+from core.PdfCache import get_pdf_cache
+from database.db_config import get_async_db, get_db
 from database.models import Base, Resume, User
 
 # SQLite doesn't support PostgreSQL's JSONB type natively.
@@ -25,24 +36,51 @@ from database.models import Base, Resume, User
 Resume.__table__.c.json_content.type = JSON()
 
 
-# Single shared engine for all tests — SQLite in-memory with cross-thread support.
-# StaticPool ensures a single connection is reused (required for in-memory SQLite
-# to keep tables visible across threads used by TestClient).
+# Single SQLite file shared by the sync engine (test fixtures, direct queries) and the
+# asyncio engine the routes use, so both see the same tables and rows.
+_db_fd, _db_path = tempfile.mkstemp(suffix=".sqlite3", prefix="cv-tests-")
+os.close(_db_fd)
+atexit.register(lambda: os.path.exists(_db_path) and os.remove(_db_path))
+
+# JSON stored unescaped, like PostgreSQL's jsonb, so SQL size checks match json_text_size
+_json_serializer = partial(json.dumps, ensure_ascii=False)
 _engine = create_engine(
-    "sqlite://",
+    f"sqlite:///{_db_path}",
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    poolclass=NullPool,
+    json_serializer=_json_serializer,
+)
+_async_engine = create_async_engine(
+    f"sqlite+aiosqlite:///{_db_path}", poolclass=NullPool, json_serializer=_json_serializer
 )
 
 
 @event.listens_for(_engine, "connect")
+@event.listens_for(_async_engine.sync_engine, "connect")
 def _set_sqlite_pragma(dbapi_conn, connection_record):
     cursor = dbapi_conn.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=OFF")
     cursor.close()
 
 
 _TestSession = sessionmaker(bind=_engine)
+_TestAsyncSession = async_sessionmaker(bind=_async_engine, autoflush=False, expire_on_commit=False)
+
+
+def override_async_db(db: Session):
+    """``get_async_db`` override for tests that also read through the sync ``db`` session."""
+
+    async def _get_async_db():
+        async with _TestAsyncSession() as session:
+            try:
+                yield session
+            finally:
+                # Rows written by the route must not be read back from db's identity map
+                db.expire_all()
+
+    return _get_async_db
 
 
 @pytest.fixture(autouse=True)
@@ -64,6 +102,30 @@ def _mock_email():
         yield
 
 
+@pytest.fixture(autouse=True)
+def _clear_pdf_cache():
+    """Keep compiled PDFs from leaking between tests that stub the compiler."""
+    get_pdf_cache().clear()
+    yield
+    get_pdf_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def import_cache(monkeypatch):
+    """Fresh import cache on an in-memory FakeRedis for every test."""
+    cache = ImportCache(fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(import_cache_module, "_import_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def user_cache(monkeypatch):
+    """Fresh user cache for every test: each test database reuses the same user ids."""
+    cache = UserCache()
+    monkeypatch.setattr(user_cache_module, "_user_cache", cache)
+    return cache
+
+
 @pytest.fixture(autouse=True)
 def _reset_auth_rate_limiter(_mock_redis):
     """Ensure auth rate limiter state is isolated between tests.
@@ -89,6 +151,18 @@ def _auto_verify():
     event.remove(User, "before_insert", _set_verified)
 
 
+@pytest.fixture()
+def pdf_file(tmp_path):
+    """Write a PDF with the given page texts (see make_pdf) and return its path."""
+
+    def _write(pages: list[str]):
+        path = tmp_path / "cv.pdf"
+        path.write_bytes(make_pdf(pages))
+        return path
+
+    return _write
+
+
 @pytest.fixture()
 def db():
     """Create tables before each test, drop them after."""
@@ -112,6 +186,7 @@ def client(db: Session):
             pass  # session lifecycle managed by the db fixture
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_async_db(db)
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
@@ -149,3 +224,38 @@ def create_authenticated_user(client: TestClient, email: str = "test@example.com
     """Register + login, return the token."""
     register_user(client, email=email)
     return login_user(client, email=email)
+
+
+def make_pdf(pages: list[str]) -> bytes:
+    """Minimal valid PDF with one line of Helvetica text per page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(out)
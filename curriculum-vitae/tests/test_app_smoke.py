@@ -30,6 +30,20 @@ def test_app_starts_and_serves_openapi(client):
     assert schema["info"]["title"] == "CV Generator API"
 
 
+def test_shutdown_stops_worker_pools():
+    """Stopping the app shuts the compile and extraction pools down; a restart gets new ones."""
+    from core.CompilePool import get_compile_pool
+    from core.TextExtractionPool import get_text_extraction_pool
+
+    with TestClient(app):
+        compile_pool = get_compile_pool()
+        extraction_pool = get_text_extraction_pool()
+    assert compile_pool.stats()["workers"] == 0
+    assert extraction_pool.stats()["workers"] == 0
+    assert get_compile_pool() is not compile_pool
+    assert get_text_extraction_pool() is not extraction_pool
+
+
 def test_generate_rejects_empty_body(client):
     """POST /generate without a body returns 422."""
     response = client.post("/generate")
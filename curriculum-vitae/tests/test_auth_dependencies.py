@@ -17,6 +17,7 @@ from tests.conftest import (
     _TestSession,
     auth_header,
     create_authenticated_user,
+    override_async_db,
     register_user,
 )
 
@@ -40,15 +41,9 @@ class TestGetCurrentUserViaAPI:
         from fastapi.testclient import TestClient
 
         from app import app
-        from database.db_config import get_db
+        from database.db_config import get_async_db
 
-        def override():
-            try:
-                yield self.session
-            finally:
-                pass
-
-        app.dependency_overrides[get_db] = override
+        app.dependency_overrides[get_async_db] = override_async_db(self.session)
         with TestClient(app) as c:
             yield c
         app.dependency_overrides.clear()
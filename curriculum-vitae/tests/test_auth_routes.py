@@ -1,6 +1,7 @@
 """Integration tests for authentication API routes."""
 
-from auth.security import create_access_token
+import auth.security
+from auth.security import PasswordHasher, create_access_token
 from conftest import (
     VALID_PASSWORD,
     auth_header,
@@ -116,6 +117,19 @@ class TestLogin:
         )
         assert resp.status_code == 401
 
+    def test_login_returns_503_when_password_hashing_is_saturated(self, client, monkeypatch):
+        register_user(client)
+        monkeypatch.setattr(auth.security, "_password_hasher", PasswordHasher(max_pending=0))
+        resp = client.post(
+            "/api/auth/login",
+            data={
+                "username": "test@example.com",
+                "password": VALID_PASSWORD,
+            },
+        )
+        assert resp.status_code == 503
+        assert resp.headers["retry-after"] == "1"
+
 
 class TestGuestAccount:
     def test_create_guest(self, client):
@@ -0,0 +1,140 @@
+"""Tests for the benchmark corpus and runner (without TeX: compilation is stubbed)."""
+
+import pytest
+from conftest import make_pdf
+
+import app as app_module
+from benchmarks import bench_text_extraction, run_benchmarks
+from benchmarks.resumes import _max_length, max_length_resume
+from core.PdfCompiler import PdfCompiler
+
+FAKE_PDF = b"%PDF-1.4\n%%EOF"
+
+
+class TestMaxLengthResume:
+    def test_is_valid_resume(self):
+        app_module.ResumeData(**max_length_resume())
+
+    def test_bounded_fields_at_their_limit(self):
+        resume = app_module.ResumeData(**max_length_resume())
+        assert len(resume.personal.name) == _max_length(
+            app_module.PersonalInfo.model_fields["name"]
+        )
+        assert len(resume.personal.links) == 20
+        experiences = next(s for s in resume.sections if s.type == "experiences")
+        assert len(experiences.items[0]["highlights"]) == 50
+        assert len(experiences.items[0]["company"]) == 300
+
+    def test_covers_every_section_type(self):
+        types = {section["type"] for section in max_length_resume()["sections"]}
+        assert types == set(app_module.SectionType.__args__)
+
+
+class TestMeasure:
+    def test_reports_latency_cpu_and_rss(self):
+        calls = []
+        metrics = run_benchmarks.measure(lambda: calls.append(1), iterations=4, warmup=2)
+        assert len(calls) == 6
+        assert metrics["iterations"] == 4
+        assert 0 <= metrics["p50_ms"] <= metrics["p95_ms"]
+        assert metrics["peak_rss_mb"] > 0
+        assert {"mean_ms", "cpu_ms", "children_peak_rss_mb"} <= metrics.keys()
+
+    def test_single_iteration(self):
+        metrics = run_benchmarks.measure(lambda: None, iterations=1, warmup=0)
+        assert metrics["p50_ms"] == metrics["p95_ms"]
+
+
+class TestRun:
+    def test_local_suites_cover_templates_and_corpus(self):
+        results = run_benchmarks.run(
+            ["convert", "render", "render_cold"], ["harvard", "europass"], 1, log=lambda _: None
+        )
+        assert set(results) == {
+            *(f"convert/{name}" for name in ("small", "typical", "max")),
+            *(
+                f"{suite}/{template}/{name}"
+                for suite in ("render", "render_cold")
+                for template in ("harvard", "europass")
+                for name in ("small", "typical", "max")
+            ),
+        }
+
+    def test_tex_suites_skipped_without_latexmk(self, monkeypatch):
+        monkeypatch.setattr(run_benchmarks.shutil, "which", lambda _: None)
+        logs = []
+        results = run_benchmarks.run(["compile", "generate"], ["harvard"], 1, log=logs.append)
+        assert results == {}
+        assert any("skipped" in line for line in logs)
+
+    @pytest.mark.parametrize("suite", ["compile", "generate", "optimal_size"])
+    def test_tex_suites_with_stubbed_compiler(self, monkeypatch, suite):
+        def _fake_compile(self, clean=True):
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+
+        monkeypatch.setattr(run_benchmarks.shutil, "which", lambda _: "/usr/bin/latexmk")
+        monkeypatch.setattr(PdfCompiler, "compile", _fake_compile)
+        monkeypatch.setattr(app_module.pdfplumber, "open", _FakePdf)
+
+        results = run_benchmarks.run([suite], ["harvard"], 1, log=lambda _: None)
+        assert set(results) == {f"{suite}/harvard/{n}" for n in ("small", "typical", "max")}
+        assert not app_module.app.dependency_overrides
+
+
+class _FakePdf:
+    pages = [object()]
+
+    def __init__(self, _source):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestCompare:
+    def test_reports_relative_change(self):
+        baseline = {"render/harvard/small": {"p50_ms": 10.0, "p95_ms": 20.0}}
+        current = {
+            "render/harvard/small": {"p50_ms": 15.0, "p95_ms": 20.0},
+            "render/harvard/max": {"p50_ms": 1.0, "p95_ms": 1.0},
+        }
+        (line,) = run_benchmarks.compare(baseline, current)
+        assert line.startswith("render/harvard/small:")
+        assert "(+50%)" in line
+        assert "(+0%)" in line
+
+
+class TestTextExtractionBench:
+    def test_source_text_skips_hidden_fields(self):
+        text = bench_text_extraction.source_text(
+            {"id": "sec-1", "type": "summary", "title": "Summary", "items": ["Python", 3]}
+        )
+        assert text.split("\n") == ["Summary", "Python", ""]
+
+    def test_word_recall(self):
+        assert bench_text_extraction.word_recall("Senior Engineer at Acme", "senior engineer") == (
+            2 / 3
+        )
+        assert bench_text_extraction.word_recall("", "anything") == 1.0
+
+    def test_builds_and_scores_a_corpus(self, monkeypatch, tmp_path):
+        def _fake_compile(self, clean=True):
+            pdf = make_pdf(["Alex Martin", "Software Engineer"])
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(pdf)
+
+        monkeypatch.setattr(PdfCompiler, "compile", _fake_compile)
+        bench_text_extraction.build_corpus(tmp_path, ["harvard", "europass"])
+        (tmp_path / "extra.pdf").write_bytes(make_pdf(["Jane Doe"]))
+
+        corpus = bench_text_extraction.load_corpus(tmp_path)
+        assert set(corpus) == {"harvard", "europass", "extra"}
+        assert corpus["extra"][1] is None
+
+        results = bench_text_extraction.bench(corpus, ["pdfplumber", "pdfminer"], 1)
+        for metrics in results.values():
+            assert metrics["pdfs"] == 3
+            assert 0 < metrics["word_recall_min"] <= metrics["word_recall_mean"] < 1
+            assert metrics["word_recall_worst"] in {"harvard", "europass"}
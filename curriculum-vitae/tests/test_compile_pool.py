@@ -0,0 +1,256 @@
+"""Tests for CompilePool — job execution, cleanup, timeouts and worker recycling."""
+
+import asyncio
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+from core.CompilePool import CompilePool, get_compile_pool
+from core.CompileWorkspace import CompileWorkspaces
+from core.PdfCompiler import PdfCompiler
+
+FAKE_PDF = b"%PDF-1.4\n%%EOF"
+
+
+@pytest.fixture()
+def fake_compile(monkeypatch):
+    """Replace latexmk with a stub that writes a PDF next to the TeX file."""
+    calls = []
+
+    def _fake_compile(self, clean=True):
+        calls.append(self)
+        source = self.tex_file.read_text(encoding="utf-8")
+        if "FAIL" in source:
+            raise RuntimeError("LaTeX compilation failed.")
+        if "NOPDF" not in source:
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+
+    monkeypatch.setattr(PdfCompiler, "compile", _fake_compile)
+    return calls
+
+
+@pytest.fixture()
+def pool(tmp_path):
+    compile_pool = CompilePool(
+        max_workers=2,
+        job_timeout=12,
+        max_jobs_per_worker=None,
+        workspaces=CompileWorkspaces(root=tmp_path, size=2),
+    )
+    yield compile_pool
+    compile_pool.shutdown()
+
+
+class TestCompilePoolInit:
+    def test_rejects_zero_workers(self):
+        with pytest.raises(ValueError, match="max_workers"):
+            CompilePool(max_workers=0)
+
+    def test_starts_requested_workers(self, pool):
+        assert pool.stats()["workers"] == 2
+
+
+class TestCompile:
+    def test_returns_pdf_bytes(self, pool, fake_compile):
+        assert pool.compile(r"\documentclass{article}") == FAKE_PDF
+
+    def test_forwards_job_timeout_to_compiler(self, pool, fake_compile):
+        pool.compile("ok")
+        assert fake_compile[0].timeout == 12
+
+    def test_workspace_emptied_after_success(self, pool, fake_compile):
+        pool.compile("ok")
+        assert list(fake_compile[0].tex_file.parent.iterdir()) == []
+
+    def test_workspace_emptied_after_failure(self, pool, fake_compile):
+        with pytest.raises(RuntimeError, match="LaTeX compilation failed"):
+            pool.compile("FAIL")
+        assert list(fake_compile[0].tex_file.parent.iterdir()) == []
+
+    def test_missing_pdf_raises(self, pool, fake_compile):
+        with pytest.raises(RuntimeError, match="PDF generation failed"):
+            pool.compile("NOPDF")
+
+    def test_workspaces_reused_across_jobs(self, pool, fake_compile):
+        futures = [pool.submit("ok") for _ in range(6)]
+        wait(futures)
+        assert all(f.result().content == FAKE_PDF for f in futures)
+        assert len({c.tex_file.parent for c in fake_compile}) <= 2
+        assert pool.workspaces.stats()["created"] == 2
+
+    def test_shutdown_removes_workspaces(self, tmp_path, fake_compile):
+        compile_pool = CompilePool(
+            max_workers=1, workspaces=CompileWorkspaces(root=tmp_path, size=1)
+        )
+        compile_pool.compile("ok")
+        compile_pool.shutdown()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_counts_completed_jobs(self, pool, fake_compile):
+        for _ in range(3):
+            pool.compile("ok")
+        assert pool.stats()["jobs_completed"] == 3
+
+
+class TestConcurrency:
+    def test_never_runs_more_jobs_than_workers(self, monkeypatch):
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+        release = threading.Event()
+
+        def _slow_compile(self, clean=True):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            release.wait(timeout=5)
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+            with lock:
+                running -= 1
+
+        monkeypatch.setattr(PdfCompiler, "compile", _slow_compile)
+        compile_pool = CompilePool(max_workers=2, max_jobs_per_worker=None)
+        try:
+            futures = [compile_pool.submit("ok") for _ in range(5)]
+            release.set()
+            wait(futures)
+        finally:
+            compile_pool.shutdown()
+
+        assert peak <= 2
+
+
+class TestCompileAsync:
+    def test_returns_pdf_bytes(self, pool, fake_compile):
+        assert asyncio.run(pool.compile_async("ok")) == FAKE_PDF
+
+    def test_propagates_compile_errors(self, pool, fake_compile):
+        with pytest.raises(RuntimeError, match="LaTeX compilation failed"):
+            asyncio.run(pool.compile_async("FAIL"))
+
+    def test_event_loop_stays_responsive_during_compile(self, monkeypatch):
+        started = threading.Event()
+        release = threading.Event()
+
+        def _blocking_compile(self, clean=True):
+            started.set()
+            release.wait(timeout=5)
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+
+        monkeypatch.setattr(PdfCompiler, "compile", _blocking_compile)
+        compile_pool = CompilePool(max_workers=1, max_jobs_per_worker=None)
+
+        async def scenario():
+            task = asyncio.create_task(compile_pool.compile_async("ok"))
+            await asyncio.to_thread(started.wait, 5)
+            # The loop keeps serving other coroutines while TeX is running.
+            ticks = 0
+            for _ in range(3):
+                await asyncio.sleep(0)
+                ticks += 1
+            release.set()
+            return ticks, await task
+
+        try:
+            ticks, pdf = asyncio.run(scenario())
+        finally:
+            compile_pool.shutdown()
+
+        assert ticks == 3
+        assert pdf == FAKE_PDF
+
+    def test_admission_capped_per_event_loop(self, monkeypatch):
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def _compile(self, clean=True):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+            with lock:
+                in_flight -= 1
+
+        monkeypatch.setattr(PdfCompiler, "compile", _compile)
+        compile_pool = CompilePool(max_workers=2, max_jobs_per_worker=None)
+
+        async def scenario():
+            return await asyncio.gather(*(compile_pool.compile_async("ok") for _ in range(8)))
+
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            compile_pool.shutdown()
+
+        assert results == [FAKE_PDF] * 8
+        assert peak <= 2
+        assert compile_pool.stats()["queued"] == 0
+
+    def test_cancelled_waiter_never_compiles(self, monkeypatch):
+        release = threading.Event()
+        compiled = []
+
+        def _compile(self, clean=True):
+            compiled.append(self.tex_file.read_text(encoding="utf-8"))
+            release.wait(timeout=5)
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+
+        monkeypatch.setattr(PdfCompiler, "compile", _compile)
+        compile_pool = CompilePool(max_workers=1, max_jobs_per_worker=None)
+
+        async def scenario():
+            first = asyncio.create_task(compile_pool.compile_async("first"))
+            second = asyncio.create_task(compile_pool.compile_async("second"))
+            await asyncio.sleep(0.05)
+            second.cancel()
+            release.set()
+            await first
+            with pytest.raises(asyncio.CancelledError):
+                await second
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            compile_pool.shutdown()
+
+        assert compiled == ["first"]
+
+    def test_usable_from_several_event_loops(self, pool, fake_compile):
+        assert asyncio.run(pool.compile_async("ok")) == FAKE_PDF
+        assert asyncio.run(pool.compile_async("ok")) == FAKE_PDF
+
+
+class TestRecycling:
+    def test_worker_replaced_after_max_jobs(self, fake_compile):
+        compile_pool = CompilePool(max_workers=1, max_jobs_per_worker=2)
+        try:
+            for _ in range(5):
+                compile_pool.compile("ok")
+            stats = compile_pool.stats()
+        finally:
+            compile_pool.shutdown()
+
+        assert stats["workers_recycled"] == 2
+        assert stats["workers"] == 1
+
+
+class TestShutdown:
+    def test_submit_after_shutdown_raises(self):
+        compile_pool = CompilePool(max_workers=1)
+        compile_pool.shutdown()
+        with pytest.raises(RuntimeError, match="shut down"):
+            compile_pool.submit("ok")
+
+    def test_shutdown_is_idempotent(self):
+        compile_pool = CompilePool(max_workers=1)
+        compile_pool.shutdown()
+        compile_pool.shutdown()
+        assert compile_pool.stats()["workers"] == 0
+
+
+def test_get_compile_pool_returns_singleton():
+    assert get_compile_pool() is get_compile_pool()
@@ -0,0 +1,125 @@
+"""Tests for CompileWorkspaces — reuse, scrubbing and tmpfs placement."""
+
+import threading
+from pathlib import Path
+
+import pytest
+
+import core.CompileWorkspace as workspace_module
+from core.CompileWorkspace import CompileWorkspaces, default_workspace_root
+
+
+@pytest.fixture()
+def workspaces(tmp_path):
+    manager = CompileWorkspaces(root=tmp_path, size=2)
+    yield manager
+    manager.close()
+
+
+class TestPool:
+    def test_precreates_directories(self, workspaces, tmp_path):
+        assert len(list(tmp_path.iterdir())) == 2
+        assert workspaces.stats() == {"idle": 2, "created": 2, "discarded": 0}
+
+    def test_directories_are_private(self, workspaces):
+        with workspaces.workspace() as workspace:
+            assert workspace.path.stat().st_mode & 0o077 == 0
+
+    def test_workspace_reused(self, workspaces):
+        with workspaces.workspace() as workspace:
+            first = workspace.path
+        with workspaces.workspace() as workspace:
+            assert workspace.path == first
+        assert workspaces.stats()["created"] == 2
+
+    def test_grows_when_exhausted(self, workspaces):
+        borrowed = [workspaces.acquire() for _ in range(3)]
+        assert len({w.path for w in borrowed}) == 3
+        assert workspaces.stats()["created"] == 3
+        for workspace in borrowed:
+            workspaces.release(workspace)
+        assert workspaces.stats()["idle"] == 3
+
+    def test_concurrent_borrowers_never_share(self, workspaces):
+        seen = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(4)
+
+        def borrow():
+            with workspaces.workspace() as workspace:
+                barrier.wait(timeout=5)
+                with lock:
+                    seen.append(workspace.path)
+
+        threads = [threading.Thread(target=borrow) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(set(seen)) == 4
+
+
+class TestScrub:
+    def test_released_workspace_is_empty(self, workspaces):
+        with workspaces.workspace() as workspace:
+            workspace.write_source(r"\documentclass{article}")
+            workspace.pdf_file.write_bytes(b"%PDF")
+            (workspace.path / "sub").mkdir()
+            (workspace.path / "sub" / "x.aux").write_text("x")
+            path = workspace.path
+        assert list(path.iterdir()) == []
+
+    def test_scrubbed_on_exception(self, workspaces):
+        with pytest.raises(ValueError), workspaces.workspace() as workspace:
+            workspace.write_source("secret")
+            raise ValueError
+        assert list(workspace.path.iterdir()) == []
+
+    def test_unscrubbable_workspace_discarded(self, workspaces, monkeypatch):
+        workspace = workspaces.acquire()
+
+        def _fail():
+            raise PermissionError("denied")
+
+        monkeypatch.setattr(workspace, "scrub", _fail)
+        workspaces.release(workspace)
+        assert not workspace.path.exists()
+        assert workspaces.stats()["discarded"] == 1
+        assert workspaces.stats()["idle"] == 1
+
+    def test_read_pdf(self, workspaces):
+        with workspaces.workspace() as workspace:
+            assert workspace.read_pdf() is None
+            workspace.pdf_file.write_bytes(b"%PDF")
+            assert workspace.read_pdf() == b"%PDF"
+
+
+class TestClose:
+    def test_close_removes_idle_directories(self, tmp_path):
+        manager = CompileWorkspaces(root=tmp_path, size=2)
+        manager.close()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_workspace_released_after_close_is_removed(self, tmp_path):
+        manager = CompileWorkspaces(root=tmp_path, size=1)
+        workspace = manager.acquire()
+        manager.close()
+        manager.release(workspace)
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestDefaultRoot:
+    def test_explicit_setting_wins(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(workspace_module, "PDF_COMPILE_WORKSPACE_ROOT", str(tmp_path))
+        assert default_workspace_root() == tmp_path
+
+    def test_prefers_tmpfs(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(workspace_module, "PDF_COMPILE_WORKSPACE_ROOT", "")
+        monkeypatch.setattr(workspace_module, "TMPFS_ROOT", tmp_path)
+        assert default_workspace_root() == tmp_path
+
+    def test_falls_back_to_temp_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(workspace_module, "PDF_COMPILE_WORKSPACE_ROOT", "")
+        monkeypatch.setattr(workspace_module, "TMPFS_ROOT", tmp_path / "missing")
+        monkeypatch.setattr(workspace_module.tempfile, "gettempdir", lambda: "/tmp")
+        assert default_workspace_root() == Path("/tmp")
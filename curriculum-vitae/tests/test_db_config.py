@@ -1,9 +1,11 @@
 """Tests for database/db_config.py — engine creation, session management, connection check."""
 
+import asyncio
 import contextlib
 import os
 
 import pytest
+from sqlalchemy import text
 
 
 class TestGetEngine:
@@ -131,3 +133,256 @@ class TestCheckDbConnection:
         finally:
             db_cfg.engine = None
             db_cfg.DATABASE_URL = os.environ.get("DATABASE_URL")
+
+
+class TestAsyncDatabaseUrl:
+    def test_postgres_uses_asyncpg(self):
+        import database.db_config as db_cfg
+
+        url = db_cfg.async_database_url("postgresql://user:secret@db:5432/cv")
+        assert url == "postgresql+asyncpg://user:secret@db:5432/cv"
+
+    def test_explicit_sync_driver_is_replaced(self):
+        import database.db_config as db_cfg
+
+        url = db_cfg.async_database_url("postgresql+psycopg2://user:secret@db/cv")
+        assert url.startswith("postgresql+asyncpg://")
+
+    def test_sslmode_is_renamed_for_asyncpg(self):
+        import database.db_config as db_cfg
+
+        url = db_cfg.async_database_url("postgresql://user:secret@db/cv?sslmode=require")
+        assert url == "postgresql+asyncpg://user:secret@db/cv?ssl=require"
+
+    def test_sqlite_uses_aiosqlite(self):
+        import database.db_config as db_cfg
+
+        assert db_cfg.async_database_url("sqlite://") == "sqlite+aiosqlite://"
+
+    def test_unknown_backend_raises(self):
+        import database.db_config as db_cfg
+
+        with pytest.raises(ValueError, match="mysql"):
+            db_cfg.async_database_url("mysql://user:secret@db/cv")
+
+
+class TestGetAsyncDb:
+    @pytest.fixture(autouse=True)
+    def _sqlite(self, monkeypatch):
+        import database.db_config as db_cfg
+
+        monkeypatch.setattr(db_cfg, "DATABASE_URL", "sqlite://")
+        monkeypatch.setattr(db_cfg, "async_engine", None)
+        monkeypatch.setattr(db_cfg, "AsyncSessionLocal", None)
+        yield
+        if db_cfg.async_engine is not None:
+            asyncio.run(db_cfg.async_engine.dispose())
+
+    def test_yields_async_session(self):
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        import database.db_config as db_cfg
+
+        async def scenario():
+            gen = db_cfg.get_async_db()
+            session = await anext(gen)
+            assert isinstance(session, AsyncSession)
+            assert await session.scalar(text("SELECT 1")) == 1
+            await gen.aclose()
+
+        asyncio.run(scenario())
+
+    def test_caches_engine_and_session_factory(self):
+        import database.db_config as db_cfg
+
+        assert db_cfg.get_async_engine() is db_cfg.get_async_engine()
+        assert db_cfg.get_async_session_local() is db_cfg.get_async_session_local()
+
+    def test_check_async_db_connection(self):
+        import database.db_config as db_cfg
+
+        assert asyncio.run(db_cfg.check_async_db_connection()) is True
+
+
+@pytest.fixture
+def pooled_engine(tmp_path, monkeypatch):
+    """File SQLite engine on the metered QueuePool, installed as the module's engine."""
+    from sqlalchemy import create_engine
+
+    import database.db_config as db_cfg
+
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_engine(url, poolclass=db_cfg.MeteredQueuePool, pool_size=3, max_overflow=0)
+    db_cfg._install_pool_events(engine, "idle", 0)
+    db_cfg.get_pool_metrics().reset()
+    monkeypatch.setattr(db_cfg, "engine", engine)
+    monkeypatch.setattr(db_cfg, "DATABASE_URL", url)
+    yield engine
+    engine.dispose()
+    db_cfg.get_pool_metrics().reset()
+
+
+class TestEngineOptions:
+    def test_postgres_gets_configured_pool(self, monkeypatch):
+        import database.db_config as db_cfg
+
+        monkeypatch.setattr(db_cfg, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(db_cfg, "DB_MAX_OVERFLOW", 3)
+        monkeypatch.setattr(db_cfg, "DB_STATEMENT_TIMEOUT_MS", 5000)
+        options = db_cfg._engine_options("postgresql://u:p@localhost/db")
+
+        assert options["poolclass"] is db_cfg.MeteredQueuePool
+        assert options["pool_size"] == 7
+        assert options["max_overflow"] == 3
+        assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    def test_pre_ping_modes(self, monkeypatch):
+        import database.db_config as db_cfg
+
+        monkeypatch.setattr(db_cfg, "DB_POOL_PRE_PING", "always")
+        assert db_cfg._engine_options("postgresql://localhost/db")["pool_pre_ping"] is True
+        monkeypatch.setattr(db_cfg, "DB_POOL_PRE_PING", "idle")
+        assert db_cfg._engine_options("postgresql://localhost/db")["pool_pre_ping"] is False
+
+    def test_invalid_pre_ping_mode_raises(self, monkeypatch):
+        import database.db_config as db_cfg
+
+        monkeypatch.setattr(db_cfg, "DB_POOL_PRE_PING", "sometimes")
+        with pytest.raises(ValueError, match="DB_POOL_PRE_PING"):
+            db_cfg._engine_options("postgresql://localhost/db")
+
+    def test_sqlite_keeps_default_pool(self):
+        import database.db_config as db_cfg
+
+        options = db_cfg._engine_options("sqlite://")
+        assert "poolclass" not in options
+        assert "connect_args" not in options
+
+
+class TestPoolMetrics:
+    def test_checkouts_and_waits_are_recorded(self, pooled_engine):
+        import database.db_config as db_cfg
+
+        with pooled_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert db_cfg.pool_stats()["in_use"] == 1
+
+        stats = db_cfg.pool_stats()
+        assert stats["checkouts"] == 1
+        assert stats["in_use"] == 0
+        assert stats["connections_opened"] == 1
+        assert stats["sync"]["pool_size"] == 3
+        assert "async" not in stats
+        assert stats["checkout_wait_ms"]["max"] >= stats["checkout_wait_ms"]["p50"]
+
+    def test_pool_timeout_is_counted(self, tmp_path):
+        from sqlalchemy import create_engine, exc
+
+        import database.db_config as db_cfg
+
+        db_cfg.get_pool_metrics().reset()
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'timeout.db'}",
+            poolclass=db_cfg.MeteredQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.01,
+        )
+        try:
+            with engine.connect(), pytest.raises(exc.TimeoutError):
+                engine.connect()
+            assert db_cfg.get_pool_metrics().stats()["timeouts"] == 1
+        finally:
+            engine.dispose()
+            db_cfg.get_pool_metrics().reset()
+
+    def test_idle_connection_is_pinged(self, pooled_engine):
+        import database.db_config as db_cfg
+
+        with pooled_engine.connect():
+            pass
+        with pooled_engine.connect():
+            pass
+
+        assert db_cfg.pool_stats()["pings"] >= 1
+        assert db_cfg.pool_stats()["ping_failures"] == 0
+
+    def test_dead_idle_connection_is_replaced(self, pooled_engine):
+        import database.db_config as db_cfg
+
+        with pooled_engine.connect() as conn:
+            dbapi_connection = conn.connection.dbapi_connection
+        dbapi_connection.close()
+
+        with pooled_engine.connect() as conn:
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+
+        stats = db_cfg.pool_stats()
+        assert stats["ping_failures"] == 1
+        assert stats["connections_opened"] == 2
+
+
+class TestWarmUpPool:
+    def test_opens_connections_ahead(self, pooled_engine):
+        import database.db_config as db_cfg
+
+        assert db_cfg.warm_up_pool(2) == 2
+        assert pooled_engine.pool.checkedin() == 2
+        assert db_cfg.pool_stats()["in_use"] == 0
+
+    def test_capped_at_pool_size(self, pooled_engine):
+        import database.db_config as db_cfg
+
+        assert db_cfg.warm_up_pool(10) == 3
+
+    def test_skipped_for_sqlite_memory(self, monkeypatch):
+        import database.db_config as db_cfg
+
+        monkeypatch.setattr(db_cfg, "engine", None)
+        monkeypatch.setattr(db_cfg, "DATABASE_URL", "sqlite://")
+        assert db_cfg.warm_up_pool(2) == 0
+
+
+class TestAsyncPool:
+    @pytest.fixture
+    def pooled_async_engine(self, tmp_path, monkeypatch):
+        from sqlalchemy.ext.asyncio import create_async_engine
+
+        import database.db_config as db_cfg
+
+        url = f"sqlite:///{tmp_path / 'pool.db'}"
+        async_engine = create_async_engine(
+            db_cfg.async_database_url(url),
+            poolclass=db_cfg.MeteredAsyncAdaptedQueuePool,
+            pool_size=2,
+            max_overflow=0,
+        )
+        db_cfg._install_pool_events(async_engine.sync_engine, "idle", 30)
+        db_cfg.get_pool_metrics().reset()
+        monkeypatch.setattr(db_cfg, "async_engine", async_engine)
+        monkeypatch.setattr(db_cfg, "DATABASE_URL", url)
+        yield async_engine
+        db_cfg.get_pool_metrics().reset()
+
+    def test_warm_up_and_checkouts_are_recorded(self, pooled_async_engine):
+        import database.db_config as db_cfg
+
+        async def scenario():
+            try:
+                opened = await db_cfg.warm_up_async_pool(5)
+                async with pooled_async_engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                return opened, db_cfg.pool_stats()
+            finally:
+                await pooled_async_engine.dispose()
+
+        opened, stats = asyncio.run(scenario())
+        assert opened == 2
+        assert stats["async"] == {
+            "pool_size": 2,
+            "max_overflow": db_cfg.DB_MAX_OVERFLOW,
+            "checked_out": 0,
+            "idle": 2,
+        }
+        assert stats["checkouts"] == 3
+        assert stats["connections_opened"] == 2
@@ -2,11 +2,25 @@
 
 from unittest.mock import MagicMock, patch
 
-from core.email import send_email, send_password_reset_email, send_welcome_email
+import fakeredis
+import pytest
+import redis
+
+import core.EmailOutbox as email_outbox_module
+from core.email import deliver_email, send_email, send_password_reset_email, send_welcome_email
+from core.EmailOutbox import QUEUE_KEY, EmailOutbox
+
+
+@pytest.fixture
+def outbox(monkeypatch):
+    """Process-wide outbox replaced by one on an in-memory FakeRedis."""
+    outbox = EmailOutbox(fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(email_outbox_module, "_email_outbox", outbox)
+    return outbox
 
 
 class TestSendEmail:
-    """Tests for the low-level send_email function."""
+    """Tests for send_email, which queues emails in the outbox."""
 
     @patch("core.email.ZEPTOMAIL_API_KEY", "")
     def test_skip_when_api_key_not_configured(self):
@@ -15,6 +29,37 @@ class TestSendEmail:
             send_email("user@example.com", "Subject", "<p>body</p>")
         mock_post.assert_not_called()
 
+    @patch("core.email.ZEPTOMAIL_API_KEY", "test-api-key")
+    def test_queues_email_in_outbox(self, outbox):
+        """Queues the message instead of calling ZeptoMail from the request."""
+        with patch("core.email.httpx.post") as mock_post:
+            send_email("user@example.com", "Hello", "<p>World</p>")
+        mock_post.assert_not_called()
+        assert outbox.redis_client.zcard(QUEUE_KEY) == 1
+        assert outbox.stats()["enqueued"] == 1
+
+    @patch("core.email.ZEPTOMAIL_API_KEY", "test-api-key")
+    @patch("core.email.httpx.post")
+    def test_sends_inline_when_outbox_unavailable(self, mock_post, outbox, monkeypatch):
+        """Falls back to a direct send when Redis cannot take the message."""
+        monkeypatch.setattr(
+            outbox.redis_client, "zadd", MagicMock(side_effect=redis.ConnectionError("down"))
+        )
+        send_email("user@example.com", "Hello", "<p>World</p>")
+        mock_post.assert_called_once()
+
+    @patch("core.email.ZEPTOMAIL_API_KEY", "test-api-key")
+    @patch("core.EmailOutbox.EMAIL_OUTBOX_ENABLED", False)
+    @patch("core.email.httpx.post")
+    def test_sends_inline_when_outbox_disabled(self, mock_post, outbox):
+        send_email("user@example.com", "Hello", "<p>World</p>")
+        mock_post.assert_called_once()
+        assert outbox.redis_client.zcard(QUEUE_KEY) == 0
+
+
+class TestDeliverEmail:
+    """Tests for deliver_email, the direct ZeptoMail call."""
+
     @patch("core.email.ZEPTOMAIL_API_KEY", "test-api-key")
     @patch("core.email.httpx.post")
     def test_sends_email_with_correct_payload(self, mock_post):
@@ -22,7 +67,7 @@ class TestSendEmail:
         mock_post.return_value = MagicMock(status_code=200)
         mock_post.return_value.raise_for_status = MagicMock()
 
-        send_email("user@example.com", "Hello", "<p>World</p>")
+        deliver_email("user@example.com", "Hello", "<p>World</p>")
 
         mock_post.assert_called_once()
         call_kwargs = mock_post.call_args
@@ -39,7 +84,7 @@ class TestSendEmail:
         mock_post.return_value = MagicMock(status_code=200)
         mock_post.return_value.raise_for_status = MagicMock()
 
-        send_email("a@b.com", "S", "<p>B</p>")
+        deliver_email("a@b.com", "S", "<p>B</p>")
 
         headers = mock_post.call_args.kwargs.get("headers") or mock_post.call_args[1].get("headers")
         assert headers["authorization"] == "test-api-key"
@@ -48,7 +93,7 @@ class TestSendEmail:
     @patch("core.email.httpx.post", side_effect=Exception("Network error"))
     def test_does_not_raise_on_send_failure(self, mock_post):
         """Logs the error but does not propagate exceptions."""
-        send_email("user@example.com", "Subj", "<p>body</p>")  # should not raise
+        deliver_email("user@example.com", "Subj", "<p>body</p>")  # should not raise
 
 
 class TestSendWelcomeEmail:
@@ -0,0 +1,289 @@
+"""Tests for core/EmailOutbox.py, delivering to a local stub of the ZeptoMail API."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import fakeredis
+import pytest
+
+from core.EmailOutbox import (
+    DEAD_LETTER_KEY,
+    EMAIL_OUTBOX_DEAD_LETTER_TTL_SECONDS,
+    QUEUE_KEY,
+    EmailOutbox,
+)
+
+
+class StubZeptoMail:
+    """HTTP server answering each POST with the next queued status (200 once empty)."""
+
+    def __init__(self):
+        self.statuses: list[int] = []
+        self.requests: list[dict] = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["content-length"]))
+                stub.requests.append(
+                    {"json": json.loads(body), "authorization": self.headers["authorization"]}
+                )
+                self.send_response(stub.statuses.pop(0) if stub.statuses else 200)
+                self.send_header("content-length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1.1/email"
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+        self.thread.start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubZeptoMail()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def outbox(stub_server, monkeypatch):
+    monkeypatch.setattr("core.email.ZEPTOMAIL_API_KEY", "test-api-key")
+    return EmailOutbox(
+        fakeredis.FakeRedis(decode_responses=True),
+        api_url=stub_server.url,
+        batch_size=5,
+        max_attempts=3,
+        retry_base=0,
+        poll_interval=0.01,
+    )
+
+
+def drain(outbox: EmailOutbox) -> int:
+    async def run():
+        try:
+            return await outbox.drain_once()
+        finally:
+            await outbox.aclose()
+
+    return asyncio.run(run())
+
+
+class TestEnqueue:
+    def test_enqueue_stores_due_message(self, outbox):
+        assert outbox.enqueue("user@example.com", "Hello", "<p>World</p>") is True
+        [(member, score)] = outbox.redis_client.zrange(QUEUE_KEY, 0, -1, withscores=True)
+        message = json.loads(member)
+        assert message["to"] == "user@example.com"
+        assert message["attempts"] == 0
+        assert score <= time.time()
+
+    def test_drain_with_empty_queue(self, outbox, stub_server):
+        assert drain(outbox) == 0
+        assert stub_server.requests == []
+
+
+class TestDelivery:
+    def test_delivers_queued_emails(self, outbox, stub_server):
+        outbox.enqueue("a@example.com", "Subject A", "<p>A</p>")
+        outbox.enqueue("b@example.com", "Subject B", "<p>B</p>")
+
+        assert drain(outbox) == 2
+
+        recipients = sorted(
+            r["json"]["to"][0]["email_address"]["address"] for r in stub_server.requests
+        )
+        assert recipients == ["a@example.com", "b@example.com"]
+        assert all(r["authorization"] == "test-api-key" for r in stub_server.requests)
+        assert outbox.stats()["sent"] == 2
+        assert outbox.stats()["queued"] == 0
+
+    def test_drains_one_batch_per_pass(self, outbox, stub_server):
+        for i in range(7):
+            outbox.enqueue(f"user{i}@example.com", "S", "<p>B</p>")
+
+        assert drain(outbox) == 5
+        assert outbox.stats()["queued"] == 2
+        assert drain(outbox) == 2
+
+    def test_server_error_is_retried_later(self, outbox, stub_server):
+        outbox.retry_base = 60
+        stub_server.statuses = [503]
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        assert drain(outbox) == 1
+
+        [(member, score)] = outbox.redis_client.zrange(QUEUE_KEY, 0, -1, withscores=True)
+        assert json.loads(member)["attempts"] == 1
+        assert score > time.time() + 30
+        # Not due yet: the next pass leaves it alone
+        assert drain(outbox) == 0
+        assert outbox.stats()["retried"] == 1
+
+    def test_retry_succeeds(self, outbox, stub_server):
+        stub_server.statuses = [500]
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        drain(outbox)
+        drain(outbox)
+
+        assert len(stub_server.requests) == 2
+        assert outbox.stats()["sent"] == 1
+        assert outbox.stats()["queued"] == 0
+
+    def test_dead_lettered_after_max_attempts(self, outbox, stub_server):
+        stub_server.statuses = [500, 502, 503]
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        for _ in range(3):
+            drain(outbox)
+
+        assert outbox.stats()["queued"] == 0
+        [dead] = outbox.dead_letters()
+        assert dead["attempts"] == 3
+        assert "503" in dead["error"]
+        assert dead["to"] == "user@example.com"
+        assert dead["failed_at"] >= dead["queued_at"]
+        assert "html_body" not in dead
+
+    def test_dead_letter_list_expires(self, outbox, stub_server):
+        stub_server.statuses = [422]
+        outbox.enqueue("invalid", "S", "<p>B</p>")
+
+        drain(outbox)
+
+        ttl = outbox.redis_client.ttl(DEAD_LETTER_KEY)
+        assert 0 < ttl <= EMAIL_OUTBOX_DEAD_LETTER_TTL_SECONDS
+
+    def test_client_error_is_dead_lettered_immediately(self, outbox, stub_server):
+        stub_server.statuses = [422]
+        outbox.enqueue("invalid", "S", "<p>B</p>")
+
+        drain(outbox)
+
+        assert outbox.redis_client.llen(DEAD_LETTER_KEY) == 1
+        assert outbox.stats()["dead_lettered"] == 1
+
+    def test_rate_limit_is_retried(self, outbox, stub_server):
+        stub_server.statuses = [429]
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        drain(outbox)
+
+        assert outbox.stats()["retried"] == 1
+        assert outbox.stats()["dead_letters"] == 0
+
+    def test_unreachable_server_is_retried(self, outbox, stub_server):
+        outbox.api_url = "http://127.0.0.1:1/v1.1/email"
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        drain(outbox)
+
+        assert outbox.stats()["retried"] == 1
+        assert outbox.stats()["queued"] == 1
+
+    def test_message_claimed_once(self, outbox, stub_server):
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+        other_worker = EmailOutbox(outbox.redis_client, api_url=stub_server.url)
+
+        assert drain(outbox) == 1
+        assert drain(other_worker) == 0
+        assert len(stub_server.requests) == 1
+
+    def test_malformed_messages_are_dead_lettered(self, outbox, stub_server):
+        outbox.redis_client.zadd(QUEUE_KEY, {"not json": 0, json.dumps({"id": "x"}): 0})
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        assert drain(outbox) == 3
+
+        assert len(stub_server.requests) == 1
+        assert outbox.stats()["sent"] == 1
+        assert outbox.stats()["dead_lettered"] == 2
+        assert {"not json", None} == {m.get("raw") for m in outbox.dead_letters()}
+
+    def test_failures_survive_redis_errors_while_settling(self, outbox, stub_server, monkeypatch):
+        import redis
+
+        outbox.retry_base = 60
+        stub_server.statuses = [503]
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        def _unavailable(*args, **kwargs):
+            raise redis.ConnectionError("Redis went away")
+
+        with monkeypatch.context() as patched:
+            patched.setattr(outbox.redis_client, "zadd", _unavailable)
+            assert drain(outbox) == 1
+        assert outbox.stats()["queued"] == 0
+
+        # Settled on the next pass, before anything new is claimed
+        assert drain(outbox) == 0
+        [member] = outbox.redis_client.zrange(QUEUE_KEY, 0, -1)
+        assert json.loads(member)["attempts"] == 1
+        assert outbox.stats()["retried"] == 1
+
+
+class TestRun:
+    def test_run_delivers_until_cancelled(self, outbox, stub_server):
+        async def scenario():
+            task = asyncio.create_task(outbox.run())
+            outbox.enqueue("user@example.com", "S", "<p>B</p>")
+            for _ in range(200):
+                if outbox.stats()["sent"]:
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await outbox.aclose()
+
+        asyncio.run(scenario())
+        assert outbox.stats()["sent"] == 1
+
+    def test_run_survives_unexpected_errors(self, outbox, stub_server, monkeypatch):
+        claim_due = outbox._claim_due
+        calls = []
+
+        def _fails_once():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return claim_due()
+
+        monkeypatch.setattr(outbox, "_claim_due", _fails_once)
+
+        async def scenario():
+            task = asyncio.create_task(outbox.run())
+            outbox.enqueue("user@example.com", "S", "<p>B</p>")
+            for _ in range(200):
+                if outbox.stats()["sent"]:
+                    break
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await outbox.aclose()
+
+        asyncio.run(scenario())
+        assert len(calls) > 1
+        assert outbox.stats()["sent"] == 1
+
+
+class TestRetryDelay:
+    def test_exponential_backoff_is_capped(self):
+        outbox = EmailOutbox(fakeredis.FakeRedis(), retry_base=5, retry_max=60)
+        assert 4 <= outbox.retry_delay(1) <= 6
+        assert 8 <= outbox.retry_delay(2) <= 12
+        assert outbox.retry_delay(10) <= 72
@@ -0,0 +1,266 @@
+"""Tests for FormatCache — preamble splitting, format builds, staleness and fallback."""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from core.CompilePool import CompilePool
+from core.FormatCache import ENDOFDUMP, FormatCache, main, split_static_preamble
+from core.PdfCompiler import CompileTimeoutError, PdfCompiler
+
+TEMPLATES_FOLDER = Path(__file__).parent.parent / "templates"
+
+TEMPLATE = (
+    "\\documentclass{article}\n"
+    "\\usepackage{geometry}\n"
+    "\\usepackage{hyperref}\n"
+    "\\begin{document}\n"
+    "\\VAR{personal.name}\n"
+    "\\end{document}\n"
+)
+PREAMBLE = "\\documentclass{article}\n\\usepackage{geometry}\n"
+RENDERED = TEMPLATE.replace("\\VAR{personal.name}", "Jane")
+FAKE_PDF = b"%PDF-1.4\n%%EOF"
+
+
+def _fake_pdftex(cmd, cwd=None, **kwargs):
+    """Stand-in for ``pdftex -ini`` that writes the requested format."""
+    if cmd[:2] == ["pdftex", "--version"]:
+        return subprocess.CompletedProcess(cmd, 0, stdout="pdfTeX 3.141592653-2.6-1.40.26\n")
+    jobname = next(arg for arg in cmd if arg.startswith("-jobname=")).split("=", 1)[1]
+    Path(cwd, f"{jobname}.fmt").write_bytes(b"fmt")
+    return subprocess.CompletedProcess(cmd, 0)
+
+
+@pytest.fixture()
+def templates(tmp_path):
+    folder = tmp_path / "templates"
+    folder.mkdir()
+    (folder / "demo.tex").write_text(TEMPLATE, encoding="utf-8")
+    return folder
+
+
+@pytest.fixture()
+def cache(tmp_path, templates):
+    return FormatCache(templates_folder=templates, format_dir=tmp_path / "formats", enabled=True)
+
+
+@pytest.fixture()
+def pdftex():
+    with patch("core.FormatCache.subprocess.run", side_effect=_fake_pdftex) as mock_run:
+        yield mock_run
+
+
+def _build_calls(mock_run):
+    return [c for c in mock_run.call_args_list if "-ini" in c.args[0]]
+
+
+class TestSplitStaticPreamble:
+    def test_stops_before_hyperref(self):
+        assert split_static_preamble(TEMPLATE) == PREAMBLE
+
+    def test_stops_at_first_jinja_tag(self):
+        source = (
+            "\\documentclass{article}\n\\usepackage{xcolor}\n"
+            "\\def\\x{\\VAR{a}}\n\\begin{document}\n"
+        )
+        assert split_static_preamble(source) == "\\documentclass{article}\n\\usepackage{xcolor}\n"
+
+    def test_stops_at_begin_document(self):
+        source = "\\documentclass{article}\n\\begin{document}\nHi\n\\end{document}\n"
+        assert split_static_preamble(source) == "\\documentclass{article}\n"
+
+    def test_requires_documentclass(self):
+        assert split_static_preamble("\\VAR{x}\n\\documentclass{article}\n") is None
+
+    def test_requires_begin_document(self):
+        assert split_static_preamble("\\documentclass{article}\n") is None
+
+    @pytest.mark.parametrize(
+        "template", sorted(TEMPLATES_FOLDER.glob("*.tex")), ids=lambda p: p.stem
+    )
+    def test_every_shipped_template_has_a_preamble(self, template):
+        preamble = split_static_preamble(template.read_text(encoding="utf-8"))
+        assert preamble is not None
+        assert "\\begin{document}" not in preamble
+
+
+class TestGetFormat:
+    def test_builds_format_once(self, cache, pdftex):
+        first = cache.get_format("demo")
+        second = cache.get_format("demo")
+
+        assert first == second
+        assert first.exists()
+        assert first.parent == cache.format_dir
+        assert first.name.startswith("demo-")
+        assert len(_build_calls(pdftex)) == 1
+
+    def test_build_command_uses_mylatexformat_without_shell_escape(self, cache, pdftex):
+        cache.get_format("demo")
+        cmd = _build_calls(pdftex)[0].args[0]
+        assert cmd[:2] == ["pdftex", "-ini"]
+        assert "-no-shell-escape" in cmd
+        assert "&pdflatex" in cmd
+        assert "mylatexformat.ltx" in cmd
+
+    def test_dumped_source_ends_at_endofdump(self, cache, pdftex):
+        sources = []
+
+        def _capture(cmd, cwd=None, **kwargs):
+            if "-ini" in cmd:
+                sources.append(Path(cwd, cmd[-1]).read_text(encoding="utf-8"))
+            return _fake_pdftex(cmd, cwd=cwd, **kwargs)
+
+        pdftex.side_effect = _capture
+        cache.get_format("demo")
+        assert sources[0].startswith(PREAMBLE + ENDOFDUMP)
+
+    def test_template_change_rebuilds_and_prunes_old_format(self, cache, templates, pdftex):
+        old = cache.get_format("demo")
+        (templates / "demo.tex").write_text(
+            TEMPLATE.replace("geometry", "geometry,xcolor"), encoding="utf-8"
+        )
+
+        new = cache.get_format("demo")
+
+        assert new != old
+        assert new.exists()
+        assert not old.exists()
+
+    def test_failed_build_is_not_retried(self, cache, pdftex):
+        def _fail(cmd, **kwargs):
+            if "-ini" in cmd:
+                raise subprocess.CalledProcessError(1, cmd)
+            return _fake_pdftex(cmd, **kwargs)
+
+        pdftex.side_effect = _fail
+        assert cache.get_format("demo") is None
+        assert cache.get_format("demo") is None
+        assert len(_build_calls(pdftex)) == 1
+
+    def test_unknown_template(self, cache, pdftex):
+        assert cache.get_format("missing") is None
+
+    def test_build_all(self, cache, templates, pdftex):
+        (templates / "plain.tex").write_text("\\VAR{x}\n", encoding="utf-8")
+        assert cache.build_all() == {"demo": True, "plain": False}
+
+    def test_main_only_fails_on_errors_when_strict(self):
+        with patch("core.FormatCache.FormatCache.build_all", return_value={"demo": False}):
+            assert main([]) == 0
+            assert main(["--strict"]) == 1
+        with patch("core.FormatCache.FormatCache.build_all", return_value={"demo": True}):
+            assert main(["--strict"]) == 0
+
+
+class TestPrepare:
+    def test_inserts_endofdump_after_preamble(self, cache, pdftex):
+        fmt_file = cache.get_format("demo")
+        source, used = cache.prepare("demo", RENDERED)
+
+        assert used == fmt_file
+        assert source == PREAMBLE + ENDOFDUMP + RENDERED[len(PREAMBLE) :]
+
+    def test_missing_format_builds_in_background(self, cache, pdftex):
+        with patch("core.FormatCache.threading.Thread") as mock_thread:
+            source, used = cache.prepare("demo", RENDERED)
+
+        assert (source, used) == (RENDERED, None)
+        mock_thread.assert_called_once()
+        assert mock_thread.call_args.kwargs["target"] == cache.get_format
+        mock_thread.return_value.start.assert_called_once()
+
+    def test_modified_preamble_compiles_plain(self, cache, pdftex):
+        cache.get_format("demo")
+        tex = RENDERED.replace("geometry", "geometry,xcolor")
+        assert cache.prepare("demo", tex) == (tex, None)
+
+    def test_disabled(self, tmp_path, templates, pdftex):
+        disabled = FormatCache(templates_folder=templates, format_dir=tmp_path / "f", enabled=False)
+        assert disabled.prepare("demo", RENDERED) == (RENDERED, None)
+        assert disabled.build_all() == {}
+        pdftex.assert_not_called()
+
+    def test_without_template_id(self, cache, pdftex):
+        assert cache.prepare(None, RENDERED) == (RENDERED, None)
+
+    def test_invalidate_removes_format(self, cache, pdftex):
+        fmt_file = cache.get_format("demo")
+        cache.invalidate("demo")
+
+        assert not fmt_file.exists()
+        assert cache.get_format("demo") is None
+
+
+class TestPdfCompilerFormat:
+    def test_latexmk_told_to_load_format(self, tmp_path):
+        tex_file = tmp_path / "main.tex"
+        tex_file.write_text("x", encoding="utf-8")
+        compiler = PdfCompiler(tex_file, fmt_file=tmp_path / "demo-abc.fmt")
+
+        with patch.object(PdfCompiler, "_run") as mock_run:
+            compiler.compile(clean=False)
+
+        cmd = mock_run.call_args.args[0]
+        assert f"-pdflatex=pdflatex -fmt={tmp_path / 'demo-abc'} %O %S" in cmd
+        assert "-no-shell-escape" in cmd
+
+
+class TestCompilePoolWithFormats:
+    @pytest.fixture()
+    def compiled(self, monkeypatch):
+        calls = []
+
+        def _fake_compile(self, clean=True):
+            source = self.tex_file.read_text(encoding="utf-8")
+            calls.append((source, self.fmt_file))
+            if self.fmt_file is not None and "BROKEN" in self.fmt_file.name:
+                raise RuntimeError("LaTeX compilation failed.")
+            if "SLOW" in source:
+                raise CompileTimeoutError("LaTeX compilation timed out.")
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+
+        monkeypatch.setattr(PdfCompiler, "compile", _fake_compile)
+        return calls
+
+    def _pool(self, cache):
+        return CompilePool(max_workers=1, max_jobs_per_worker=None, format_cache=cache)
+
+    def test_compiles_with_format(self, cache, pdftex, compiled):
+        fmt_file = cache.get_format("demo")
+        pool = self._pool(cache)
+        try:
+            assert pool.compile(RENDERED, "demo") == FAKE_PDF
+        finally:
+            pool.shutdown()
+
+        source, used = compiled[0]
+        assert used == fmt_file
+        assert ENDOFDUMP in source
+
+    def test_falls_back_and_invalidates_broken_format(self, cache, pdftex, compiled):
+        fmt_file = cache.get_format("demo")
+        broken = fmt_file.with_name("BROKEN.fmt")
+        pool = self._pool(cache)
+        try:
+            with patch.object(cache, "prepare", return_value=(RENDERED, broken)):
+                assert pool.compile(RENDERED, "demo") == FAKE_PDF
+        finally:
+            pool.shutdown()
+
+        assert [used for _, used in compiled] == [broken, None]
+        assert not fmt_file.exists()
+
+    def test_timeout_is_not_retried(self, cache, pdftex, compiled):
+        cache.get_format("demo")
+        pool = self._pool(cache)
+        try:
+            with pytest.raises(CompileTimeoutError):
+                pool.compile(RENDERED + "SLOW", "demo")
+        finally:
+            pool.shutdown()
+
+        assert len(compiled) == 1
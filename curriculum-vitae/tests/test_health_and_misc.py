@@ -27,7 +27,60 @@ def api_client():
     app.dependency_overrides.clear()
 
 
+@pytest.fixture()
+def metrics_headers(monkeypatch):
+    import auth.dependencies as dependencies_module
+
+    monkeypatch.setattr(dependencies_module, "METRICS_TOKEN", "metrics-secret")
+    return {"X-Metrics-Token": "metrics-secret"}
+
+
 class TestHealthEndpoints:
+    def test_health_pdf_exposes_counters(self, api_client, metrics_headers):
+        resp = api_client.get("/health_pdf", headers=metrics_headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        assert {"hits", "misses", "evictions", "bytes"} <= data["pdf_cache"].keys()
+        assert "workers" in data["compile_pool"]
+        assert {"idle", "created", "discarded"} <= data["compile_workspaces"].keys()
+        assert {"workers", "queued", "timeouts"} <= data["text_extraction"].keys()
+
+    def test_health_pdf_is_hidden_without_metrics_token(self, api_client, metrics_headers):
+        assert api_client.get("/health_pdf").status_code == 404
+        resp = api_client.get("/health_pdf", headers={"X-Metrics-Token": "wrong"})
+        assert resp.status_code == 404
+
+    def test_health_pdf_is_disabled_without_configured_token(self, api_client):
+        resp = api_client.get("/health_pdf", headers={"X-Metrics-Token": ""})
+        assert resp.status_code == 404
+
+    def test_health_db_does_not_expose_the_pool(self, api_client):
+        resp = api_client.get("/health_db")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ok", "database": "connected"}
+
+    def test_health_db_pool_exposes_pool_counters(self, api_client, metrics_headers):
+        assert api_client.get("/health_db_pool").status_code == 404
+        resp = api_client.get("/health_db_pool", headers=metrics_headers)
+        assert resp.status_code == 200
+        assert {"checkouts", "in_use"} <= resp.json()["pool"].keys()
+
+    def test_health_email_exposes_outbox_counters(self, api_client, metrics_headers, monkeypatch):
+        import fakeredis
+
+        import core.EmailOutbox as email_outbox_module
+
+        outbox = email_outbox_module.EmailOutbox(fakeredis.FakeRedis(decode_responses=True))
+        monkeypatch.setattr(email_outbox_module, "_email_outbox", outbox)
+        outbox.enqueue("user@example.com", "S", "<p>B</p>")
+
+        assert api_client.get("/health_email").status_code == 404
+        resp = api_client.get("/health_email", headers=metrics_headers)
+        assert resp.status_code == 200
+        data = resp.json()["email_outbox"]
+        assert data["queued"] == 1
+        assert {"enqueued", "sent", "retried", "dead_lettered", "dead_letters"} <= data.keys()
+
     def test_api_health(self, api_client):
         resp = api_client.get("/api/health")
         assert resp.status_code == 200
@@ -71,6 +124,37 @@ class TestCORS:
         )
         assert resp.status_code == 200
 
+    def test_cors_preflight_allows_conditional_patch(self, api_client):
+        resp = api_client.options(
+            "/api/resumes/1",
+            headers={
+                "Origin": "http://localhost:5173",
+                "Access-Control-Request-Method": "PATCH",
+                "Access-Control-Request-Headers": "If-Match",
+            },
+        )
+        assert resp.status_code == 200
+        assert "PATCH" in resp.headers["access-control-allow-methods"]
+        assert "if-match" in resp.headers["access-control-allow-headers"].lower()
+
+    def test_cors_preflight_allows_etag_validators(self, api_client):
+        resp = api_client.options(
+            "/api/resumes/1",
+            headers={
+                "Origin": "http://localhost:5173",
+                "Access-Control-Request-Method": "GET",
+                "Access-Control-Request-Headers": "If-None-Match, If-Match",
+            },
+        )
+        assert resp.status_code == 200
+        allowed = resp.headers["access-control-allow-headers"].lower()
+        assert "if-none-match" in allowed
+        assert "if-match" in allowed
+
+    def test_cors_exposes_etag(self, api_client):
+        resp = api_client.get("/api/health", headers={"Origin": "http://localhost:5173"})
+        assert "etag" in resp.headers["access-control-expose-headers"].lower()
+
     def test_cors_allowed_origin(self, api_client):
         resp = api_client.get(
             "/api/health",
@@ -1,6 +1,6 @@
 """Tests for HTTP header helpers."""
 
-from core.http_headers import build_content_disposition
+from core.http_headers import build_content_disposition, etag_matches
 
 
 class TestContentDisposition:
@@ -24,3 +24,14 @@ class TestContentDisposition:
         header = build_content_disposition("My CV 2024.pdf", disposition="inline", default="resume.pdf")
         assert "filename*=" in header
         assert "My%20CV%202024.pdf" in header
+
+
+class TestEtagMatches:
+    def test_lists_and_wildcard(self):
+        assert etag_matches('"v1", "v2"', '"v2"')
+        assert not etag_matches('"v1"', '"v2"')
+        assert etag_matches("*", '"v2"')
+
+    def test_weak_comparison_ignores_weak_prefix(self):
+        assert etag_matches('W/"v1"', '"v1"', weak=True)
+        assert not etag_matches('W/"v1"', '"v1"')
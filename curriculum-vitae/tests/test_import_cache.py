@@ -0,0 +1,86 @@
+"""Tests for ImportCache — text normalization, prompt versioning, TTL and Redis failures."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+import redis
+
+from core.ImportCache import REDIS_KEY_PREFIX, ImportCache, get_import_cache
+
+RESULT = {"personal": {"name": "Jane Doe"}, "sections": [{"id": "sec-1"}]}
+
+
+@pytest.fixture()
+def fake_redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture()
+def cache(fake_redis):
+    return ImportCache(fake_redis, ttl=60)
+
+
+class TestKey:
+    def test_whitespace_and_unicode_form_ignored(self):
+        composed = "Café  Manager\n\nParis "
+        decomposed = " Café Manager\tParis"
+        assert ImportCache.key(composed, "v1", 1) == ImportCache.key(decomposed, "v1", 1)
+
+    def test_text_changes_key(self):
+        assert ImportCache.key("Jane Doe", "v1", 1) != ImportCache.key("John Doe", "v1", 1)
+
+    def test_prompt_version_changes_key(self):
+        assert ImportCache.key("Jane Doe", "v1", 1) != ImportCache.key("Jane Doe", "v2", 1)
+
+    def test_users_do_not_share_keys(self):
+        assert ImportCache.key("Jane Doe", "v1", 1) != ImportCache.key("Jane Doe", "v1", 2)
+
+    def test_prompt_version_covers_prompt_and_model(self):
+        version = ImportCache.prompt_version("prompt", "mistral-small-latest")
+        assert version != ImportCache.prompt_version("prompt v2", "mistral-small-latest")
+        assert version != ImportCache.prompt_version("prompt", "mistral-large-latest")
+        assert version == ImportCache.prompt_version("prompt", "mistral-small-latest")
+
+
+class TestStorage:
+    def test_round_trip(self, cache):
+        key = cache.key("Jane Doe", "v1", 1)
+        assert cache.get(key) is None
+        cache.put(key, RESULT)
+        assert cache.get(key) == RESULT
+        assert cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_entries_expire(self, cache, fake_redis):
+        key = cache.key("Jane Doe", "v1", 1)
+        cache.put(key, RESULT)
+        assert 0 < fake_redis.ttl(REDIS_KEY_PREFIX + key) <= 60
+
+    def test_corrupt_entry_is_a_miss(self, cache, fake_redis):
+        fake_redis.set(REDIS_KEY_PREFIX + "k", "not json")
+        assert cache.get("k") is None
+
+    def test_async_round_trip(self, cache):
+        async def scenario():
+            await cache.put_async("k", RESULT)
+            return await cache.get_async("k")
+
+        assert asyncio.run(scenario()) == RESULT
+
+    def test_disabled_without_redis(self):
+        cache = ImportCache(None)
+        cache.put("k", RESULT)
+        assert cache.get("k") is None
+
+    def test_redis_errors_are_misses(self):
+        client = MagicMock()
+        client.get.side_effect = redis.ConnectionError("down")
+        client.set.side_effect = redis.ConnectionError("down")
+        cache = ImportCache(client)
+        cache.put("k", RESULT)
+        assert cache.get("k") is None
+
+
+def test_get_import_cache_returns_singleton():
+    assert get_import_cache() is get_import_cache()
@@ -1,5 +1,6 @@
 """Tests for /import and /import-stream endpoints."""
 
+import json
 import os
 from types import SimpleNamespace
 
@@ -9,13 +10,16 @@ os.environ.setdefault("DATABASE_URL", "sqlite://")
 import pytest
 from fastapi.testclient import TestClient
 
-from app import app
+import app as app_module
+from app import MAX_IMPORTS_PER_USER, app
 from auth.dependencies import get_current_user
+from core.PromptRegistry import CV_IMPORT_PROMPT, PromptRegistry
 
 
 @pytest.fixture()
 def api_client():
     app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1,
         is_guest=False,
         is_premium=False,
         bonus_downloads=0,
@@ -97,3 +101,192 @@ class TestImportStreamEndpoint:
     def test_rejects_no_file(self, api_client):
         resp = api_client.post("/import-stream")
         assert resp.status_code == 422
+
+
+class FakeMistralClient:
+    """Stands in for the shared MistralClient, replaying a canned response."""
+
+    model = "mistral-small-latest"
+
+    USAGE = SimpleNamespace(
+        prompt_tokens=1200,
+        additional_properties={"prompt_tokens_details": {"cached_tokens": 1000}},
+    )
+
+    def __init__(self, content: str, chunk_size: int = 3):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.calls = []
+
+    async def complete(self, messages, on_usage=None, **kwargs):
+        self.calls.append(("complete", messages, kwargs))
+        if on_usage is not None:
+            on_usage(self.USAGE)
+        return self.content
+
+    async def stream(self, messages, on_usage=None, **kwargs):
+        self.calls.append(("stream", messages, kwargs))
+        for i in range(0, len(self.content), self.chunk_size):
+            yield self.content[i : i + self.chunk_size]
+        if on_usage is not None:
+            on_usage(self.USAGE)
+
+    async def aclose(self):
+        pass
+
+
+def _sse_events(body: str) -> list[dict]:
+    return [json.loads(line[len("data: ") :]) for line in body.splitlines() if line]
+
+
+class TestImportWithMistral:
+    RESULT = {
+        "personal": {"name": "Jane Doe", "links": []},
+        "sections": [
+            {"id": "sec-1", "type": "summary", "title": "Summary", "items": "Hi {x}"},
+            {"id": "sec-2", "type": "skills", "title": "Skills", "items": [{"id": "sk-1"}]},
+            {"id": "sec-1", "type": "summary", "title": "Duplicate", "items": ""},
+        ],
+        "template_id": "harvard",
+    }
+
+    @pytest.fixture(autouse=True)
+    def _prompt_registry(self):
+        self.prompts = PromptRegistry()
+
+    @pytest.fixture()
+    def mistral(self, monkeypatch):
+        monkeypatch.setenv("MISTRAL_API_KEY", "test-key")
+        monkeypatch.setattr(app_module, "get_prompt_registry", lambda: self.prompts)
+
+        async def extract(_):
+            return "CV"
+
+        monkeypatch.setattr(app_module, "_extract_text_from_pdf_with_limits", extract)
+        fake = FakeMistralClient(json.dumps(self.RESULT, indent=2))
+        monkeypatch.setattr(app_module, "get_mistral_client", lambda: fake)
+        return fake
+
+    def test_import_uses_async_completion(self, api_client, mistral):
+        resp = api_client.post(
+            "/import",
+            files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+        )
+        assert resp.status_code == 200
+        assert resp.json() == self.RESULT
+        (kind, messages, kwargs) = mistral.calls[0]
+        assert kind == "complete"
+        assert messages == CV_IMPORT_PROMPT.messages("CV")
+        assert kwargs == {"response_format": {"type": "json_object"}}
+
+    @pytest.mark.parametrize("path", ["/import", "/import-stream"])
+    def test_records_prompt_cache_usage(self, api_client, mistral, path):
+        api_client.post(path, files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")})
+        assert self.prompts.stats() == {
+            CV_IMPORT_PROMPT.key: {
+                "requests": 1,
+                "prompt_tokens": 1200,
+                "cached_prompt_tokens": 1000,
+            }
+        }
+
+    def test_emits_personal_then_each_section_once(self, api_client, mistral):
+        resp = api_client.post(
+            "/import-stream",
+            files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+        )
+        assert resp.status_code == 200
+        events = _sse_events(resp.text)
+
+        assert [e["type"] for e in events] == [
+            "status",
+            "status",
+            "personal",
+            "section",
+            "section",
+            "complete",
+        ]
+        assert events[2]["data"] == self.RESULT["personal"]
+        assert [e["data"]["id"] for e in events[3:5]] == ["sec-1", "sec-2"]
+        assert events[3]["data"]["title"] == "Summary"
+        assert events[-1]["data"] == self.RESULT
+
+    def test_reupload_replays_cached_import(self, api_client, mistral, import_cache):
+        for _ in range(2):
+            resp = api_client.post(
+                "/import",
+                files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+            )
+            assert resp.json() == self.RESULT
+        assert len(mistral.calls) == 1
+        assert import_cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_stream_reupload_replays_same_events(self, api_client, mistral):
+        bodies = [
+            api_client.post(
+                "/import-stream",
+                files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+            ).text
+            for _ in range(2)
+        ]
+        assert len(mistral.calls) == 1
+        assert _sse_events(bodies[1]) == _sse_events(bodies[0])
+
+    def test_endpoints_share_cached_imports(self, api_client, mistral):
+        for path in ("/import", "/import-stream"):
+            resp = api_client.post(
+                path, files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")}
+            )
+        # Same prompt: the stream replays the import made through /import
+        assert [kind for kind, *_ in mistral.calls] == ["complete"]
+        assert _sse_events(resp.text)[-1] == {"type": "complete", "data": self.RESULT}
+
+    @pytest.mark.parametrize("path", ["/import", "/import-stream"])
+    def test_user_at_quota_still_gets_cached_import(self, api_client, mistral, monkeypatch, path):
+        api_client.post(
+            "/import", files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")}
+        )
+        user = SimpleNamespace(
+            id=1,
+            is_guest=False,
+            is_premium=False,
+            import_count=MAX_IMPORTS_PER_USER,
+            bonus_imports=0,
+        )
+        app.dependency_overrides[get_current_user] = lambda: user
+
+        resp = api_client.post(
+            path, files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")}
+        )
+        assert resp.status_code == 200
+        if path == "/import":
+            assert resp.json() == self.RESULT
+        else:
+            assert _sse_events(resp.text)[-1] == {"type": "complete", "data": self.RESULT}
+        assert len(mistral.calls) == 1
+        assert user.import_count == MAX_IMPORTS_PER_USER
+
+        async def extract_other(_):
+            return "Another CV"
+
+        monkeypatch.setattr(app_module, "_extract_text_from_pdf_with_limits", extract_other)
+        resp = api_client.post(
+            path, files={"file": ("other.pdf", b"%PDF-1.4 other", "application/pdf")}
+        )
+        assert resp.status_code == 429
+        assert len(mistral.calls) == 1
+
+    def test_invalid_response_not_cached(self, api_client, mistral, import_cache):
+        mistral.content = "not json"
+        resp = api_client.post(
+            "/import-stream",
+            files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+        )
+        assert _sse_events(resp.text)[-1]["type"] == "error"
+        assert import_cache.stats()["hits"] == 0
+        mistral.content = json.dumps(self.RESULT)
+        api_client.post(
+            "/import-stream",
+            files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+        )
+        assert len(mistral.calls) == 2
@@ -0,0 +1,118 @@
+"""Tests for JsonEventParser — incremental extraction of personal/sections from a token stream."""
+
+import json
+import random
+
+import pytest
+
+from benchmarks.bench_import_stream import replay, synthetic_stream
+from benchmarks.resumes import TYPICAL
+from core.JsonEventParser import JsonEventParser
+
+DOCUMENT = {
+    "personal": {"name": 'Jane "JD" Doe {]', "links": [{"url": "https://x.dev"}]},
+    "sections": [
+        {"id": "sec-1", "type": "summary", "items": 'Back\\slash and "quotes" }'},
+        {"id": "sec-2", "type": "experiences", "items": [{"highlights": ["a", "b"]}]},
+    ],
+    "template_id": "harvard",
+}
+
+
+def _parser():
+    return JsonEventParser(objects=("personal",), arrays=("sections",))
+
+
+def _feed_all(parser, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+def _expected(document):
+    return [("personal", document["personal"])] + [
+        ("sections", section) for section in document["sections"]
+    ]
+
+
+class TestEvents:
+    def test_whole_document_in_one_chunk(self):
+        assert _feed_all(_parser(), [json.dumps(DOCUMENT)]) == _expected(DOCUMENT)
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_chunk_boundaries(self, seed):
+        rng = random.Random(seed)
+        text = json.dumps(DOCUMENT, indent=rng.choice([None, 2]))
+        chunks = []
+        pos = 0
+        while pos < len(text):
+            size = rng.randint(1, 8)
+            chunks.append(text[pos : pos + size])
+            pos += size
+        assert _feed_all(_parser(), chunks) == _expected(DOCUMENT)
+
+    def test_one_character_at_a_time(self):
+        text = json.dumps(DOCUMENT, ensure_ascii=False)
+        assert _feed_all(_parser(), list(text)) == _expected(DOCUMENT)
+
+    def test_emitted_as_soon_as_value_closes(self):
+        parser = _parser()
+        text = json.dumps(DOCUMENT)
+        personal_end = text.index('"sections"')
+        assert parser.feed(text[:personal_end]) == [("personal", DOCUMENT["personal"])]
+        first_section_end = text.index('{"id": "sec-2"')
+        assert parser.feed(text[personal_end:first_section_end]) == [
+            ("sections", DOCUMENT["sections"][0])
+        ]
+
+    def test_each_value_emitted_once(self):
+        parser = _parser()
+        events = _feed_all(parser, [json.dumps(DOCUMENT)])
+        assert parser.feed("") == []
+        assert len(events) == 3
+
+    def test_incomplete_value_not_emitted(self):
+        parser = _parser()
+        assert parser.feed('{"personal": {"name": "Ja') == []
+        assert parser.feed('ne"}') == [("personal", {"name": "Jane"})]
+
+
+class TestTargets:
+    def test_nested_keys_with_same_name_ignored(self):
+        text = json.dumps({"meta": {"personal": {"x": 1}, "sections": [{"id": "n"}]}})
+        assert _feed_all(_parser(), [text]) == []
+
+    def test_strings_that_look_like_keys_ignored(self):
+        text = json.dumps({"summary": '"personal": {"a": 1}', "sections": []})
+        assert _feed_all(_parser(), [text]) == []
+
+    def test_scalar_values_ignored(self):
+        text = json.dumps({"personal": "n/a", "sections": ["x", 1, {"id": "sec-1"}]})
+        assert _feed_all(_parser(), [text]) == [("sections", {"id": "sec-1"})]
+
+    def test_escaped_key(self):
+        parser = JsonEventParser(objects=("pérsonal",))
+        assert _feed_all(parser, ['{"p\\u00e9rs', 'onal": {"a": 1}}']) == [("pérsonal", {"a": 1})]
+
+    def test_leading_noise_ignored(self):
+        assert _feed_all(_parser(), ['  \n{"personal": {}}']) == [("personal", {})]
+
+
+class TestText:
+    def test_text_is_everything_fed(self):
+        parser = _parser()
+        chunks = ['{"pers', 'onal": {}', ', "sections": []}']
+        _feed_all(parser, chunks)
+        assert parser.text == "".join(chunks)
+        assert json.loads(parser.text) == {"personal": {}, "sections": []}
+
+    def test_empty(self):
+        assert _parser().text == ""
+
+
+class TestReplayBenchmark:
+    def test_synthetic_stream_replays_every_section(self):
+        deltas = synthetic_stream(TYPICAL)
+        assert "".join(deltas) == json.dumps(TYPICAL, indent=2, ensure_ascii=False)
+        assert replay(deltas) == 1 + len(TYPICAL["sections"])
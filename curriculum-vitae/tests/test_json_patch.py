@@ -0,0 +1,117 @@
+"""Tests for core/JsonPatch.py — RFC 6902 operations over RFC 6901 pointers."""
+
+import copy
+
+import pytest
+
+from core.JsonPatch import JsonPatchError, apply_patch, parse_pointer
+
+DOCUMENT = {
+    "personal": {"name": "Alice", "links": ["https://a.dev"]},
+    "sections": [
+        {"id": "sec-1", "title": "Experience", "items": [{"role": "Dev"}]},
+        {"id": "sec-2", "title": "Skills", "items": []},
+    ],
+    "template_id": "harvard",
+}
+
+
+def _apply(operations):
+    document = copy.deepcopy(DOCUMENT)
+    patched = apply_patch(document, operations)
+    assert document == DOCUMENT, "the input document must not be modified"
+    return patched
+
+
+class TestParsePointer:
+    def test_root(self):
+        assert parse_pointer("") == []
+
+    def test_escapes(self):
+        assert parse_pointer("/a~1b/m~0n/0") == ["a/b", "m~n", "0"]
+
+    def test_must_start_with_slash(self):
+        with pytest.raises(JsonPatchError):
+            parse_pointer("sections/0")
+
+
+class TestOperations:
+    def test_replace_member(self):
+        patched = _apply([{"op": "replace", "path": "/personal/name", "value": "Bob"}])
+        assert patched["personal"]["name"] == "Bob"
+
+    def test_add_member_and_array_element(self):
+        patched = _apply(
+            [
+                {"op": "add", "path": "/personal/title", "value": "Engineer"},
+                {"op": "add", "path": "/sections/1/items/-", "value": "Python"},
+                {"op": "add", "path": "/sections/0/items/0", "value": {"role": "Intern"}},
+            ]
+        )
+        assert patched["personal"]["title"] == "Engineer"
+        assert patched["sections"][1]["items"] == ["Python"]
+        assert [item["role"] for item in patched["sections"][0]["items"]] == ["Intern", "Dev"]
+
+    def test_remove(self):
+        patched = _apply([{"op": "remove", "path": "/sections/0"}])
+        assert [s["id"] for s in patched["sections"]] == ["sec-2"]
+
+    def test_move_reorders_sections(self):
+        patched = _apply([{"op": "move", "from": "/sections/0", "path": "/sections/1"}])
+        assert [s["id"] for s in patched["sections"]] == ["sec-2", "sec-1"]
+
+    def test_copy_is_independent(self):
+        patched = _apply([{"op": "copy", "from": "/sections/0", "path": "/sections/-"}])
+        patched["sections"][2]["items"].append("x")
+        assert patched["sections"][0]["items"] == [{"role": "Dev"}]
+
+    def test_replace_whole_document(self):
+        assert _apply([{"op": "replace", "path": "", "value": {"a": 1}}]) == {"a": 1}
+
+    def test_untouched_parts_are_shared(self):
+        patched = apply_patch(
+            DOCUMENT, [{"op": "replace", "path": "/sections/0/title", "value": "X"}]
+        )
+        assert patched["personal"] is DOCUMENT["personal"]
+        assert patched["sections"][1] is DOCUMENT["sections"][1]
+        assert patched["sections"][0] is not DOCUMENT["sections"][0]
+
+    def test_test_operation(self):
+        assert _apply([{"op": "test", "path": "/template_id", "value": "harvard"}]) == DOCUMENT
+
+    def test_test_operation_distinguishes_booleans_from_numbers(self):
+        with pytest.raises(JsonPatchError, match="differs"):
+            apply_patch({"a": 1}, [{"op": "test", "path": "/a", "value": True}])
+
+
+class TestErrors:
+    @pytest.mark.parametrize(
+        "operation",
+        [
+            {"op": "replace", "path": "/personal/missing", "value": 1},
+            {"op": "remove", "path": "/sections/5"},
+            {"op": "add", "path": "/sections/3", "value": {}},
+            {"op": "add", "path": "/sections/01", "value": {}},
+            {"op": "add", "path": "/nothing/child", "value": 1},
+            {"op": "add", "path": "/template_id/child", "value": 1},
+            {"op": "replace", "path": "/personal/name"},
+            {"op": "move", "path": "/x"},
+            {"op": "move", "from": "/personal", "path": "/personal/links/0"},
+            {"op": "frobnicate", "path": "/x"},
+        ],
+    )
+    def test_invalid_operation(self, operation):
+        with pytest.raises(JsonPatchError):
+            _apply([operation])
+
+    def test_failed_patch_is_atomic(self):
+        document = copy.deepcopy(DOCUMENT)
+        with pytest.raises(JsonPatchError, match="Operation 1"):
+            apply_patch(
+                document,
+                [
+                    {"op": "replace", "path": "/personal/name", "value": "Bob"},
+                    {"op": "test", "path": "/template_id", "value": "europass"},
+                ],
+            )
+        assert document == DOCUMENT
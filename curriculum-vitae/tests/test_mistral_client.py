@@ -0,0 +1,208 @@
+"""Tests for MistralClient — shared keep-alive client, concurrency cap, timeouts and retries."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.MistralClient import MistralClient, get_mistral_client
+
+MESSAGES = [{"role": "user", "content": "CV"}]
+
+
+def _completion(content):
+    return {
+        "id": "cmpl",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "mistral-small-latest",
+        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+    }
+
+
+def _stream_body(deltas):
+    lines = []
+    for delta in deltas:
+        chunk = {
+            "id": "cmpl",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "mistral-small-latest",
+            "choices": [{"index": 0, "delta": {"content": delta}, "finish_reason": None}],
+        }
+        lines.append(f"data: {json.dumps(chunk)}\n\n")
+    usage_chunk = {
+        "id": "cmpl",
+        "object": "chat.completion.chunk",
+        "created": 0,
+        "model": "mistral-small-latest",
+        "choices": [{"index": 0, "delta": {"content": ""}, "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8},
+    }
+    lines.append(f"data: {json.dumps(usage_chunk)}\n\n")
+    lines.append("data: [DONE]\n\n")
+    return "".join(lines)
+
+
+class FakeApi:
+    """MockTransport handler recording requests; responses can be queued per call."""
+
+    def __init__(self, delay=0.0):
+        self.requests = []
+        self.responses = []
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, request):
+        self.requests.append(request)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.responses:
+                response = self.responses.pop(0)
+                if isinstance(response, Exception):
+                    raise response
+                return response
+            if json.loads(request.content).get("stream"):
+                return httpx.Response(
+                    200,
+                    text=_stream_body(['{"a"', "", ": 1}"]),
+                    headers={"content-type": "text/event-stream"},
+                )
+            return httpx.Response(200, json=_completion('{"ok": true}'))
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture()
+def api():
+    return FakeApi()
+
+
+def _client(api, **kwargs):
+    kwargs.setdefault("api_key", "test-key")
+    kwargs.setdefault("retry_max_elapsed", 0)
+    return MistralClient(transport=httpx.MockTransport(api), **kwargs)
+
+
+class TestCalls:
+    def test_complete_returns_content(self, api):
+        client = _client(api)
+        assert asyncio.run(client.complete(MESSAGES)) == '{"ok": true}'
+        body = json.loads(api.requests[0].content)
+        assert body["model"] == "mistral-small-latest"
+        assert body["messages"] == MESSAGES
+
+    def test_extra_arguments_forwarded(self, api):
+        client = _client(api, model="mistral-large-latest")
+        asyncio.run(client.complete(MESSAGES, response_format={"type": "json_object"}))
+        body = json.loads(api.requests[0].content)
+        assert body["model"] == "mistral-large-latest"
+        assert body["response_format"] == {"type": "json_object"}
+
+    def test_stream_yields_non_empty_deltas(self, api):
+        client = _client(api)
+
+        async def collect():
+            return [delta async for delta in client.stream(MESSAGES)]
+
+        assert asyncio.run(collect()) == ['{"a"', ": 1}"]
+
+    def test_usage_reported(self, api):
+        client = _client(api)
+        usages = []
+
+        async def scenario():
+            await client.complete(MESSAGES, on_usage=usages.append)
+            async for _ in client.stream(MESSAGES, on_usage=usages.append):
+                pass
+
+        asyncio.run(scenario())
+        assert [usage.prompt_tokens for usage in usages] == [1, 5]
+
+    def test_api_key_read_from_environment_at_call_time(self, api, monkeypatch):
+        client = _client(api, api_key=None)
+        monkeypatch.setenv("MISTRAL_API_KEY", "rotated-key")
+        asyncio.run(client.complete(MESSAGES))
+        assert api.requests[0].headers["authorization"] == "Bearer rotated-key"
+
+
+class TestConnectionReuse:
+    def test_one_http_client_per_event_loop(self, api):
+        client = _client(api)
+
+        async def scenario():
+            await client.complete(MESSAGES)
+            first = client._get_client()
+            await client.complete(MESSAGES)
+            return first, client._get_client()
+
+        first, second = asyncio.run(scenario())
+        assert first[0] is second[0]
+
+    def test_aclose_drops_the_loop_client(self, api):
+        client = _client(api)
+
+        async def scenario():
+            await client.complete(MESSAGES)
+            await client.aclose()
+            return len(client._clients)
+
+        assert asyncio.run(scenario()) == 0
+
+
+class TestConcurrency:
+    def test_rejects_zero_concurrency(self):
+        with pytest.raises(ValueError, match="max_concurrency"):
+            MistralClient(max_concurrency=0)
+
+    def test_in_flight_calls_capped(self):
+        api = FakeApi(delay=0.02)
+        client = _client(api, max_concurrency=2)
+
+        async def scenario():
+            await asyncio.gather(*(client.complete(MESSAGES) for _ in range(6)))
+
+        asyncio.run(scenario())
+        assert len(api.requests) == 6
+        assert api.peak == 2
+
+
+class TestFailures:
+    def test_server_error_retried(self, api):
+        api.responses = [httpx.Response(503, json={"message": "busy"})]
+        client = _client(api, retry_max_elapsed=5)
+        assert asyncio.run(client.complete(MESSAGES)) == '{"ok": true}'
+        assert len(api.requests) == 2
+
+    def test_no_retry_when_disabled(self, api):
+        api.responses = [httpx.Response(503, json={"message": "busy"})]
+        client = _client(api)
+        with pytest.raises(Exception, match="503|busy"):
+            asyncio.run(client.complete(MESSAGES))
+        assert len(api.requests) == 1
+
+    def test_timeout_propagates(self, api):
+        api.responses = [httpx.ReadTimeout("too slow")]
+        client = _client(api, timeout=0.5)
+        with pytest.raises(httpx.TimeoutException):
+            asyncio.run(client.complete(MESSAGES))
+
+    def test_timeout_passed_to_each_call(self, api):
+        client = _client(api, timeout=7)
+        asyncio.run(client.complete(MESSAGES))
+        assert api.requests[0].extensions["timeout"]["read"] == 7
+
+
+def test_get_mistral_client_returns_singleton():
+    assert get_mistral_client() is get_mistral_client()
@@ -0,0 +1,227 @@
+"""Tests for /optimal-size — size priority order, speculative compilation and page counts."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+import app as app_module
+from core.PageEstimator import PageEstimator, layout_units
+from core.PdfCompiler import CompiledPdf, CompileMetadata
+from tests.conftest import auth_header, create_authenticated_user
+
+RESUME = {
+    "personal": {"name": "Size User"},
+    "sections": [],
+    "template_id": "harvard",
+    "lang": "fr",
+}
+
+
+@pytest.fixture(autouse=True)
+def estimator(monkeypatch):
+    """Uncalibrated by default, so every size goes through compilation."""
+    page_estimator = PageEstimator()
+    monkeypatch.setattr(app_module, "get_page_estimator", lambda: page_estimator)
+    return page_estimator
+
+
+@pytest.fixture()
+def headers(client):
+    return auth_header(create_authenticated_user(client))
+
+
+@pytest.fixture()
+def fake_pages(monkeypatch):
+    """Stub compilation: page counts per template id, plus a log of started/finished jobs."""
+    state = {"pages": {}, "delays": {}, "started": [], "finished": [], "peak": 0, "running": 0}
+
+    async def _fake_generate(data, template_id):
+        state["started"].append(template_id)
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            await asyncio.sleep(state["delays"].get(template_id, 0.01))
+            page_count = state["pages"][template_id]
+            if isinstance(page_count, Exception):
+                raise page_count
+            state["finished"].append(template_id)
+            return b"%PDF", page_count
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(app_module, "generate_pdf_and_count_pages", _fake_generate)
+    return state
+
+
+def _post(client, headers):
+    resp = client.post("/optimal-size?preview=true", json=RESUME, headers=headers)
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+@pytest.mark.parametrize("speculative", [True, False])
+class TestPriorityOrder:
+    @pytest.fixture(autouse=True)
+    def _mode(self, monkeypatch, speculative):
+        monkeypatch.setattr(app_module, "OPTIMAL_SIZE_SPECULATIVE", speculative)
+
+    def test_prefers_large_when_it_fits(self, client, headers, fake_pages):
+        fake_pages["pages"] = {"harvard_large": 1, "harvard": 1, "harvard_compact": 1}
+        body = _post(client, headers)
+        assert body["optimal_size"] == "large"
+        assert body["template_id"] == "harvard_large"
+        assert [t["size"] for t in body["tested_sizes"]] == ["large"]
+
+    def test_falls_back_to_normal(self, client, headers, fake_pages):
+        fake_pages["pages"] = {"harvard_large": 2, "harvard": 1, "harvard_compact": 1}
+        body = _post(client, headers)
+        assert body["optimal_size"] == "normal"
+        assert [t["page_count"] for t in body["tested_sizes"]] == [2, 1]
+
+    def test_compact_when_nothing_fits(self, client, headers, fake_pages):
+        fake_pages["pages"] = {"harvard_large": 3, "harvard": 2, "harvard_compact": 2}
+        body = _post(client, headers)
+        assert body["optimal_size"] == "compact"
+        assert body["template_id"] == "harvard_compact"
+        assert len(body["tested_sizes"]) == 3
+
+    def test_compile_error_recorded_and_skipped(self, client, headers, fake_pages):
+        fake_pages["pages"] = {
+            "harvard_large": RuntimeError("LaTeX compilation failed."),
+            "harvard": 1,
+            "harvard_compact": 1,
+        }
+        body = _post(client, headers)
+        assert body["optimal_size"] == "normal"
+        assert "error" in body["tested_sizes"][0]
+
+
+class TestSpeculative:
+    @pytest.fixture(autouse=True)
+    def _speculative(self, monkeypatch):
+        monkeypatch.setattr(app_module, "OPTIMAL_SIZE_SPECULATIVE", True)
+
+    def test_all_sizes_compile_concurrently(self, client, headers, fake_pages):
+        fake_pages["pages"] = {"harvard_large": 2, "harvard": 2, "harvard_compact": 1}
+        _post(client, headers)
+        assert fake_pages["peak"] == 3
+
+    def test_fast_fallback_waits_for_higher_priority(self, client, headers, fake_pages):
+        # compact finishes first, but large still wins when it fits
+        fake_pages["pages"] = {"harvard_large": 1, "harvard": 1, "harvard_compact": 1}
+        fake_pages["delays"] = {"harvard_large": 0.1, "harvard": 0.05, "harvard_compact": 0.0}
+        assert _post(client, headers)["optimal_size"] == "large"
+
+    def test_unneeded_compiles_are_cancelled(self, client, headers, fake_pages):
+        fake_pages["pages"] = {"harvard_large": 1, "harvard": 1, "harvard_compact": 1}
+        fake_pages["delays"] = {"harvard_large": 0.0, "harvard": 5, "harvard_compact": 5}
+        _post(client, headers)
+        assert fake_pages["finished"] == ["harvard_large"]
+        assert fake_pages["running"] == 0
+
+
+class TestSequential:
+    def test_stops_after_first_fit(self, client, headers, fake_pages, monkeypatch):
+        monkeypatch.setattr(app_module, "OPTIMAL_SIZE_SPECULATIVE", False)
+        fake_pages["pages"] = {"harvard_large": 1, "harvard": 1, "harvard_compact": 1}
+        _post(client, headers)
+        assert fake_pages["started"] == ["harvard_large"]
+        assert fake_pages["peak"] == 1
+
+
+class TestEstimator:
+    """Calibrated templates only compile the sizes close to the one-page boundary."""
+
+    @pytest.fixture(autouse=True)
+    def _sequential(self, monkeypatch):
+        monkeypatch.setattr(app_module, "OPTIMAL_SIZE_SPECULATIVE", False)
+        monkeypatch.setattr(app_module, "PAGE_ESTIMATOR_ENABLED", True)
+
+    @staticmethod
+    def _calibrate(estimator, **pages_by_template):
+        # Capacity chosen so that the resume's estimate equals the requested page count
+        units = layout_units(app_module.ResumeData(**RESUME).model_dump())
+        estimator.calibration = {
+            template_id: {"capacity": units / pages, "margin": 0.1}
+            for template_id, pages in pages_by_template.items()
+        }
+
+    def test_confident_fit_skips_compilation(self, client, headers, fake_pages, estimator):
+        self._calibrate(estimator, harvard_large=0.5)
+        body = _post(client, headers)
+
+        assert body["optimal_size"] == "large"
+        assert body["tested_sizes"] == [
+            {"size": "large", "template_id": "harvard_large", "estimated_pages": 0.5}
+        ]
+        assert fake_pages["started"] == []
+
+    def test_confident_overflow_skipped(self, client, headers, fake_pages, estimator):
+        self._calibrate(estimator, harvard_large=1.6, harvard=0.97, harvard_compact=0.6)
+        fake_pages["pages"] = {"harvard": 1}
+        body = _post(client, headers)
+
+        assert body["optimal_size"] == "normal"
+        assert fake_pages["started"] == ["harvard"]
+        assert body["tested_sizes"][0]["estimated_pages"] == 1.6
+
+    def test_boundary_miss_falls_back_to_estimated_fit(
+        self, client, headers, fake_pages, estimator
+    ):
+        self._calibrate(estimator, harvard_large=1.6, harvard=1.02, harvard_compact=0.6)
+        fake_pages["pages"] = {"harvard": 2}
+        body = _post(client, headers)
+
+        assert body["optimal_size"] == "compact"
+        assert fake_pages["started"] == ["harvard"]
+
+    def test_tested_sizes_in_evaluation_order(self, client, headers, fake_pages, estimator):
+        self._calibrate(estimator, harvard_large=1.02, harvard=1.6, harvard_compact=0.5)
+        fake_pages["pages"] = {"harvard_large": 2}
+        body = _post(client, headers)
+
+        assert body["optimal_size"] == "compact"
+        assert [t["size"] for t in body["tested_sizes"]] == ["large", "normal", "compact"]
+        assert body["tested_sizes"][0]["page_count"] == 2
+
+    def test_disabled_by_setting(self, client, headers, fake_pages, estimator, monkeypatch):
+        monkeypatch.setattr(app_module, "PAGE_ESTIMATOR_ENABLED", False)
+        self._calibrate(estimator, harvard_large=0.5)
+        fake_pages["pages"] = {"harvard_large": 1}
+        _post(client, headers)
+        assert fake_pages["started"] == ["harvard_large"]
+
+
+class TestPageCount:
+    """generate_pdf_and_count_pages trusts the compile metadata before pdfplumber."""
+
+    @staticmethod
+    def _fake_pool(monkeypatch, page_count):
+        compiled = CompiledPdf(
+            content=b"%PDF",
+            metadata=CompileMetadata(
+                page_count=page_count, overfull_boxes=0, elapsed_seconds=0.1, size_bytes=4
+            ),
+        )
+        pool = MagicMock()
+        pool.compile_pdf_async = AsyncMock(return_value=compiled)
+        monkeypatch.setattr(app_module, "get_compile_pool", lambda: pool)
+
+    def test_uses_metadata_page_count(self, monkeypatch):
+        self._fake_pool(monkeypatch, page_count=2)
+        with patch.object(app_module.pdfplumber, "open") as mock_open:
+            pdf, pages = asyncio.run(
+                app_module.generate_pdf_and_count_pages(app_module.ResumeData(**RESUME), "harvard")
+            )
+        assert (pdf, pages) == (b"%PDF", 2)
+        mock_open.assert_not_called()
+
+    def test_falls_back_to_pdfplumber(self, monkeypatch):
+        self._fake_pool(monkeypatch, page_count=None)
+        with patch.object(app_module.pdfplumber, "open") as mock_open:
+            mock_open.return_value.__enter__.return_value.pages = [1, 2, 3]
+            _, pages = asyncio.run(
+                app_module.generate_pdf_and_count_pages(app_module.ResumeData(**RESUME), "harvard")
+            )
+        assert pages == 3
@@ -0,0 +1,97 @@
+"""Tests for PageEstimator — feature extraction, calibrated estimates and verdicts."""
+
+import json
+
+import pytest
+
+from benchmarks.resumes import MAX, SMALL, TYPICAL
+from core.PageEstimator import (
+    BULLET_WEIGHT,
+    ITEM_WEIGHT,
+    SECTION_WEIGHT,
+    PageEstimator,
+    layout_units,
+    resume_features,
+)
+
+
+def _resume(sections, personal=None):
+    return {"personal": personal or {}, "sections": sections}
+
+
+class TestFeatures:
+    def test_counts_bullets_items_and_sections(self):
+        resume = _resume(
+            [
+                {
+                    "title": "XP",
+                    "items": [
+                        {"title": "Dev", "highlights": ["ab", "cd"]},
+                        {"title": "Ops", "highlights": []},
+                    ],
+                },
+                {"title": "Bio", "items": "hello"},
+            ]
+        )
+        features = resume_features(resume)
+        assert features == {
+            "chars": len("XP" + "Dev" + "ab" + "cd" + "Ops" + "Bio" + "hello"),
+            "bullets": 2,
+            "items": 2,
+            "sections": 2,
+        }
+
+    def test_hidden_and_empty_sections_ignored(self):
+        resume = _resume(
+            [
+                {"title": "Hidden", "isVisible": False, "items": "text"},
+                {"title": "Empty", "items": []},
+            ]
+        )
+        assert resume_features(resume) == {"chars": 0, "bullets": 0, "items": 0, "sections": 0}
+
+    def test_personal_info_counts_characters(self):
+        assert resume_features(_resume([], {"name": "Jane", "links": []}))["chars"] == 4
+
+    def test_units_weight_structure(self):
+        resume = _resume([{"title": "", "items": [{"highlights": ["", ""]}]}])
+        assert layout_units(resume) == 2 * BULLET_WEIGHT + ITEM_WEIGHT + SECTION_WEIGHT
+
+    def test_synthetic_resumes_grow(self):
+        assert layout_units(SMALL) < layout_units(TYPICAL) < layout_units(MAX)
+
+
+class TestEstimator:
+    @pytest.fixture()
+    def estimator(self):
+        return PageEstimator({"harvard": {"capacity": layout_units(TYPICAL), "margin": 0.1}})
+
+    def test_estimate_pages(self, estimator):
+        assert estimator.estimate_pages("harvard", TYPICAL) == pytest.approx(1.0)
+
+    def test_uncalibrated_template(self, estimator):
+        assert estimator.estimate_pages("europass", TYPICAL) is None
+        assert estimator.classify("europass", SMALL) is None
+
+    def test_verdicts(self, estimator):
+        assert estimator.classify("harvard", SMALL) == "fits"
+        assert estimator.classify("harvard", MAX) == "overflows"
+        assert estimator.classify("harvard", TYPICAL) is None
+
+    def test_default_margin(self):
+        estimator = PageEstimator({"harvard": {"capacity": layout_units(TYPICAL) / 0.85}})
+        assert estimator.classify("harvard", TYPICAL) == "fits"
+
+
+class TestFromFile:
+    def test_missing_file_gives_empty_estimator(self, tmp_path):
+        assert PageEstimator.from_file(tmp_path / "missing.json").calibration == {}
+
+    def test_loads_templates(self, tmp_path):
+        path = tmp_path / "calibration.json"
+        path.write_text(
+            json.dumps({"templates": {"harvard": {"capacity": 5000.0, "margin": 0.05}}}),
+            encoding="utf-8",
+        )
+        estimator = PageEstimator.from_file(path)
+        assert estimator.estimate_pages("harvard", _resume([], {"name": "x" * 2500})) == 0.5
@@ -0,0 +1,186 @@
+"""Tests for PdfCache — content addressing, LRU eviction, Redis tier and pool integration."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+import redis
+
+from core.CompilePool import CompilePool
+from core.PdfCache import REDIS_KEY_PREFIX, PdfCache, get_pdf_cache
+from core.PdfCompiler import CompiledPdf, CompileMetadata, PdfCompiler
+
+FAKE_PDF = b"%PDF-1.4\n%%EOF"
+
+
+def _compiled(content: bytes = FAKE_PDF, page_count: int | None = 1) -> CompiledPdf:
+    metadata = CompileMetadata(
+        page_count=page_count, overfull_boxes=0, elapsed_seconds=0.5, size_bytes=len(content)
+    )
+    return CompiledPdf(content=content, metadata=metadata)
+
+
+COMPILED = _compiled()
+
+
+class TestKey:
+    def test_same_source_and_template_share_a_key(self):
+        assert PdfCache.key("tex", "harvard") == PdfCache.key("tex", "harvard")
+
+    def test_template_is_part_of_the_key(self):
+        assert PdfCache.key("tex", "harvard") != PdfCache.key("tex", "europass")
+
+    def test_source_is_part_of_the_key(self):
+        assert PdfCache.key("a", "harvard") != PdfCache.key("b", "harvard")
+
+    def test_no_ambiguity_between_template_and_source(self):
+        assert PdfCache.key("btex", "a") != PdfCache.key("tex", "ab")
+
+
+class TestMemoryTier:
+    def test_miss_then_hit(self):
+        cache = PdfCache()
+        assert cache.get("k") is None
+        cache.put("k", COMPILED)
+        assert cache.get("k") == COMPILED
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["bytes"] == len(FAKE_PDF)
+
+    def test_evicts_least_recently_used_when_full(self):
+        cache = PdfCache(max_bytes=10)
+        cache.put("a", _compiled(b"aaaa"))
+        cache.put("b", _compiled(b"bbbb"))
+        cache.get("a")  # "b" is now the least recently used
+        cache.put("c", _compiled(b"cccc"))
+
+        assert cache.get("b") is None
+        assert cache.get("a").content == b"aaaa"
+        assert cache.get("c").content == b"cccc"
+        assert cache.stats()["evictions"] == 1
+        assert cache.stats()["bytes"] == 8
+
+    def test_oversized_entry_not_cached(self):
+        cache = PdfCache(max_bytes=4)
+        cache.put("k", _compiled(b"too large"))
+        assert cache.stats()["entries"] == 0
+
+    def test_overwrite_keeps_size_accurate(self):
+        cache = PdfCache()
+        cache.put("k", _compiled(b"12345"))
+        cache.put("k", _compiled(b"12"))
+        assert cache.stats()["bytes"] == 2
+
+    def test_clear(self):
+        cache = PdfCache()
+        cache.put("k", COMPILED)
+        cache.get("k")
+        cache.clear()
+        assert cache.get("k") is None
+        assert cache.stats()["hits"] == 0
+
+
+class TestRedisTier:
+    def test_put_writes_redis_with_ttl(self):
+        client = fakeredis.FakeRedis()
+        PdfCache(redis_client=client, redis_ttl=120).put("k", COMPILED)
+        assert client.get(REDIS_KEY_PREFIX + "k").endswith(FAKE_PDF)
+        assert 0 < client.ttl(REDIS_KEY_PREFIX + "k") <= 120
+
+    def test_redis_hit_fills_memory_tier(self):
+        client = fakeredis.FakeRedis()
+        PdfCache(redis_client=client).put("k", COMPILED)
+        cache = PdfCache(redis_client=client)
+
+        assert cache.get("k") == COMPILED
+        client.flushall()
+        assert cache.get("k") == COMPILED
+        assert cache.stats()["redis_hits"] == 1
+        assert cache.stats()["hits"] == 1
+
+    def test_shared_between_processes(self):
+        client = fakeredis.FakeRedis()
+        PdfCache(redis_client=client).put("k", COMPILED)
+        assert PdfCache(redis_client=client).get("k") == COMPILED
+
+    def test_metadata_round_trips_through_redis(self):
+        client = fakeredis.FakeRedis()
+        compiled = _compiled(b"%PDF\nwith\nnewlines", page_count=2)
+        PdfCache(redis_client=client).put("k", compiled)
+        assert PdfCache(redis_client=client).get("k") == compiled
+
+    def test_unreadable_redis_value_is_a_miss(self):
+        client = fakeredis.FakeRedis()
+        client.set(REDIS_KEY_PREFIX + "k", FAKE_PDF)
+        assert PdfCache(redis_client=client).get("k") is None
+
+    def test_redis_errors_are_misses(self):
+        client = MagicMock()
+        client.get.side_effect = redis.ConnectionError("down")
+        client.set.side_effect = redis.ConnectionError("down")
+        cache = PdfCache(redis_client=client)
+
+        cache.put("k", COMPILED)
+        assert cache.get("other") is None
+        assert cache.get("k") == COMPILED
+
+    def test_async_api(self):
+        cache = PdfCache(redis_client=fakeredis.FakeRedis())
+
+        async def scenario():
+            await cache.put_async("k", COMPILED)
+            return await cache.get_async("k")
+
+        assert asyncio.run(scenario()) == COMPILED
+
+
+class TestCompilePoolIntegration:
+    @pytest.fixture()
+    def compiled(self, monkeypatch):
+        calls = []
+
+        def _fake_compile(self, clean=True):
+            calls.append(self.tex_file.read_text(encoding="utf-8"))
+            self.tex_file.parent.joinpath("main.pdf").write_bytes(FAKE_PDF)
+
+        monkeypatch.setattr(PdfCompiler, "compile", _fake_compile)
+        return calls
+
+    @pytest.fixture()
+    def pool(self):
+        compile_pool = CompilePool(max_workers=1, max_jobs_per_worker=None, result_cache=PdfCache())
+        yield compile_pool
+        compile_pool.shutdown()
+
+    def test_metadata_served_from_cache(self, pool, compiled):
+        first = asyncio.run(pool.compile_pdf_async("doc", "harvard"))
+        second = asyncio.run(pool.compile_pdf_async("doc", "harvard"))
+        assert second == first
+        assert len(compiled) == 1
+
+    def test_identical_render_skips_tex(self, pool, compiled):
+        assert asyncio.run(pool.compile_async("doc", "harvard")) == FAKE_PDF
+        assert asyncio.run(pool.compile_async("doc", "harvard")) == FAKE_PDF
+        assert compiled == ["doc"]
+        assert pool.result_cache.stats()["hits"] == 1
+
+    def test_different_template_compiles_again(self, pool, compiled):
+        asyncio.run(pool.compile_async("doc", "harvard"))
+        asyncio.run(pool.compile_async("doc", "europass"))
+        assert len(compiled) == 2
+
+    def test_failures_are_not_cached(self, pool, monkeypatch):
+        def _failing_compile(self, clean=True):
+            raise RuntimeError("LaTeX compilation failed.")
+
+        monkeypatch.setattr(PdfCompiler, "compile", _failing_compile)
+        with pytest.raises(RuntimeError):
+            asyncio.run(pool.compile_async("doc", "harvard"))
+        assert pool.result_cache.stats()["entries"] == 0
+
+
+def test_get_pdf_cache_returns_singleton():
+    assert get_pdf_cache() is get_pdf_cache()
@@ -1,3 +1,4 @@
+import signal
 import subprocess
 import tempfile
 import unittest
@@ -7,6 +8,16 @@ from unittest.mock import MagicMock, patch
 from core import PdfCompiler
 
 
+def _mock_process(returncode=0, stderr=b""):
+    """Build a Popen context manager mock whose process exits with returncode."""
+    process = MagicMock()
+    process.communicate.return_value = (None, stderr)
+    process.returncode = returncode
+    popen = MagicMock()
+    popen.__enter__.return_value = process
+    return popen
+
+
 class PdfCompilerTest(unittest.TestCase):
     def setUp(self):
         """Sets up a temporary directory for tests."""
@@ -24,11 +35,11 @@ class PdfCompilerTest(unittest.TestCase):
         with self.assertRaises(FileNotFoundError):
             compiler.compile()
 
-    @patch("subprocess.run")
-    def test_given_valid_tex_file_when_compile_then_calls_subprocess_run(self, mock_subprocess_run):
+    @patch("subprocess.Popen")
+    def test_given_valid_tex_file_when_compile_then_calls_subprocess_popen(self, mock_popen):
         tex_path = self.root / "main.tex"
         tex_path.touch()
-        mock_subprocess_run.return_value = MagicMock(check=True)
+        mock_popen.return_value = _mock_process()
         compiler = PdfCompiler(tex_path)
         expected_cmd = [
             "latexmk",
@@ -41,24 +52,46 @@ class PdfCompilerTest(unittest.TestCase):
 
         compiler.compile(clean=False)
 
-        mock_subprocess_run.assert_called_once_with(
-            expected_cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        mock_popen.assert_called_once_with(
+            expected_cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
         )
 
-    @patch("subprocess.run")
-    def test_given_latex_compilation_fails_when_compile_then_raises_runtime_error(
-        self, mock_subprocess_run
-    ):
+    @patch("subprocess.Popen")
+    def test_given_latex_compilation_fails_when_compile_then_raises_runtime_error(self, mock_popen):
         tex_path = self.root / "main.tex"
         tex_path.touch()
-        mock_subprocess_run.side_effect = subprocess.CalledProcessError(
-            returncode=1, cmd="latexmk", stderr=b"Test LaTeX Error"
-        )
+        mock_popen.return_value = _mock_process(returncode=1, stderr=b"Test LaTeX Error")
         compiler = PdfCompiler(tex_path)
 
         with self.assertRaises(RuntimeError):
             compiler.compile()
 
+    @patch("os.killpg")
+    @patch("subprocess.Popen")
+    def test_given_compilation_times_out_when_compile_then_kills_process_group(
+        self, mock_popen, mock_killpg
+    ):
+        tex_path = self.root / "main.tex"
+        tex_path.touch()
+        popen = _mock_process()
+        process = popen.__enter__.return_value
+        process.pid = 4242
+        process.communicate.side_effect = [
+            subprocess.TimeoutExpired(cmd="latexmk", timeout=5),
+            (None, b""),
+        ]
+        mock_popen.return_value = popen
+        compiler = PdfCompiler(tex_path, timeout=5)
+
+        with self.assertRaises(RuntimeError):
+            compiler.compile()
+
+        process.communicate.assert_any_call(timeout=5)
+        mock_killpg.assert_called_once_with(4242, signal.SIGKILL)
+
     def test_given_auxiliary_files_exist_when_clean_auxiliary_files_then_removes_files(self):
         tex_path = self.root / "main.tex"
         compiler = PdfCompiler(tex_path)
@@ -5,7 +5,17 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from core.PdfCompiler import PdfCompiler
+from core.PdfCompiler import CompileMetadata, PdfCompiler
+
+
+def _mock_process(returncode=0, stderr=b""):
+    """Build a Popen context manager mock whose process exits with returncode."""
+    process = MagicMock()
+    process.communicate.return_value = (None, stderr)
+    process.returncode = returncode
+    popen = MagicMock()
+    popen.__enter__.return_value = process
+    return popen
 
 
 @pytest.fixture()
@@ -26,6 +36,9 @@ class TestPdfCompilerInit:
         compiler = PdfCompiler(tex_file)
         assert compiler.tex_file == tex_file
 
+    def test_no_timeout_by_default(self, tex_file):
+        assert PdfCompiler(tex_file).timeout is None
+
 
 class TestCompile:
     def test_missing_tex_file_raises(self, tmp_dir):
@@ -33,9 +46,9 @@ class TestCompile:
         with pytest.raises(FileNotFoundError, match="TeX file not found"):
             compiler.compile()
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_calls_latexmk_with_correct_args(self, mock_run, tex_file):
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = _mock_process()
         compiler = PdfCompiler(tex_file)
         compiler.compile(clean=False)
 
@@ -48,64 +61,92 @@ class TestCompile:
         assert f"-outdir={tex_file.parent}" in cmd
         assert str(tex_file) in cmd
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_no_shell_escape_flag_present(self, mock_run, tex_file):
         """Security: -no-shell-escape must always be in the command."""
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = _mock_process()
         compiler = PdfCompiler(tex_file)
         compiler.compile(clean=False)
 
         cmd = mock_run.call_args[0][0]
         assert "-no-shell-escape" in cmd
 
-    @patch("core.PdfCompiler.subprocess.run")
-    def test_subprocess_called_with_check_true(self, mock_run, tex_file):
-        mock_run.return_value = MagicMock()
+    @patch("core.PdfCompiler.subprocess.Popen")
+    def test_nonzero_exit_is_checked(self, mock_run, tex_file):
+        mock_run.return_value = _mock_process(returncode=12)
+        compiler = PdfCompiler(tex_file)
+        with pytest.raises(RuntimeError, match="LaTeX compilation failed"):
+            compiler.compile(clean=False)
+
+    @patch("core.PdfCompiler.subprocess.Popen")
+    def test_runs_in_own_session(self, mock_run, tex_file):
+        """latexmk gets its own process group so a timeout can kill pdflatex too."""
+        mock_run.return_value = _mock_process()
         compiler = PdfCompiler(tex_file)
         compiler.compile(clean=False)
 
         kwargs = mock_run.call_args[1]
-        assert kwargs["check"] is True
+        assert kwargs["start_new_session"] is True
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
+    def test_timeout_forwarded_to_communicate(self, mock_run, tex_file):
+        mock_run.return_value = _mock_process()
+        compiler = PdfCompiler(tex_file, timeout=30)
+        compiler.compile(clean=False)
+
+        process = mock_run.return_value.__enter__.return_value
+        process.communicate.assert_called_once_with(timeout=30)
+
+    @patch("core.PdfCompiler.os.killpg")
+    @patch("core.PdfCompiler.subprocess.Popen")
+    def test_timeout_raises_runtime_error(self, mock_run, mock_killpg, tex_file):
+        popen = _mock_process()
+        process = popen.__enter__.return_value
+        process.communicate.side_effect = [
+            subprocess.TimeoutExpired(cmd="latexmk", timeout=1),
+            (None, b""),
+        ]
+        mock_run.return_value = popen
+        compiler = PdfCompiler(tex_file, timeout=1)
+        with pytest.raises(RuntimeError, match="timed out"):
+            compiler.compile()
+        mock_killpg.assert_called_once()
+
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_stdout_suppressed(self, mock_run, tex_file):
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = _mock_process()
         compiler = PdfCompiler(tex_file)
         compiler.compile(clean=False)
 
         kwargs = mock_run.call_args[1]
         assert kwargs["stdout"] == subprocess.DEVNULL
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_stderr_captured(self, mock_run, tex_file):
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = _mock_process()
         compiler = PdfCompiler(tex_file)
         compiler.compile(clean=False)
 
         kwargs = mock_run.call_args[1]
         assert kwargs["stderr"] == subprocess.PIPE
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_compilation_failure_raises_runtime_error(self, mock_run, tex_file):
-        mock_run.side_effect = subprocess.CalledProcessError(
-            returncode=1, cmd="latexmk", stderr=b"! LaTeX Error: File not found"
-        )
+        mock_run.return_value = _mock_process(returncode=1, stderr=b"! LaTeX Error: File not found")
         compiler = PdfCompiler(tex_file)
         with pytest.raises(RuntimeError, match="LaTeX compilation failed"):
             compiler.compile()
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_compilation_failure_with_no_stderr(self, mock_run, tex_file):
-        mock_run.side_effect = subprocess.CalledProcessError(
-            returncode=1, cmd="latexmk", stderr=None
-        )
+        mock_run.return_value = _mock_process(returncode=1, stderr=None)
         compiler = PdfCompiler(tex_file)
         with pytest.raises(RuntimeError):
             compiler.compile()
 
-    @patch("core.PdfCompiler.subprocess.run")
+    @patch("core.PdfCompiler.subprocess.Popen")
     def test_compile_with_clean_true_calls_cleanup(self, mock_run, tex_file):
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = _mock_process()
         compiler = PdfCompiler(tex_file)
 
         # Create aux files
@@ -119,6 +160,65 @@ class TestCompile:
             assert not (tex_file.parent / f"main{ext}").exists()
 
 
+LOG = (
+    "This is pdfTeX, Version 3.141592653-2.6-1.40.26\n"
+    "Overfull \\hbox (12.3pt too wide) in paragraph at lines 40--41\n"
+    "Underfull \\hbox (badness 10000) in paragraph at lines 50--51\n"
+    "Overfull \\vbox (4.0pt too high) has occurred while \\output is active\n"
+    "Output written on /tmp/cv_abcdefgh/main.pdf (2 pages, 41235 bytes).\n"
+)
+
+
+class TestCompileMetadata:
+    @pytest.fixture()
+    def compile_with_output(self, tex_file):
+        """Compile with latexmk mocked to leave the given log and PDF behind."""
+
+        def _compile(log=None, pdf=b"%PDF-1.5 compressed", clean=True):
+            def _run(cmd):
+                if log is not None:
+                    tex_file.with_suffix(".log").write_text(log, encoding="latin-1")
+                tex_file.with_suffix(".pdf").write_bytes(pdf)
+
+            with patch.object(PdfCompiler, "_run", side_effect=_run):
+                return PdfCompiler(tex_file).compile(clean=clean)
+
+        return _compile
+
+    def test_reads_page_count_from_log(self, compile_with_output):
+        metadata = compile_with_output(LOG)
+        assert isinstance(metadata, CompileMetadata)
+        assert metadata.page_count == 2
+
+    def test_single_page_wording(self, compile_with_output):
+        log = "Output written on main.pdf (1 page, 999 bytes).\n"
+        assert compile_with_output(log).page_count == 1
+
+    def test_log_line_wrapped_at_79_characters(self, compile_with_output):
+        line = "Output written on /tmp/" + "x" * 60 + "/main.pdf (3 pages, 41235 bytes)."
+        wrapped = "\n".join(line[i : i + 79] for i in range(0, len(line), 79))
+        assert compile_with_output(wrapped).page_count == 3
+
+    def test_counts_overfull_boxes_only(self, compile_with_output):
+        assert compile_with_output(LOG).overfull_boxes == 2
+
+    def test_size_and_elapsed(self, compile_with_output):
+        metadata = compile_with_output(LOG, pdf=b"x" * 10)
+        assert metadata.size_bytes == 10
+        assert metadata.elapsed_seconds >= 0
+
+    def test_no_log_leaves_page_count_unknown(self, compile_with_output):
+        pdf = b"%PDF-1.4\n2 0 obj\n<< /Type /Pages /Kids [3 0 R] /Count 1 >>\nendobj\n"
+        assert compile_with_output(log=None, pdf=pdf).page_count is None
+
+    def test_unknown_page_count(self, compile_with_output):
+        assert compile_with_output(log="No pages of output.\n").page_count is None
+
+    def test_log_read_before_cleanup(self, compile_with_output, tex_file):
+        assert compile_with_output(LOG, clean=True).page_count == 2
+        assert not tex_file.with_suffix(".log").exists()
+
+
 class TestCleanAuxiliaryFiles:
     def test_removes_all_aux_extensions(self, tex_file):
         extensions = [".aux", ".log", ".out", ".fls", ".fdb_latexmk", ".synctex.gz"]
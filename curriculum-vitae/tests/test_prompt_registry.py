@@ -0,0 +1,91 @@
+"""Tests for PromptRegistry — versioned prompts and provider cache statistics."""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from core.PromptRegistry import (
+    CV_IMPORT_PROMPT,
+    Prompt,
+    PromptRegistry,
+    cached_prompt_tokens,
+    get_prompt_registry,
+)
+
+
+def _prompt(version=1, system="Extract."):
+    return Prompt(name="test", version=version, system=system, user_template="CV:\n{text}")
+
+
+class TestPrompt:
+    def test_messages_put_the_static_prefix_first(self):
+        messages = _prompt().messages("Jane {Doe}")
+        assert messages == [
+            {"role": "system", "content": "Extract."},
+            {"role": "user", "content": "CV:\nJane {Doe}"},
+        ]
+
+    def test_fingerprint_follows_the_content(self):
+        assert _prompt().fingerprint == _prompt().fingerprint
+        assert _prompt().fingerprint != _prompt(system="Extract all.").fingerprint
+        assert _prompt().fingerprint != _prompt(version=2).fingerprint
+
+    def test_cv_import_prompt_loaded_from_file(self):
+        assert CV_IMPORT_PROMPT.key == "cv_import@v1"
+        assert CV_IMPORT_PROMPT.system.startswith("Tu es un assistant")
+        assert '"type": "custom"' in CV_IMPORT_PROMPT.system
+        assert not CV_IMPORT_PROMPT.system.endswith("\n")
+
+
+class TestRegistry:
+    def test_latest_version_by_default(self):
+        registry = PromptRegistry(prompts=(_prompt(1), _prompt(3), _prompt(2)))
+        assert registry.get("test").version == 3
+        assert registry.get("test", version=1).version == 1
+
+    def test_unknown_prompt_or_version(self):
+        registry = PromptRegistry(prompts=(_prompt(1),))
+        with pytest.raises(KeyError):
+            registry.get("other")
+        with pytest.raises(KeyError):
+            registry.get("test", version=2)
+
+    def test_duplicate_version_rejected(self):
+        registry = PromptRegistry(prompts=(_prompt(1),))
+        with pytest.raises(ValueError):
+            registry.register(_prompt(1, system="Changed."))
+
+    def test_builtin_prompts_registered(self):
+        assert get_prompt_registry().get("cv_import") is CV_IMPORT_PROMPT
+
+
+class TestUsage:
+    def test_cached_tokens_read_from_usage_extras(self):
+        usage = SimpleNamespace(
+            prompt_tokens=100,
+            additional_properties={"prompt_tokens_details": {"cached_tokens": 80}},
+        )
+        assert cached_prompt_tokens(usage) == 80
+        assert cached_prompt_tokens({"num_cached_tokens": 12}) == 12
+        assert cached_prompt_tokens(SimpleNamespace(prompt_tokens=100)) == 0
+
+    def test_record_usage_accumulates_and_logs(self, caplog):
+        registry = PromptRegistry(prompts=(_prompt(),))
+        prompt = registry.get("test")
+        with caplog.at_level(logging.INFO, logger="core.PromptRegistry"):
+            registry.record_usage(
+                prompt,
+                SimpleNamespace(
+                    prompt_tokens=100,
+                    additional_properties={"prompt_tokens_details": {"cached_tokens": 100}},
+                ),
+            )
+            registry.record_usage(prompt, SimpleNamespace(prompt_tokens=100))
+
+        assert registry.stats() == {
+            "test@v1": {"requests": 2, "prompt_tokens": 200, "cached_prompt_tokens": 100}
+        }
+        assert "test@v1: 0/100 prompt tokens from the provider cache (50.0% over 2 requests)" in (
+            caplog.records[-1].getMessage()
+        )
@@ -5,6 +5,8 @@ from conftest import (
     create_authenticated_user,
 )
 
+from database.models import Resume, User
+
 SAMPLE_JSON = {
     "personal": {
         "name": "Alice",
@@ -88,6 +90,76 @@ class TestListResumes:
         assert resp.json()["resumes"][0]["name"] == "CV A"
 
 
+class TestListResumeSummaries:
+    def _add_resumes(self, db, count: int) -> list[int]:
+        user = db.query(User).filter(User.email == "test@example.com").one()
+        resumes = [
+            Resume(user_id=user.id, name=f"CV {i}", json_content=SAMPLE_JSON) for i in range(count)
+        ]
+        db.add_all(resumes)
+        db.commit()
+        return [resume.id for resume in resumes]
+
+    def test_summary_fields(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        content = {**SAMPLE_JSON, "sections": [{"id": "a"}, {"id": "b"}]}
+        client.post("/api/resumes", json={"name": "CV", "json_content": content}, headers=headers)
+
+        resp = client.get("/api/resumes/summary", headers=headers)
+        assert resp.status_code == 200
+        data = resp.json()
+        [summary] = data["resumes"]
+        assert summary["name"] == "CV"
+        assert summary["template_id"] == "harvard"
+        assert summary["section_count"] == 2
+        assert summary["size_bytes"] > 0
+        assert "json_content" not in summary
+        assert data["total"] == 1
+        assert data["next_cursor"] is None
+
+    def test_resume_without_content(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        client.post("/api/resumes", json={"name": "CV vide"}, headers=headers)
+
+        [summary] = client.get("/api/resumes/summary", headers=headers).json()["resumes"]
+        assert summary["template_id"] is None
+        assert summary["section_count"] is None
+
+    def test_keyset_pagination(self, client, db):
+        headers = auth_header(create_authenticated_user(client))
+        ids = self._add_resumes(db, 5)
+
+        first = client.get("/api/resumes/summary?limit=2", headers=headers).json()
+        assert [r["id"] for r in first["resumes"]] == ids[:-3:-1]
+        assert first["total"] == 5
+
+        second = client.get(
+            f"/api/resumes/summary?limit=2&cursor={first['next_cursor']}", headers=headers
+        ).json()
+        assert [r["id"] for r in second["resumes"]] == ids[2:0:-1]
+        assert second["total"] is None
+
+        last = client.get(
+            f"/api/resumes/summary?limit=2&cursor={second['next_cursor']}", headers=headers
+        ).json()
+        assert [r["id"] for r in last["resumes"]] == ids[:1]
+        assert last["next_cursor"] is None
+
+    def test_only_own_resumes(self, client):
+        token1 = create_authenticated_user(client, "user1@example.com")
+        token2 = create_authenticated_user(client, "user2@example.com")
+        client.post("/api/resumes", json={"name": "User1 CV"}, headers=auth_header(token1))
+
+        data = client.get("/api/resumes/summary", headers=auth_header(token2)).json()
+        assert data["resumes"] == []
+        assert data["total"] == 0
+
+    def test_limit_is_bounded(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resp = client.get("/api/resumes/summary?limit=1000", headers=headers)
+        assert resp.status_code == 422
+
+
 class TestGetResume:
     def test_get_own_resume(self, client):
         token = create_authenticated_user(client)
@@ -154,6 +226,249 @@ class TestUpdateResume:
         assert resp.status_code == 404
 
 
+class TestPatchResume:
+    def _create(self, client, headers, content=SAMPLE_JSON) -> dict:
+        resp = client.post(
+            "/api/resumes", json={"name": "CV", "json_content": content}, headers=headers
+        )
+        assert resp.status_code == 201
+        return resp.json()
+
+    def test_replace_is_applied_in_the_database(self, client, monkeypatch):
+        import api.resumes as resumes_module
+
+        async def _not_expected(*args):
+            raise AssertionError("replace-only patches must not load the document")
+
+        monkeypatch.setattr(resumes_module, "_patch_in_python", _not_expected)
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+        assert resume["version"] == 1
+
+        resp = client.patch(
+            f"/api/resumes/{resume['id']}",
+            json={
+                "version": 1,
+                "operations": [
+                    {"op": "replace", "path": "/personal/name", "value": "Bob"},
+                    {"op": "replace", "path": "/personal/links", "value": ["https://b.dev"]},
+                ],
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        assert resp.json() == {"id": resume["id"], "version": 2}
+
+        content = client.get(f"/api/resumes/{resume['id']}", headers=headers).json()
+        assert content["json_content"]["personal"]["name"] == "Bob"
+        assert content["json_content"]["personal"]["links"] == ["https://b.dev"]
+        assert content["version"] == 2
+
+    def test_other_operations_are_applied(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+
+        resp = client.patch(
+            f"/api/resumes/{resume['id']}",
+            json={
+                "version": 1,
+                "operations": [
+                    {"op": "add", "path": "/sections/-", "value": {"id": "sec-1", "items": []}},
+                    {"op": "remove", "path": "/personal/phone"},
+                ],
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 200
+        assert resp.json()["version"] == 2
+
+        content = client.get(f"/api/resumes/{resume['id']}", headers=headers).json()
+        assert content["json_content"]["sections"] == [{"id": "sec-1", "items": []}]
+        assert "phone" not in content["json_content"]["personal"]
+
+    def test_stale_version_is_rejected(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+        url = f"/api/resumes/{resume['id']}"
+        edit = {"op": "replace", "path": "/personal/title", "value": "Lead"}
+
+        first = client.patch(url, json={"version": 1, "operations": [edit]}, headers=headers)
+        assert first.status_code == 200
+        resp = client.patch(url, json={"version": 1, "operations": [edit]}, headers=headers)
+        assert resp.status_code == 409
+
+    def test_put_bumps_version(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+        resp = client.put(f"/api/resumes/{resume['id']}", json={"name": "New"}, headers=headers)
+        assert resp.json()["version"] == 2
+
+    def test_missing_path_is_rejected(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+
+        resp = client.patch(
+            f"/api/resumes/{resume['id']}",
+            json={
+                "version": 1,
+                "operations": [{"op": "replace", "path": "/personal/missing", "value": 1}],
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 422
+        assert "not found" in resp.json()["detail"]
+
+    def test_result_size_is_limited(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+
+        resp = client.patch(
+            f"/api/resumes/{resume['id']}",
+            json={
+                "version": 1,
+                "operations": [{"op": "replace", "path": "/personal/name", "value": "x" * 110_000}],
+            },
+            headers=headers,
+        )
+        assert resp.status_code == 422
+        assert "too large" in resp.json()["detail"]
+
+    def test_size_limit_is_the_same_on_both_paths(self, client):
+        from api.resumes import MAX_JSON_CONTENT_SIZE
+        from database.json_functions import json_text_size
+
+        headers = auth_header(create_authenticated_user(client))
+        # Non-ASCII: two bytes each, one character, six once ASCII-escaped
+        base = json_text_size({**SAMPLE_JSON, "personal": {**SAMPLE_JSON["personal"], "name": ""}})
+        fitting = "é" * ((MAX_JSON_CONTENT_SIZE - base) // 2)
+        # In the database (replace only), then in Python (with a test operation)
+        for extra in ([], [{"op": "test", "path": "/template_id", "value": "harvard"}]):
+            resume = self._create(client, headers)
+            url = f"/api/resumes/{resume['id']}"
+            for value, expected in ((fitting + "éé", 422), (fitting, 200)):
+                operation = {"op": "replace", "path": "/personal/name", "value": value}
+                resp = client.patch(
+                    url, json={"version": 1, "operations": [operation, *extra]}, headers=headers
+                )
+                assert resp.status_code == expected
+            client.delete(url, headers=headers)
+
+    def test_document_must_stay_an_object(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+
+        resp = client.patch(
+            f"/api/resumes/{resume['id']}",
+            json={"version": 1, "operations": [{"op": "replace", "path": "", "value": [1]}]},
+            headers=headers,
+        )
+        assert resp.status_code == 422
+
+    def test_other_users_resume_returns_404(self, client):
+        token_a = create_authenticated_user(client, email="a@example.com")
+        token_b = create_authenticated_user(client, email="b@example.com")
+        resume = self._create(client, auth_header(token_a))
+
+        resp = client.patch(
+            f"/api/resumes/{resume['id']}",
+            json={
+                "version": 1,
+                "operations": [{"op": "replace", "path": "/personal/name", "value": "Mallory"}],
+            },
+            headers=auth_header(token_b),
+        )
+        assert resp.status_code == 404
+
+
+class TestResumeEtag:
+    def _create(self, client, headers) -> dict:
+        resp = client.post(
+            "/api/resumes", json={"name": "CV", "json_content": SAMPLE_JSON}, headers=headers
+        )
+        assert resp.status_code == 201
+        return resp.json()
+
+    def test_unchanged_resume_is_not_sent_again(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        url = f"/api/resumes/{self._create(client, headers)['id']}"
+
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        assert etag == '"v1"'
+
+        resp = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["ETag"] == etag
+
+        client.put(url, json={"name": "New"}, headers=headers)
+        resp = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] == '"v2"'
+        assert resp.json()["name"] == "New"
+
+    def test_revalidation_checks_ownership(self, client):
+        token_a = create_authenticated_user(client, email="a@example.com")
+        token_b = create_authenticated_user(client, email="b@example.com")
+        resume = self._create(client, auth_header(token_a))
+
+        resp = client.get(
+            f"/api/resumes/{resume['id']}",
+            headers={**auth_header(token_b), "If-None-Match": '"v1"'},
+        )
+        assert resp.status_code == 404
+
+    def test_put_with_stale_if_match_is_rejected(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        url = f"/api/resumes/{self._create(client, headers)['id']}"
+
+        first = client.put(url, json={"name": "Tab 1"}, headers={**headers, "If-Match": '"v1"'})
+        assert first.status_code == 200
+        assert first.headers["ETag"] == '"v2"'
+
+        resp = client.put(url, json={"name": "Tab 2"}, headers={**headers, "If-Match": '"v1"'})
+        assert resp.status_code == 412
+        assert client.get(url, headers=headers).json()["name"] == "Tab 1"
+
+    def test_patch_with_if_match(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        url = f"/api/resumes/{self._create(client, headers)['id']}"
+        body = {"operations": [{"op": "replace", "path": "/personal/title", "value": "Lead"}]}
+
+        resp = client.patch(url, json=body, headers={**headers, "If-Match": '"v1"'})
+        assert resp.status_code == 200
+        assert resp.headers["ETag"] == '"v2"'
+
+        resp = client.patch(url, json=body, headers={**headers, "If-Match": '"v1"'})
+        assert resp.status_code == 412
+
+        resp = client.patch(url, json=body, headers={**headers, "If-Match": "*"})
+        assert resp.status_code == 200
+        assert resp.json()["version"] == 3
+
+    def test_patch_requires_a_version(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        url = f"/api/resumes/{self._create(client, headers)['id']}"
+        body = {"operations": [{"op": "replace", "path": "/personal/title", "value": "Lead"}]}
+
+        resp = client.patch(url, json=body, headers=headers)
+        assert resp.status_code == 428
+
+    def test_writes_advance_updated_at(self, client):
+        headers = auth_header(create_authenticated_user(client))
+        resume = self._create(client, headers)
+        url = f"/api/resumes/{resume['id']}"
+        body = {"operations": [{"op": "replace", "path": "/personal/title", "value": "Lead"}]}
+
+        client.patch(url, json=body, headers={**headers, "If-Match": '"v1"'})
+        patched = client.get(url, headers=headers).json()
+        assert patched["updated_at"] > resume["updated_at"]
+
+        updated = client.put(url, json={"name": "New"}, headers=headers).json()
+        assert updated["updated_at"] > patched["updated_at"]
+
+
 class TestDeleteResume:
     def test_delete_resume(self, client):
         token = create_authenticated_user(client)
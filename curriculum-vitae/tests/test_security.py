@@ -1,6 +1,8 @@
 """Tests for auth/security.py — password hashing and JWT management."""
 
+import asyncio
 import os
+import threading
 import time
 from datetime import timedelta
 
@@ -11,11 +13,19 @@ os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key-for-unit-tests-only")
 os.environ.setdefault("DATABASE_URL", "sqlite://")
 
 from auth.security import (
+    PasswordHasher,
+    PasswordHasherBusyError,
+    VerifiedTokenCache,
     _get_secret_key,
+    _verified_tokens,
     create_access_token,
     decode_access_token,
     get_password_hash,
+    get_password_hash_async,
+    get_secret_key,
+    reload_secret_key,
     verify_password,
+    verify_password_async,
 )
 
 # === Password hashing ===
@@ -117,7 +127,11 @@ class TestJWT:
     def test_token_with_wrong_secret_returns_none(self, monkeypatch):
         token = create_access_token(data={"sub": "1"})
         monkeypatch.setenv("JWT_SECRET_KEY", "different-secret-key")
-        assert decode_access_token(token) is None
+        reload_secret_key()
+        try:
+            assert decode_access_token(token) is None
+        finally:
+            reload_secret_key()
 
     def test_empty_payload(self):
         token = create_access_token(data={})
@@ -137,3 +151,107 @@ class TestJWT:
         assert payload is not None
         # exp should be in the future
         assert payload["exp"] > time.time()
+
+
+# === Secret key and verified-token cache ===
+
+
+class TestSecretKeyResolution:
+    def test_secret_is_read_once(self, monkeypatch):
+        key = get_secret_key()
+        monkeypatch.setenv("JWT_SECRET_KEY", "rotated-secret-key")
+        assert get_secret_key() == key
+
+    def test_reload_reads_the_environment_again(self, monkeypatch):
+        monkeypatch.setenv("JWT_SECRET_KEY", "rotated-secret-key")
+        reload_secret_key()
+        try:
+            assert get_secret_key() == "rotated-secret-key"
+        finally:
+            reload_secret_key()
+
+
+class TestVerifiedTokenCache:
+    def test_second_decode_is_served_from_cache(self):
+        token = create_access_token(data={"sub": "42"})
+        before = _verified_tokens.stats()["hits"]
+        assert decode_access_token(token)["sub"] == "42"
+        assert decode_access_token(token)["sub"] == "42"
+        assert _verified_tokens.stats()["hits"] == before + 1
+
+    def test_returns_a_copy(self):
+        token = create_access_token(data={"sub": "42"})
+        decode_access_token(token)["sub"] = "tampered"
+        assert decode_access_token(token)["sub"] == "42"
+
+    def test_invalid_tokens_are_not_cached(self):
+        cache = VerifiedTokenCache(max_entries=10)
+        cache.put("no-exp", {"sub": "1"})
+        assert cache.get("no-exp") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_expired_entry_is_dropped(self):
+        cache = VerifiedTokenCache(max_entries=10)
+        cache.put("token", {"sub": "1", "exp": time.time() - 1})
+        assert cache.get("token") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = time.time() + 60
+        cache.put("a", {"sub": "a", "exp": exp})
+        cache.put("b", {"sub": "b", "exp": exp})
+        cache.get("a")
+        cache.put("c", {"sub": "c", "exp": exp})
+        assert cache.get("b") is None
+        assert cache.get("a") == {"sub": "a", "exp": exp}
+        assert cache.get("c") is not None
+
+    def test_disabled_with_zero_entries(self):
+        cache = VerifiedTokenCache(max_entries=0)
+        cache.put("token", {"sub": "1", "exp": time.time() + 60})
+        assert cache.get("token") is None
+
+
+# === Password hashing pool ===
+
+
+class TestPasswordHasher:
+    def test_async_hash_and_verify(self):
+        async def run():
+            hashed = await get_password_hash_async("Async-P@ss1")
+            return await verify_password_async("Async-P@ss1", hashed)
+
+        assert asyncio.run(run()) is True
+
+    def test_runs_off_the_event_loop_thread(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=4)
+
+        async def run():
+            return await hasher.run(threading.current_thread)
+
+        try:
+            assert asyncio.run(run()) is not threading.current_thread()
+            assert hasher.stats()["completed"] == 1
+        finally:
+            hasher.shutdown()
+
+    def test_rejects_beyond_max_pending(self):
+        hasher = PasswordHasher(max_workers=1, max_pending=1)
+        release = threading.Event()
+
+        async def run():
+            first = asyncio.create_task(hasher.run(release.wait, 5))
+            await asyncio.sleep(0)
+            with pytest.raises(PasswordHasherBusyError):
+                await hasher.run(get_password_hash, "x")
+            release.set()
+            return await first
+
+        try:
+            assert asyncio.run(run()) is True
+            stats = hasher.stats()
+            assert stats["rejected"] == 1
+            assert stats["pending"] == 0
+        finally:
+            hasher.shutdown()
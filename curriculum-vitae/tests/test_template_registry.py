@@ -0,0 +1,115 @@
+"""Tests for TemplateRegistry — shared environment, no file copies, bytecode cache."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from core.LatexRenderer import LatexRenderer
+from core.TemplateRegistry import TemplateRegistry, get_template_registry
+
+TEMPLATES_FOLDER = Path(__file__).parent.parent / "templates"
+
+
+@pytest.fixture()
+def templates(tmp_path):
+    folder = tmp_path / "templates"
+    folder.mkdir()
+    (folder / "demo.tex").write_text(r"Hello \VAR{personal.name|escape_latex}", encoding="utf-8")
+    (folder / "other.tex").write_text(r"\BLOCK{for s in sections}\VAR{s}\BLOCK{endfor}")
+    return folder
+
+
+@pytest.fixture()
+def registry(templates):
+    return TemplateRegistry(templates_folder=templates, bytecode_cache_dir="")
+
+
+class TestRender:
+    def test_renders_from_templates_folder(self, registry):
+        assert registry.render("demo", {"personal": {"name": "A&B"}}) == r"Hello A\&B"
+
+    def test_missing_template_raises(self, registry):
+        with pytest.raises(FileNotFoundError, match="Template not found"):
+            registry.render("missing", {})
+
+    def test_template_compiled_once(self, registry):
+        with patch.object(registry.env, "_parse", wraps=registry.env._parse) as parse:
+            for _ in range(3):
+                registry.render("demo", {"personal": {"name": "x"}})
+        assert parse.call_count == 1
+
+    def test_edited_template_is_reloaded(self, registry, templates):
+        registry.render("demo", {"personal": {"name": "x"}})
+        template = templates / "demo.tex"
+        template.write_text("Changed", encoding="utf-8")
+        stat = template.stat()
+        # Make sure the modification time moves even on coarse-grained filesystems
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert registry.render("demo", {}) == "Changed"
+
+    def test_renderers_share_one_environment(self, registry):
+        assert registry.get_renderer("demo") is registry.get_renderer("demo")
+        assert registry.get_renderer("demo").env is registry.get_renderer("other").env
+
+    def test_does_not_copy_template_files(self, registry):
+        with (
+            patch("shutil.copy") as mock_copy,
+            patch("tempfile.mkdtemp") as mock_mkdtemp,
+        ):
+            registry.render("demo", {"personal": {"name": "x"}})
+        mock_copy.assert_not_called()
+        mock_mkdtemp.assert_not_called()
+
+
+class TestLookup:
+    def test_template_ids(self, registry):
+        assert registry.template_ids() == ["demo", "other"]
+
+    @pytest.mark.parametrize("template_id", ["demo", "other"])
+    def test_has_existing(self, registry, template_id):
+        assert registry.has(template_id)
+
+    @pytest.mark.parametrize("template_id", ["missing", "", "../demo", "sub/demo", "/etc/passwd"])
+    def test_has_rejects_unknown_and_paths(self, registry, template_id):
+        assert not registry.has(template_id)
+
+    def test_preload_compiles_everything(self, registry):
+        assert registry.preload() == 2
+        with patch.object(registry.env, "_parse") as parse:
+            registry.render("other", {"sections": ["a", "b"]})
+        parse.assert_not_called()
+
+    def test_preload_shipped_templates(self):
+        registry = TemplateRegistry(templates_folder=TEMPLATES_FOLDER, bytecode_cache_dir="")
+        assert registry.preload() == len(list(TEMPLATES_FOLDER.glob("*.tex")))
+
+
+class TestBytecodeCache:
+    def test_bytecode_written_to_disk_and_reused(self, templates, tmp_path):
+        cache_dir = tmp_path / "jinja-cache"
+        TemplateRegistry(templates, bytecode_cache_dir=str(cache_dir)).preload()
+        assert any(cache_dir.iterdir())
+
+        fresh = TemplateRegistry(templates, bytecode_cache_dir=str(cache_dir))
+        with patch.object(fresh.env, "_parse") as parse:
+            fresh.render("demo", {"personal": {"name": "x"}})
+        parse.assert_not_called()
+
+    def test_disabled_by_default(self, registry):
+        assert registry.env.bytecode_cache is None
+
+
+class TestLatexRendererEnvironment:
+    def test_explicit_environment_is_used(self, templates):
+        env = LatexRenderer.create_environment(templates)
+        assert LatexRenderer(templates, "demo.tex", env=env).env is env
+
+    def test_builds_own_environment_by_default(self, templates):
+        renderer = LatexRenderer(templates, "demo.tex")
+        assert "escape_latex" in renderer.env.filters
+
+
+def test_get_template_registry_returns_singleton():
+    assert get_template_registry() is get_template_registry()
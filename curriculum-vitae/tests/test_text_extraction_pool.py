@@ -0,0 +1,109 @@
+"""Tests for TextExtractionPool — sandboxed PDF text extraction with limits."""
+
+import asyncio
+
+import pytest
+
+from core.TextExtractionPool import (
+    ExtractionError,
+    ExtractionMemoryError,
+    ExtractionTimeoutError,
+    TextExtractionPool,
+    TextTooLongError,
+    TooManyPagesError,
+)
+
+
+@pytest.fixture()
+def pool():
+    extraction_pool = TextExtractionPool(max_workers=1, job_timeout=30, max_jobs_per_worker=None)
+    yield extraction_pool
+    extraction_pool.shutdown()
+
+
+class TestTextExtractionPool:
+    def test_extracts_in_a_worker_process(self, pool, pdf_file):
+        assert "Jane Doe" in pool.extract(pdf_file(["Jane Doe"]), 5, 1000)
+        assert pool.stats()["jobs_completed"] == 1
+
+    def test_per_job_extractor(self, pool, pdf_file):
+        assert "Jane Doe" in pool.extract(pdf_file(["Jane Doe"]), 5, 1000, extractor="pdfminer")
+
+    def test_rejects_unknown_extractor(self, pool, pdf_file):
+        with pytest.raises(ValueError):
+            pool.submit(pdf_file(["Jane Doe"]), 5, 1000, extractor="ocr")
+        with pytest.raises(ValueError):
+            TextExtractionPool(extractor="ocr")
+
+    def test_extract_async(self, pool, pdf_file):
+        path = pdf_file(["Jane Doe"])
+        assert "Jane Doe" in asyncio.run(pool.extract_async(path, 5, 1000))
+
+    def test_limits_are_reported_with_details(self, pool, pdf_file):
+        with pytest.raises(TooManyPagesError) as exc_info:
+            pool.extract(pdf_file(["a", "b", "c"]), 2, 1000)
+        assert exc_info.value.page_count == 3
+
+        with pytest.raises(TextTooLongError):
+            pool.extract(pdf_file(["x" * 40] * 2), 5, 50)
+
+    def test_invalid_pdf_raises_extraction_error(self, pool, tmp_path):
+        path = tmp_path / "broken.pdf"
+        path.write_bytes(b"%PDF-1.4 not really")
+        with pytest.raises(ExtractionError):
+            pool.extract(path, 5, 1000)
+        # The worker process survives ordinary errors
+        assert pool.stats()["processes_recycled"] == 0
+
+    def test_timeout_kills_and_replaces_the_process(self, pdf_file):
+        # Process start-up and pdfplumber import alone take far longer than 1ms
+        slow_pool = TextExtractionPool(max_workers=1, job_timeout=0.001, max_jobs_per_worker=None)
+        try:
+            with pytest.raises(ExtractionTimeoutError):
+                slow_pool.extract(pdf_file(["Jane Doe"]), 5, 1000)
+            stats = slow_pool.stats()
+            assert stats["timeouts"] == 1
+            assert stats["processes_recycled"] == 1
+
+            slow_pool.job_timeout = 30
+            assert "Jane Doe" in slow_pool.extract(pdf_file(["Jane Doe"]), 5, 1000)
+        finally:
+            slow_pool.shutdown()
+
+    def test_memory_limit(self, pdf_file):
+        tight_pool = TextExtractionPool(max_workers=1, max_memory_mb=1, max_jobs_per_worker=None)
+        try:
+            # pdfminer builds one layout object per character: far more than 1 MB
+            with pytest.raises(ExtractionMemoryError):
+                tight_pool.extract(pdf_file(["x" * 20_000]), 5, 100_000)
+            assert tight_pool.stats()["memory_errors"] == 1
+        finally:
+            tight_pool.shutdown()
+
+    def test_recycles_after_job_budget(self, pdf_file):
+        recycling_pool = TextExtractionPool(max_workers=1, max_jobs_per_worker=1)
+        try:
+            path = pdf_file(["Jane Doe"])
+            recycling_pool.extract(path, 5, 1000)
+            recycling_pool.extract(path, 5, 1000)
+            assert recycling_pool.stats()["processes_recycled"] == 2
+        finally:
+            recycling_pool.shutdown()
+
+    def test_cancelled_job_is_skipped(self, pool, pdf_file):
+        path = pdf_file(["Jane Doe"])
+        first = pool.submit(path, 5, 1000)
+        second = pool.submit(path, 5, 1000)
+        assert second.cancel()
+        first.result()
+        pool.shutdown()
+        assert pool.stats()["jobs_completed"] == 1
+
+    def test_rejects_jobs_after_shutdown(self, pool, pdf_file):
+        pool.shutdown()
+        with pytest.raises(RuntimeError):
+            pool.submit(pdf_file(["Jane Doe"]), 5, 1000)
+
+    def test_requires_a_worker(self):
+        with pytest.raises(ValueError):
+            TextExtractionPool(max_workers=0)
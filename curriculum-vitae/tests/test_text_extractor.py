@@ -0,0 +1,64 @@
+"""Tests for the PDF text extraction backends."""
+
+import pytest
+
+from core.TextExtractor import (
+    EXTRACTORS,
+    PdfminerExtractor,
+    PdfplumberExtractor,
+    TextTooLongError,
+    TooManyPagesError,
+    extract_text,
+    get_extractor,
+)
+
+
+@pytest.fixture(params=sorted(EXTRACTORS))
+def extractor(request):
+    return request.param
+
+
+class TestExtractors:
+    def test_extracts_every_page(self, pdf_file, extractor):
+        path = pdf_file(["Jane Doe", "Senior Engineer"])
+        text = extract_text(path, max_pages=5, max_chars=1000, extractor=extractor)
+        assert "Jane Doe" in text
+        assert "Senior Engineer" in text
+        assert text.index("Jane Doe") < text.index("Senior Engineer")
+
+    def test_one_line_per_page(self, pdf_file, extractor):
+        path = pdf_file(["Jane Doe", "Senior Engineer"])
+        text = extract_text(path, max_pages=5, max_chars=1000, extractor=extractor)
+        assert text == "Jane Doe\nSenior Engineer\n"
+
+    def test_rejects_too_many_pages(self, pdf_file, extractor):
+        with pytest.raises(TooManyPagesError) as exc_info:
+            extract_text(
+                pdf_file(["a", "b", "c"]), max_pages=2, max_chars=1000, extractor=extractor
+            )
+        assert exc_info.value.page_count == 3
+
+    def test_stops_at_first_page_over_the_limit(self, pdf_file, extractor):
+        pages_read = []
+        iter_pages = EXTRACTORS[extractor].iter_pages
+
+        def counting_iter_pages(self, *args):
+            for page_text in iter_pages(self, *args):
+                pages_read.append(page_text)
+                yield page_text
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(EXTRACTORS[extractor], "iter_pages", counting_iter_pages)
+            with pytest.raises(TextTooLongError):
+                extract_text(pdf_file(["x" * 40] * 4), 10, 50, extractor=extractor)
+        assert len(pages_read) == 2
+
+
+class TestGetExtractor:
+    def test_known_names(self):
+        assert isinstance(get_extractor("pdfplumber"), PdfplumberExtractor)
+        assert isinstance(get_extractor("pdfminer"), PdfminerExtractor)
+
+    def test_unknown_name(self):
+        with pytest.raises(ValueError, match="pdfminer, pdfplumber"):
+            get_extractor("ocr")
@@ -0,0 +1,276 @@
+"""Tests for the authenticated user cache and its invalidation."""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime
+
+import fakeredis
+from conftest import _async_engine, _TestAsyncSession, auth_header, create_authenticated_user
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import MAX_IMPORTS_PER_USER
+from auth.user_cache import UserCache, get_user_cache, refresh_user
+from database.models import User
+
+
+def _user_selects() -> list[str]:
+    """Record the SELECTs on the users table issued by the routes' asyncio engine."""
+    statements: list[str] = []
+
+    def _record(_conn, _cursor, statement, *_args):
+        if statement.lstrip().startswith("SELECT") and "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(_async_engine.sync_engine, "before_cursor_execute", _record)
+    return statements
+
+
+class _ThreadRecordingRedis(fakeredis.FakeRedis):
+    """FakeRedis remembering the threads its get and set calls ran on."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.threads: list[threading.Thread] = []
+
+    def get(self, *args, **kwargs):
+        self.threads.append(threading.current_thread())
+        return super().get(*args, **kwargs)
+
+    def set(self, *args, **kwargs):
+        self.threads.append(threading.current_thread())
+        return super().set(*args, **kwargs)
+
+
+class _BlockingRedis(fakeredis.FakeRedis):
+    """FakeRedis whose pipelines (used for invalidations) wait until ``release`` is set."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+        self.threads: list[threading.Thread] = []
+
+    def pipeline(self, *args, **kwargs):
+        self.threads.append(threading.current_thread())
+        self.release.wait(timeout=5)
+        return super().pipeline(*args, **kwargs)
+
+
+class TestGetCurrentUser:
+    def test_repeated_requests_skip_the_user_query(
+        self, client: TestClient, db: Session, user_cache: UserCache
+    ) -> None:
+        headers = auth_header(create_authenticated_user(client))
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+        selects = _user_selects()
+        for _ in range(3):
+            resp = client.get("/api/auth/me", headers=headers)
+            assert resp.status_code == 200
+            assert resp.json()["email"] == "test@example.com"
+        assert selects == []
+        assert user_cache.stats()["hits"] >= 3
+
+    def test_disabled_cache_always_queries(self, client: TestClient, db: Session, monkeypatch):
+        import auth.user_cache as user_cache_module
+
+        monkeypatch.setattr(user_cache_module, "_user_cache", UserCache(ttl=0))
+        headers = auth_header(create_authenticated_user(client))
+        selects = _user_selects()
+        client.get("/api/auth/me", headers=headers)
+        assert len(selects) == 1
+
+    def test_feedback_bonus_invalidates_entry(
+        self, client: TestClient, user_cache: UserCache
+    ) -> None:
+        headers = auth_header(create_authenticated_user(client))
+        client.get("/api/auth/me", headers=headers)
+
+        resp = client.post("/api/auth/feedback", json={"ease_rating": 7}, headers=headers)
+        assert resp.status_code == 200
+        assert user_cache.stats()["invalidations"] >= 1
+
+        resp = client.get("/api/auth/me", headers=headers)
+        assert resp.json()["bonus_imports"] == 3
+
+    def test_deleted_account_is_not_served_from_cache(self, client: TestClient) -> None:
+        headers = auth_header(create_authenticated_user(client))
+        client.get("/api/auth/me", headers=headers)
+
+        assert client.delete("/api/auth/me", headers=headers).status_code == 204
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+    def test_quota_check_reads_fresh_counters(self, client: TestClient, db: Session) -> None:
+        headers = auth_header(create_authenticated_user(client))
+        client.get("/api/auth/me", headers=headers)
+
+        # A bulk update skips the ORM events, like a write made by another worker
+        db.query(User).update({User.import_count: MAX_IMPORTS_PER_USER})
+        db.commit()
+
+        resp = client.post(
+            "/import",
+            files={"file": ("cv.pdf", b"%PDF-1.4 minimal", "application/pdf")},
+            headers=headers,
+        )
+        assert resp.status_code == 429
+
+
+class TestUserCache:
+    def _user(self, db: Session) -> User:
+        user = User(
+            email="cache@example.com",
+            password_hash="hash",
+            feedback_completed_at=datetime(2026, 1, 2, tzinfo=UTC),
+        )
+        db.add(user)
+        db.commit()
+        return user
+
+    def test_cached_user_is_attached_to_the_session(self, db: Session) -> None:
+        cache = UserCache(ttl=60)
+        user = self._user(db)
+        cache.put(user)
+        db.expunge_all()
+
+        cached = cache.get(db, user.id)
+        assert cached is not None
+        assert cached in db
+        assert not db.is_modified(cached)
+        assert cached.email == "cache@example.com"
+
+    def test_password_hash_is_not_cached(self, db: Session) -> None:
+        cache = UserCache(ttl=60)
+        user = self._user(db)
+        cache.put(user)
+        db.expunge_all()
+
+        cached = cache.get(db, user.id)
+        assert "password_hash" not in cached.__dict__
+        assert cached.password_hash == "hash"
+
+    def test_refresh_user_reloads_cached_users_only(self, db: Session) -> None:
+        cache = UserCache(ttl=60)
+        user = self._user(db)
+        cache.put(user)
+        db.expunge_all()
+        db.query(User).update({User.download_count: 7})
+        db.commit()
+        db.expunge_all()
+
+        cached = cache.get(db, user.id)
+        assert cached.download_count == 0
+        assert refresh_user(db, cached).download_count == 7
+
+    def test_entries_expire(self, db: Session, monkeypatch) -> None:
+        import auth.user_cache as user_cache_module
+
+        now = [1000.0]
+        monkeypatch.setattr(user_cache_module.time, "monotonic", lambda: now[0])
+        cache = UserCache(ttl=5)
+        user = self._user(db)
+        cache.put(user)
+        db.expunge_all()
+
+        assert cache.get(db, user.id) is not None
+        db.expunge_all()
+        now[0] += 5
+        assert cache.get(db, user.id) is None
+
+    def test_bounded_size(self, db: Session) -> None:
+        cache = UserCache(ttl=60, max_entries=1)
+        first = self._user(db)
+        second = User(email="other@example.com")
+        db.add(second)
+        db.commit()
+        cache.put(first)
+        cache.put(second)
+        assert cache.stats()["entries"] == 1
+        assert cache.get(db, first.id) is None
+
+    def test_redis_entries_shared_between_processes(self, db: Session) -> None:
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        user = self._user(db)
+        UserCache(ttl=60, redis_client=redis_client).put(user)
+        db.expunge_all()
+
+        other_worker = UserCache(ttl=60, redis_client=redis_client)
+        cached = other_worker.get(db, user.id)
+        assert cached.feedback_completed_at.replace(tzinfo=UTC) == datetime(2026, 1, 2, tzinfo=UTC)
+        assert "hash" not in redis_client.get(f"user_cache:{user.id}")
+
+        other_worker.invalidate(user.id)
+        db.expunge_all()
+        assert UserCache(ttl=60, redis_client=redis_client).get(db, user.id) is None
+
+    def test_stale_put_after_invalidation_is_dropped(self, db: Session) -> None:
+        redis_client = fakeredis.FakeRedis(decode_responses=True)
+        cache = UserCache(ttl=60, redis_client=redis_client)
+        other_worker = UserCache(ttl=60, redis_client=redis_client)
+        user = self._user(db)
+
+        # Both requests read the row, then a write commits before they cache it
+        generation = cache.generation(user.id)
+        other_generation = other_worker.generation(user.id)
+        cache.invalidate(user.id)
+        cache.put(user, generation)
+        other_worker.put(user, other_generation)
+        db.expunge_all()
+
+        assert cache.stats()["entries"] == 0
+        assert UserCache(ttl=60, redis_client=redis_client).get(db, user.id) is None
+
+        cache.put(user, cache.generation(user.id))
+        assert cache.get(db, user.id) is not None
+
+    def test_forgotten_generations_still_read_as_stale(self, db: Session) -> None:
+        cache = UserCache(ttl=60, max_entries=1)
+        user = self._user(db)
+        generation = cache.generation(user.id)
+        cache.invalidate(user.id)
+        cache.invalidate(user.id + 1)
+
+        cache.put(user, generation)
+        assert cache.stats()["entries"] == 0
+
+    def test_async_redis_calls_leave_the_event_loop(self, db: Session) -> None:
+        redis_client = _ThreadRecordingRedis(decode_responses=True)
+        user = self._user(db)
+
+        async def scenario() -> int:
+            await UserCache(ttl=60, redis_client=redis_client).put_async(user)
+            other_worker = UserCache(ttl=60, redis_client=redis_client)
+            async with _TestAsyncSession() as session:
+                return (await other_worker.get_async(session, user.id)).id
+
+        assert asyncio.run(scenario()) == user.id
+        assert len(redis_client.threads) == 2
+        assert threading.main_thread() not in redis_client.threads
+
+    def test_async_commit_does_not_wait_for_redis(self, db: Session, monkeypatch) -> None:
+        import auth.user_cache as user_cache_module
+
+        redis_client = _BlockingRedis(decode_responses=True)
+        cache = UserCache(ttl=60, redis_client=redis_client)
+        monkeypatch.setattr(user_cache_module, "_user_cache", cache)
+        user_id = self._user(db).id
+
+        async def scenario() -> float:
+            async with _TestAsyncSession() as session:
+                user = await session.get(User, user_id)
+                await cache.put_async(user)
+                user.bonus_imports = 3
+                start = time.monotonic()
+                await session.commit()
+                elapsed = time.monotonic() - start
+            assert cache.stats()["entries"] == 0
+            redis_client.release.set()
+            await asyncio.gather(*cache._pending)
+            return elapsed
+
+        assert asyncio.run(scenario()) < 1
+        assert get_user_cache() is cache
+        assert threading.main_thread() not in redis_client.threads
+        assert redis_client.get(f"user_cache:{user_id}") == "invalidated"